@@ -0,0 +1,70 @@
+import os
+from typing import Dict, Optional
+from app.admission.bulkhead import Bulkhead, BulkheadFull, BulkheadTimeout
+from app.admission.controller import AdmissionController
+from app.admission.lag import LoopLagMonitor
+from app.admission.routes import CRITICAL, LOW, NORMAL, RouteClass, classify
+from app.db.client import pool_options
+
+
+def _threshold(env: str, default: str) -> Optional[float]:
+    """Lag threshold in seconds from ``env`` (milliseconds); ``0`` never sheds."""
+    value = float(os.getenv(env, default))
+    return value / 1000 if value > 0 else None
+
+
+lag_monitor = LoopLagMonitor(float(os.getenv("LOOP_LAG_INTERVAL_MS", "50")) / 1000)
+admission_controller = AdmissionController(
+    lag_monitor,
+    {
+        CRITICAL: None,
+        NORMAL: _threshold("LOAD_SHED_NORMAL_LAG_MS", "500"),
+        LOW: _threshold("LOAD_SHED_LOW_LAG_MS", "100"),
+    },
+)
+
+
+# route class -> (share of the Motor pool's maxPoolSize, max_queue,
+# queue_timeout_seconds). A running request holds at most one pooled
+# connection; the shares leave 5% of the pool to probes, ops stats and
+# background work.
+_DEFAULT_BULKHEADS = {
+    "order_placement": (0.35, 200, 5),
+    "menu_reads": (0.25, 300, 2),
+    "default": (0.15, 100, 2),
+    "auth": (0.10, 50, 2),
+    "admin_reads": (0.08, 20, 1),
+    "exports": (0.02, 2, 1),
+}
+
+
+def create_bulkheads(pool_size: Optional[int] = None) -> Dict[str, Bulkhead]:
+    """Build a bulkhead per route class, sized from ``pool_size`` (``MONGO_MAX_POOL_SIZE``).
+
+    ``BULKHEAD_<CLASS>`` overrides a class as
+    ``"max_concurrent,max_queue,queue_timeout_seconds"``; ``"0"`` removes it.
+    Limits adding up to more than the pool are refused: the excess requests
+    would pass their bulkhead only to queue for a connection in the driver.
+    """
+    if pool_size is None:
+        pool_size = pool_options()["maxPoolSize"]
+    bulkheads = {}
+    for name, (share, max_queue, queue_timeout) in _DEFAULT_BULKHEADS.items():
+        spec = os.getenv(f"BULKHEAD_{name.upper()}", "").strip()
+        if spec == "0":
+            continue
+        if spec:
+            max_concurrent, max_queue, queue_timeout = spec.split(",")
+        else:
+            max_concurrent = max(1, int(pool_size * share))
+        bulkheads[name] = Bulkhead(name, int(max_concurrent), int(max_queue), float(queue_timeout))
+    total = sum(bulkhead.max_concurrent for bulkhead in bulkheads.values())
+    if total > pool_size:
+        raise ValueError(
+            f"Bulkheads admit {total} concurrent requests but MONGO_MAX_POOL_SIZE is {pool_size}; "
+            "lower BULKHEAD_* or raise the pool size"
+        )
+    return bulkheads
+
+
+bulkheads = create_bulkheads()
@@ -0,0 +1,82 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class BulkheadFull(Exception):
+    """The bulkhead's queue is full; the request is rejected at once."""
+
+
+class BulkheadTimeout(Exception):
+    """The request waited ``queue_timeout`` seconds without getting a slot."""
+
+
+class Bulkhead:
+    """Concurrency limit with a bounded FIFO queue for one route class.
+
+    At most ``max_concurrent`` requests of the class run at once, at most
+    ``max_queue`` more wait for a slot and none waits longer than
+    ``queue_timeout``. A freed slot is handed straight to the oldest waiter,
+    so other classes never compete for it.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    async def acquire(self) -> None:
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise BulkheadFull(self.name)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as we gave up on it
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(exc, asyncio.TimeoutError):
+                self._timeouts += 1
+                raise BulkheadTimeout(self.name) from None
+            raise
+        self._admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": round(self.queue_timeout * 1000, 3),
+            "active": self.active,
+            "waiting": len(self._waiters),
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+        }
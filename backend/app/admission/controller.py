@@ -0,0 +1,46 @@
+from typing import Any, Dict, Optional
+from app.admission.lag import LoopLagMonitor
+from app.admission.routes import CRITICAL, LOW, NORMAL, ROUTE_CLASSES, RouteClass
+
+
+class AdmissionController:
+    """Decide per request whether the worker can afford to serve it.
+
+    Each priority has a loop-lag threshold above which its requests are shed:
+    low-priority traffic goes first, normal traffic only under heavy lag and
+    critical traffic (order placement, probes) is never shed.
+    """
+
+    def __init__(self, monitor: LoopLagMonitor, thresholds: Dict[int, Optional[float]]):
+        self.monitor = monitor
+        self.thresholds = thresholds
+        self._admitted: Dict[str, int] = {}
+        self._shed: Dict[str, int] = {}
+
+    def admit(self, route_class: RouteClass) -> bool:
+        threshold = self.thresholds.get(route_class.priority)
+        if threshold is not None and self.monitor.lag >= threshold:
+            self._shed[route_class.name] = self._shed.get(route_class.name, 0) + 1
+            return False
+        self._admitted[route_class.name] = self._admitted.get(route_class.name, 0) + 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "thresholds_ms": {
+                name: None if self.thresholds.get(priority) is None else round(self.thresholds[priority] * 1000, 3)
+                for name, priority in (("critical", CRITICAL), ("normal", NORMAL), ("low", LOW))
+            },
+            "shed": sum(self._shed.values()),
+            "routes": {
+                route_class.name: {
+                    "admitted": self._admitted.get(route_class.name, 0),
+                    "shed": self._shed.get(route_class.name, 0),
+                }
+                for route_class in ROUTE_CLASSES
+            },
+        }
+
+    def reset(self) -> None:
+        self._admitted.clear()
+        self._shed.clear()
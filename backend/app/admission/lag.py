@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Dict, Optional
+from app.utils.histogram import Histogram
+
+
+class LoopLagMonitor:
+    """Measure event-loop lag by how late a periodic sleep wakes up.
+
+    Every ``interval`` seconds the monitor schedules a wakeup and records how
+    far past the scheduled time it actually ran; that delay is the time a
+    ready callback currently waits for the loop. ``lag`` is smoothed so one
+    slow callback does not flip admission decisions on its own.
+    """
+
+    def __init__(self, interval: float = 0.05, smoothing: float = 0.3):
+        self.interval = interval
+        self.smoothing = smoothing
+        self.lag = 0.0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._histogram = Histogram()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.lag = self.smoothing * lag + (1 - self.smoothing) * self.lag
+        self._histogram.observe(lag)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - expected)
+
+    def histogram(self) -> Dict[str, Any]:
+        """Cumulative bucket counts, sample count and sum (seconds)."""
+        return self._histogram.snapshot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lag_ms": round(self.lag * 1000, 3),
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "histogram": self.histogram(),
+        }
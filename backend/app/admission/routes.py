@@ -0,0 +1,51 @@
+from typing import NamedTuple
+
+# Lower is more important
+CRITICAL = 0
+NORMAL = 1
+LOW = 2
+
+
+class RouteClass(NamedTuple):
+    name: str
+    priority: int
+
+
+ORDER_PLACEMENT = RouteClass("order_placement", CRITICAL)
+PROBES = RouteClass("probes", CRITICAL)
+MENU_READS = RouteClass("menu_reads", NORMAL)
+AUTH = RouteClass("auth", NORMAL)
+DEFAULT = RouteClass("default", NORMAL)
+OPS_STATS = RouteClass("ops_stats", NORMAL)
+ADMIN_READS = RouteClass("admin_reads", LOW)
+EXPORTS = RouteClass("exports", LOW)
+
+ROUTE_CLASSES = (ORDER_PLACEMENT, PROBES, MENU_READS, AUTH, DEFAULT, OPS_STATS, ADMIN_READS, EXPORTS)
+
+
+def classify(method: str, path: str) -> RouteClass:
+    """Map a request to the route class used for load shedding and bulkheads."""
+    normalized = path.rstrip("/") or "/"
+    if method == "POST" and normalized == "/orders":
+        return ORDER_PLACEMENT
+    if normalized == "/" or normalized.startswith("/health"):
+        return PROBES
+    if normalized.startswith("/auth"):
+        return AUTH
+    if normalized.endswith("/export") or normalized.startswith("/exports"):
+        return EXPORTS
+    if normalized == "/admin/stats/indexes":
+        # runs $indexStats on every collection
+        return ADMIN_READS
+    if normalized.startswith("/admin/stats") or normalized == "/metrics":
+        # cheap in-memory counters, needed most while overloaded
+        return OPS_STATS
+    if normalized.startswith("/admin"):
+        return ADMIN_READS
+    if method == "GET":
+        if normalized.startswith(("/pizzas", "/extras", "/images")):
+            return MENU_READS
+        # paginated lists and lookups across every user
+        if normalized in ("/orders", "/users") or normalized.startswith("/users/email/"):
+            return ADMIN_READS
+    return DEFAULT
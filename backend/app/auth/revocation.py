@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import orjson
+from app.db.policies import policy_collection
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "auth:revocations"
+# Revocations only need to outlive the access tokens they cover
+REVOCATION_RETENTION = timedelta(minutes=30)
+# Re-read this much history on every poll so entries committed slightly out of
+# order by other workers are not skipped
+POLL_OVERLAP = timedelta(seconds=5)
+
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationList:
+    """In-memory set of revoked subjects and token ids, checked on every request.
+
+    Revocations are written to the ``revocations`` collection and applied
+    locally at once. Other workers pick them up from the cache backend's pub/sub
+    channel when one is shared, and from a periodic delta poll of the collection
+    otherwise, so checking a token never costs a database round trip.
+    """
+
+    def __init__(self):
+        # subject -> epoch seconds; tokens issued at or before it are revoked
+        self._subjects: Dict[str, float] = {}
+        self._subject_expiry: Dict[str, float] = {}
+        # jti -> epoch seconds after which the entry can be forgotten
+        self._token_ids: Dict[str, float] = {}
+        self._last_seen: Optional[datetime] = None
+        self._database = None
+        self._cache = None
+        self._poller: Optional[asyncio.Task] = None
+
+    def is_revoked(self, payload: dict) -> bool:
+        jti = payload.get("jti")
+        if jti and jti in self._token_ids:
+            return True
+        revoked_at = self._subjects.get(payload.get("sub"))
+        if revoked_at is None:
+            return False
+        issued_at = payload.get("iat")
+        return issued_at is None or issued_at <= revoked_at
+
+    def apply(self, entry: dict) -> None:
+        expires_at = _epoch(entry["expires_at"])
+        if entry["kind"] == "subject":
+            revoked_at = _epoch(entry["revoked_at"])
+            self._subjects[entry["value"]] = max(revoked_at, self._subjects.get(entry["value"], 0))
+            self._subject_expiry[entry["value"]] = expires_at
+        else:
+            self._token_ids[entry["value"]] = expires_at
+
+    async def revoke_subject(self, database, subject: str) -> None:
+        """Revoke every access token issued to ``subject`` so far."""
+        await self._revoke(database, "subject", subject)
+
+    async def revoke_token(self, database, jti: str) -> None:
+        await self._revoke(database, "token", jti)
+
+    async def _revoke(self, database, kind: str, value: str) -> None:
+        now = datetime.utcnow()
+        entry = {
+            "kind": kind,
+            "value": value,
+            "revoked_at": now,
+            "created_at": now,
+            "expires_at": now + REVOCATION_RETENTION,
+        }
+        await policy_collection(database, "revocations", "revocations.write").insert_one(dict(entry))
+        self.apply(entry)
+        if self._cache is not None:
+            await self._cache.publish(REVOCATION_CHANNEL, orjson.dumps(entry).decode())
+
+    async def sync(self, database) -> None:
+        """Apply revocations written since the last poll (by any worker)."""
+        query = {}
+        if self._last_seen is not None:
+            query = {"created_at": {"$gte": self._last_seen - POLL_OVERLAP}}
+        async for entry in database.revocations.find(query).sort("created_at", 1):
+            self.apply(entry)
+            self._last_seen = entry["created_at"]
+        self.prune()
+
+    def prune(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, expires_at in self._token_ids.items() if expires_at <= now]:
+            del self._token_ids[jti]
+        for subject in [s for s, expires_at in self._subject_expiry.items() if expires_at <= now]:
+            del self._subject_expiry[subject]
+            self._subjects.pop(subject, None)
+
+    async def start(self, database, cache=None, interval: Optional[float] = None) -> None:
+        """Load current revocations, then keep in sync via pub/sub and polling."""
+        self._database = database
+        self._cache = cache
+        await self.sync(database)
+        if cache is not None:
+            await cache.subscribe(REVOCATION_CHANNEL, self._on_message)
+        if interval is None:
+            interval = float(os.getenv("REVOCATION_POLL_SECONDS", "5"))
+        self._poller = asyncio.create_task(self._poll(interval))
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+    async def _poll(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(self._database)
+            except Exception:
+                logger.exception("Revocation list sync failed")
+
+    def _on_message(self, message: str) -> None:
+        entry = orjson.loads(message)
+        for field in ("revoked_at", "created_at", "expires_at"):
+            entry[field] = datetime.fromisoformat(entry[field])
+        self.apply(entry)
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,33 @@
+import os
+from app.cache.base import CacheBackend, CacheStats, INVALIDATION_CHANNEL
+from app.cache.memory import MemoryCacheBackend
+from app.cache.redis_backend import RedisCacheBackend
+
+
+def create_cache_backend() -> CacheBackend:
+    """Build the cache backend selected by ``CACHE_BACKEND`` (``memory`` or ``redis``)."""
+    max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    if os.getenv("CACHE_BACKEND", "memory").lower() == "redis":
+        local_ttl = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "30"))
+        return RedisCacheBackend(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            prefix=os.getenv("CACHE_KEY_PREFIX", "usersnack:"),
+            local=MemoryCacheBackend(max_entries) if local_ttl > 0 else None,
+            local_ttl=local_ttl,
+        )
+    return MemoryCacheBackend(max_entries)
+
+
+def catalog_ttl() -> float:
+    """TTL in seconds for cached pizzas, extras and menu pages."""
+    return float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+
+
+def token_ttl() -> float:
+    """Upper bound in seconds for caching a verified token's payload."""
+    return float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+
+def stale_ttl() -> float:
+    """How long a cached catalog read stays available as a fallback while the database is down."""
+    return float(os.getenv("STALE_CACHE_TTL_SECONDS", "3600"))
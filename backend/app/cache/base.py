@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class CacheStats:
+    """Counters every backend keeps; exposed through ``CacheBackend.stats()``."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "deletes": self.deletes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class CacheBackend(ABC):
+    """Key/value cache shared by the services and middleware.
+
+    Keys are ``"<namespace>:<key>"`` strings so a whole namespace (e.g. every
+    cached pizza and menu page) can be dropped with ``invalidate``. ``None`` is
+    never cached; a ``None`` from ``get`` always means a miss.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``; ``ttl`` is in seconds, ``None`` keeps it until evicted."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate(self, namespace: str) -> None:
+        """Drop every key in ``namespace``, in this worker and in every other one."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        ...
+
+    @abstractmethod
+    async def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Call ``handler(message)`` for every message published on ``channel``."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Return the cached value for ``key`` or load, cache and return it."""
+        value = await self.get(key)
+        if value is not None:
+            return value
+        value = await loader()
+        if value is not None:
+            await self.set(key, value, ttl)
+        return value
@@ -0,0 +1,45 @@
+import functools
+from app.cache import catalog_ttl, stale_ttl
+from app.db import DATABASE_UNAVAILABLE_ERRORS, mongo_breaker, report_unavailable
+
+
+def cached(namespace: str):
+    """Cache a service read method's result under ``namespace`` for ``catalog_ttl()`` seconds.
+
+    The key is built from the method name, the service's database name and
+    ``str()`` of each argument. Services without a cache (``self.cache is None``)
+    call straight through. Writes drop the namespace with ``cache.invalidate``.
+
+    Every result is also kept under ``stale:<key>`` for ``stale_ttl()`` seconds,
+    which writes do not drop: while the database circuit is open or the load
+    times out, that last known value is served instead of an error.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if self.cache is None:
+                return await method(self, *args, **kwargs)
+            parts = [namespace, method.__name__, self.database.name]
+            parts.extend(str(arg) for arg in args)
+            parts.extend(f"{name}={value}" for name, value in sorted(kwargs.items()))
+            key = ":".join(parts)
+            value = await self.cache.get(key)
+            if value is not None:
+                return value
+            try:
+                mongo_breaker.check()
+                value = await method(self, *args, **kwargs)
+            except DATABASE_UNAVAILABLE_ERRORS as exc:
+                stale = await self.cache.get(f"stale:{key}")
+                if stale is None:
+                    raise
+                report_unavailable(exc)
+                mongo_breaker.record_fallback()
+                return stale
+            if value is not None:
+                await self.cache.set(key, value, catalog_ttl())
+                if stale_ttl() > 0:
+                    await self.cache.set(f"stale:{key}", value, stale_ttl())
+            return value
+        return wrapper
+    return decorator
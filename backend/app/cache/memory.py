@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.cache.base import CacheBackend, CacheStats
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with per-key TTLs.
+
+    Values are stored as-is (not copied), so callers must treat cached objects
+    as read-only. Pub/sub only reaches subscribers in this process.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        self._stats.sets += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        self.discard(*keys)
+
+    async def invalidate(self, namespace: str) -> None:
+        self.discard_namespace(namespace)
+
+    def discard(self, *keys: str) -> None:
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self._stats.deletes += 1
+
+    def discard_namespace(self, namespace: str) -> None:
+        prefix = f"{namespace}:"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+        self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def publish(self, channel: str, message: str) -> None:
+        for handler in list(self._handlers.get(channel, [])):
+            handler(message)
+
+    async def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **self._stats.as_dict(),
+        }
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import pickle
+import uuid
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List, Optional
+import orjson
+from app.cache.base import CacheBackend, CacheStats, INVALIDATION_CHANNEL
+from app.cache.memory import MemoryCacheBackend
+
+# Only imported when a Redis backend is created, so memory-cache workers skip it
+REDIS_AVAILABLE = find_spec("redis") is not None
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every worker through a Redis-protocol server.
+
+    Values are pickled. An optional in-process ``local`` LRU sits in front of
+    Redis for hot keys; writes, deletes and invalidations are broadcast on a
+    pub/sub channel so every worker drops its local copy. ``local_ttl`` bounds
+    how stale a local copy can get if a broadcast is missed.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "usersnack:",
+        local: Optional[MemoryCacheBackend] = None,
+        local_ttl: float = 30.0,
+    ):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("The redis package is required for the Redis cache backend")
+        import redis.asyncio as aioredis
+        self.client = aioredis.from_url(url)
+        self.prefix = prefix
+        self.local = local
+        self.local_ttl = local_ttl
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._origin = uuid.uuid4().hex
+        self._stats = CacheStats()
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other workers."""
+        if self.local is not None:
+            await self.subscribe(INVALIDATION_CHANNEL, self._apply_invalidation)
+
+    async def get(self, key: str) -> Optional[Any]:
+        if self.local is not None:
+            value = await self.local.get(key)
+            if value is not None:
+                self._stats.hits += 1
+                return value
+        async with self.client.pipeline(transaction=False) as pipe:
+            raw, remaining_ms = await pipe.get(self.prefix + key).pttl(self.prefix + key).execute()
+        if raw is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        value = pickle.loads(raw)
+        if self.local is not None:
+            ttl = self.local_ttl if remaining_ms < 0 else min(self.local_ttl, remaining_ms / 1000)
+            await self.local.set(key, value, ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        px = max(1, int(ttl * 1000)) if ttl is not None else None
+        await self.client.set(self.prefix + key, pickle.dumps(value), px=px)
+        self._stats.sets += 1
+        if self.local is not None:
+            await self.local.set(key, value, min(ttl, self.local_ttl) if ttl is not None else self.local_ttl)
+            await self._broadcast({"keys": [key]})
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        await self.client.delete(*[self.prefix + key for key in keys])
+        self._stats.deletes += len(keys)
+        if self.local is not None:
+            self.local.discard(*keys)
+            await self._broadcast({"keys": list(keys)})
+
+    async def invalidate(self, namespace: str) -> None:
+        batch = []
+        async for redis_key in self.client.scan_iter(match=f"{self.prefix}{namespace}:*", count=500):
+            batch.append(redis_key)
+            if len(batch) >= 500:
+                await self.client.delete(*batch)
+                batch = []
+        if batch:
+            await self.client.delete(*batch)
+        self._stats.invalidations += 1
+        if self.local is not None:
+            self.local.discard_namespace(namespace)
+            await self._broadcast({"namespace": namespace})
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.client.publish(self.prefix + channel, message)
+
+    async def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        first = channel not in self._handlers
+        self._handlers.setdefault(channel, []).append(handler)
+        if first:
+            await self._pubsub.subscribe(self.prefix + channel)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache pub/sub connection failed; retrying")
+                # invalidations may have been missed while disconnected
+                if self.local is not None:
+                    self.local.clear()
+                await asyncio.sleep(1.0)
+                continue
+            if not message or message.get("type") != "message":
+                continue
+            channel = message["channel"].decode()[len(self.prefix):]
+            data = message["data"].decode()
+            for handler in list(self._handlers.get(channel, [])):
+                try:
+                    handler(data)
+                except Exception:
+                    logger.exception("Cache pub/sub handler failed for %s", channel)
+
+    async def _broadcast(self, message: Dict[str, Any]) -> None:
+        message["origin"] = self._origin
+        await self.publish(INVALIDATION_CHANNEL, orjson.dumps(message).decode())
+
+    def _apply_invalidation(self, message: str) -> None:
+        payload = orjson.loads(message)
+        if payload.get("origin") == self._origin:
+            return
+        if "namespace" in payload:
+            self.local.discard_namespace(payload["namespace"])
+        else:
+            self.local.discard(*payload.get("keys", []))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"backend": "redis", **self._stats.as_dict()}
+        if self.local is not None:
+            stats["local"] = self.local.stats()
+        return stats
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.client.aclose()
@@ -0,0 +1,83 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+from app.utils.single_flight import flights
+from app.admission import admission_controller, bulkheads, lag_monitor
+from app.db import index_reconciler, index_usage, mongo_breaker, pool_metrics
+from app.images import variant_pool
+from app.profiling import loop_watchdog, request_profiler
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/stats/single-flight")
+async def get_single_flight_stats():
+    """Coalescing stats of the hot read methods in this worker."""
+    return flights.stats()
+
+@router.get("/stats/cache")
+async def get_cache_stats(request: Request):
+    """Hit/miss/eviction counters of the configured cache backend."""
+    return request.app.cache.stats()
+
+@router.get("/stats/rate-limit")
+async def get_rate_limit_stats(request: Request):
+    """Tracked buckets and allowed/limited counts of the rate limiter."""
+    store = getattr(request.app, "rate_limit_store", None)
+    return store.stats() if store is not None else {"enabled": False}
+
+@router.get("/stats/load")
+async def get_load_stats():
+    """Event-loop lag histogram, loop blocks caught by the watchdog, requests shed and bulkhead usage per route class."""
+    return {
+        "loop_lag": lag_monitor.stats(),
+        "loop_blocks": loop_watchdog.stats(),
+        "admission": admission_controller.stats(),
+        "bulkheads": {name: bulkhead.stats() for name, bulkhead in bulkheads.items()},
+    }
+
+@router.get("/stats/database")
+async def get_database_stats():
+    """Circuit breaker state and connection pool usage, including check-out wait times."""
+    return {"circuit_breaker": mongo_breaker.stats(), "pool": pool_metrics.stats()}
+
+@router.get("/stats/indexes")
+async def get_index_stats(request: Request):
+    """Per-index access counts from ``$indexStats`` with unused/missing hints, and the last reconciliation."""
+    return {
+        "reconciliation": index_reconciler.stats(),
+        "usage": await index_usage(request.app.mongodb),
+    }
+
+@router.get("/stats/uploads")
+async def get_upload_stats(request: Request):
+    """Image uploads stored, deduplicated, failed and rejected, bytes sent, durations and variant rendering."""
+    storage = request.app.storage
+    return {
+        "backend": type(storage).__name__,
+        "max_concurrent": storage.max_concurrent,
+        **storage.metrics.stats(),
+        "variants": variant_pool.stats(),
+    }
+
+def require_profile_token(request: Request) -> None:
+    """Profiles expose source paths and routes: like profiling itself, reading them needs ``X-Profile: <PROFILE_TOKEN>``."""
+    if not request_profiler.token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not request_profiler.authorized(request.scope):
+        raise HTTPException(status_code=403, detail="X-Profile operator token required")
+
+@router.get("/profiles", dependencies=[Depends(require_profile_token)])
+async def list_profiles(limit: int = Query(50, ge=1, le=500)):
+    """Recent request profiles of all workers, newest first, and this worker's profiler settings."""
+    return {
+        "profiler": request_profiler.stats(),
+        "profiles": await asyncio.to_thread(request_profiler.store.recent, limit),
+    }
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profile_token)])
+async def get_profile(profile_id: str):
+    """A profile's folded stacks, for flamegraph.pl, inferno or speedscope."""
+    path = request_profiler.store.folded_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.folded")
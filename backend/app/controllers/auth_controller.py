@@ -1,36 +1,50 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from jose import JWTError
 from pydantic import BaseModel, Field
-from jose import jwt
-from datetime import datetime, timedelta
-import os
+from typing import Optional
 from app.services.user_service import UserService
+from app.services.token_service import TokenService, RefreshTokenReuseError
+from app.utils.responses import ORJSONResponse
+from app.auth.revocation import revocation_list
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-ALGORITHM = "HS256"
-
-def get_secret_key():
-    return os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
-
 class TokenRequest(BaseModel):
     email: str = Field(..., pattern=r'^[^@]+@[^@]+\.[^@]+$')
     password: str = Field(..., min_length=6, max_length=128)
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=256)
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = Field(None, min_length=1, max_length=256)
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int = 1800  # 30 minutes
+    refresh_token: Optional[str] = None
+
+async def get_user_service(request: Request) -> UserService:
+    return request.app.container.users
 
-async def get_user_service():
-    from app.main import app
-    return UserService(app.mongodb, app.mongodb_client)
+async def get_token_service(request: Request) -> TokenService:
+    return request.app.container.tokens
 
 @router.post("/", response_model=Token)
-async def authenticate_user(token_request: TokenRequest, user_service: UserService = Depends(get_user_service)):
+async def authenticate_user(
+    token_request: TokenRequest,
+    x_store_id: Optional[str] = Header(None, description="Must match the user's store, if the user has one"),
+    user_service: UserService = Depends(get_user_service),
+    token_service: TokenService = Depends(get_token_service)
+):
     user = await user_service.get_user_by_email(token_request.email)
-    if not user or not user.password_hash or not user.password_salt:
+    if not user or not user.active or not user.password_hash or not user.password_salt:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    is_valid = user_service.verify_password(
+    # PBKDF2 would hold the event loop; hashlib releases the GIL in a thread
+    is_valid = await asyncio.to_thread(
+        user_service.verify_password,
         token_request.password,
         user.password_hash,
         user.password_salt,
@@ -38,10 +52,41 @@ async def authenticate_user(token_request: TokenRequest, user_service: UserServi
     if not is_valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    user_id = str(user.id)
-    expires_delta = timedelta(minutes=30)
-    expire = datetime.utcnow() + expires_delta
-    to_encode = {"sub": user_id, "exp": expire}
-    access_token = jwt.encode(to_encode, get_secret_key(), algorithm=ALGORITHM)
+    # Only the store on the user record scopes a token; customers get no store
+    # claim and keep picking a store per request with X-Store-Id
+    if user.store_id and x_store_id and x_store_id != user.store_id:
+        raise HTTPException(status_code=403, detail="User does not belong to this store")
+    tokens = await token_service.issue_tokens(str(user.id), store_id=user.store_id)
+    return ORJSONResponse(Token(**tokens))
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    refresh_request: RefreshTokenRequest,
+    token_service: TokenService = Depends(get_token_service)
+):
+    try:
+        tokens = await token_service.rotate_refresh_token(refresh_request.refresh_token)
+    except RefreshTokenReuseError:
+        raise HTTPException(status_code=401, detail="Refresh token has already been used")
+    if not tokens:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    return ORJSONResponse(Token(**tokens))
 
-    return Token(access_token=access_token, token_type="bearer", expires_in=1800)
+@router.post("/logout", status_code=204)
+async def logout(
+    request: Request,
+    logout_request: Optional[LogoutRequest] = None,
+    token_service: TokenService = Depends(get_token_service)
+):
+    """Revoke the presented access token and, if given, the refresh token's family."""
+    auth_header = request.headers.get("authorization", "")
+    if auth_header.startswith("Bearer "):
+        try:
+            payload = token_service.decode_access_token(auth_header.split(" ")[1])
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+        if payload.get("jti"):
+            await revocation_list.revoke_token(token_service.database, payload["jti"])
+    if logout_request and logout_request.refresh_token:
+        await token_service.revoke_refresh_token(logout_request.refresh_token)
+    return None
@@ -1,74 +1,87 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional
 from app.models.extra import Extra
 from app.validation.extras.requests import CreateExtraRequest, UpdateExtraRequest
 from app.services.extras_service import ExtrasService
 from app.utils.pagination import PaginationParams, PaginatedResponse
+from app.utils.fields import SparseFields, sparse_fields
+from app.utils.responses import ORJSONResponse
+from app.utils.stores import current_store
+from app.db import DATABASE_UNAVAILABLE_ERRORS
 from bson import ObjectId
 
 router = APIRouter(prefix="/extras", tags=["extras"])
 
-async def get_extras_service():
-    from app.main import app
-    return ExtrasService(app.mongodb)
+async def get_extras_service(request: Request) -> ExtrasService:
+    return request.app.container.extras
 
 @router.post("/", response_model=Extra)
 async def create_extra(
     extra_data: CreateExtraRequest,
+    store_id: str = Depends(current_store),
     extras_service: ExtrasService = Depends(get_extras_service)
 ):
     try:
-        return await extras_service.create_extra(extra_data.model_dump())
+        return ORJSONResponse(await extras_service.create_extra({**extra_data.model_dump(), "store_id": store_id}))
     except ValueError as ve:
         raise HTTPException(status_code=409, detail=str(ve))
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=PaginatedResponse[Extra])
 async def get_all_extras(
     pagination: PaginationParams = Depends(),
+    fields: Optional[SparseFields] = Depends(sparse_fields(Extra)),
+    store_id: str = Depends(current_store),
     extras_service: ExtrasService = Depends(get_extras_service)
 ):
-    extras, total = await extras_service.get_all_extras(pagination.skip, pagination.limit)
-    return PaginatedResponse.create(extras, total, pagination.page, pagination.limit)
+    extras, total = await extras_service.get_all_extras(store_id, pagination.skip, pagination.limit, fields)
+    page = PaginatedResponse.create(extras, total, pagination.page, pagination.limit)
+    return ORJSONResponse(page)
 
 @router.get("/{extra_id}", response_model=Extra)
 async def get_extra(
     extra_id: str,
+    fields: Optional[SparseFields] = Depends(sparse_fields(Extra)),
+    store_id: str = Depends(current_store),
     extras_service: ExtrasService = Depends(get_extras_service)
 ):
     if not ObjectId.is_valid(extra_id):
         raise HTTPException(status_code=400, detail="Invalid Id") 
-    extra = await extras_service.get_extra_by_id(extra_id)
+    extra = await extras_service.get_extra_by_id(store_id, extra_id, fields)
     if not extra:
         raise HTTPException(status_code=404, detail="Extra not found")
-    return extra
+    return ORJSONResponse(extra)
 
 @router.put("/{extra_id}", response_model=Extra)
 async def update_extra(
     extra_id: str,
     update_data: UpdateExtraRequest,
+    store_id: str = Depends(current_store),
     extras_service: ExtrasService = Depends(get_extras_service)
 ):
     if not ObjectId.is_valid(extra_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
-    extra = await extras_service.update_extra(extra_id, update_data.model_dump(exclude_unset=True))
+    extra = await extras_service.update_extra(store_id, extra_id, update_data.model_dump(exclude_unset=True))
     if not extra:
         raise HTTPException(status_code=404, detail="Extra not found")
-    return extra
+    return ORJSONResponse(extra)
 
 @router.delete("/{extra_id}", status_code=204)
 async def delete_extra(
     extra_id: str,
+    store_id: str = Depends(current_store),
     extras_service: ExtrasService = Depends(get_extras_service)
 ):
     if not ObjectId.is_valid(extra_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
     
     # Check if extra exists first
-    existing_extra = await extras_service.get_extra_by_id(extra_id)
+    existing_extra = await extras_service.get_extra_by_id(store_id, extra_id)
     if not existing_extra:
         raise HTTPException(status_code=404, detail="Extra not found")
     
-    await extras_service.delete_extra(extra_id)
+    await extras_service.delete_extra(store_id, extra_id)
     return None
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException, Request
+from app.storage import KEY_PATTERN
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+@router.get("/{key:path}")
+async def get_image(key: str, request: Request):
+    """An image from the local or in-memory storage backend, cacheable forever."""
+    response = await request.app.storage.response(key) if KEY_PATTERN.match(key) else None
+    if response is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return response
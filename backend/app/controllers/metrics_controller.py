@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus exposition of request, MongoDB and order metrics."""
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
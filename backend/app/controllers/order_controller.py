@@ -1,62 +1,81 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional
 from app.models.order import Order, OrderStatus
 from app.services.order_service import OrderService
 from app.validation.orders.requests import CreateOrderRequest, UpdateOrderStatusRequest
 from app.utils.pagination import PaginationParams, PaginatedResponse
+from app.utils.fields import SparseFields, sparse_fields
+from app.utils.responses import ORJSONResponse
+from app.utils.stores import current_store
+from app.db import DATABASE_UNAVAILABLE_ERRORS
+from app.metrics import record_order, record_order_failure
 from bson import ObjectId
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
-async def get_order_service():
-    from app.main import app
-    return OrderService(app.mongodb, app.mongodb_client)
+async def get_order_service(request: Request) -> OrderService:
+    return request.app.container.orders
 
 @router.post("/", response_model=Order)
 async def place_order(
     order_data: CreateOrderRequest,
+    store_id: str = Depends(current_store),
     order_service: OrderService = Depends(get_order_service)
 ):
     try:
-        return await order_service.create_order(order_data.model_dump())
+        order = await order_service.create_order({**order_data.model_dump(), "store_id": store_id})
+    except DATABASE_UNAVAILABLE_ERRORS:
+        record_order_failure("database_unavailable")
+        raise
     except Exception as e:
+        record_order_failure("rejected")
         raise HTTPException(status_code=400, detail=str(e))
+    record_order(order)
+    return ORJSONResponse(order)
 
 @router.get("/", response_model=PaginatedResponse[Order])
 async def get_all_orders(
     pagination: PaginationParams = Depends(),
+    fields: Optional[SparseFields] = Depends(sparse_fields(Order)),
+    store_id: str = Depends(current_store),
     order_service: OrderService = Depends(get_order_service)
 ):
-    orders, total = await order_service.get_all_orders(pagination.skip, pagination.limit)
-    return PaginatedResponse.create(orders, total, pagination.page, pagination.limit)
+    orders, total = await order_service.get_all_orders(store_id, pagination.skip, pagination.limit, fields)
+    page = PaginatedResponse.create(orders, total, pagination.page, pagination.limit)
+    return ORJSONResponse(page)
 
 @router.get("/{order_id}", response_model=Order)
 async def get_order(
     order_id: str,
+    fields: Optional[SparseFields] = Depends(sparse_fields(Order)),
+    store_id: str = Depends(current_store),
     order_service: OrderService = Depends(get_order_service)
 ):
     if not ObjectId.is_valid(order_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
-    order = await order_service.get_order_by_id(order_id)
+    order = await order_service.get_order_by_id(store_id, order_id, fields)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    return ORJSONResponse(order)
 
 @router.put("/{order_id}/status", response_model=Order)
 async def update_order_status(
     order_id: str,
     status_data: UpdateOrderStatusRequest,
+    store_id: str = Depends(current_store),
     order_service: OrderService = Depends(get_order_service)
 ):
     if not ObjectId.is_valid(order_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
     try:
-        order = await order_service.update_order_status(order_id, status_data.status)
+        order = await order_service.update_order_status(store_id, order_id, status_data.status)
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
-        return order
+        return ORJSONResponse(order)
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
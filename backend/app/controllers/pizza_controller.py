@@ -1,28 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
 from typing import List, Optional
 from bson import ObjectId
 from app.models.pizza import Pizza
 from app.services.pizza_service import PizzaService
-from app.services.firebase_service import FirebaseService
+from app.storage import ImageStorage, ImageTooLarge
 from app.utils.pizza_validation import validate_pizza_request
 from app.utils.pagination import PaginationParams, PaginatedResponse
+from app.utils.fields import SparseFields, sparse_fields
+from app.utils.responses import ORJSONResponse
+from app.utils.stores import current_store
+from app.images import start_variant_job
+from app.db import DATABASE_UNAVAILABLE_ERRORS
 
 router = APIRouter(prefix="/pizzas", tags=["pizzas"])
 
-async def get_pizza_service():
-    from app.main import app
-    return PizzaService(app.mongodb)
+async def get_pizza_service(request: Request) -> PizzaService:
+    return request.app.container.pizzas
 
-async def get_firebase_service():
-    return FirebaseService()
+async def get_image_storage(request: Request) -> ImageStorage:
+    return request.app.storage
 
-async def upload_image(image: Optional[UploadFile], firebase_service: FirebaseService, data: dict):
+async def upload_image(image: Optional[UploadFile], storage: ImageStorage, data: dict) -> Optional[bytes]:
+    """Upload ``image`` and set ``data["image_url"]``; returns its bytes for variant generation."""
     if image:
-        image_url = await firebase_service.upload_image(image)
+        try:
+            image_url = await storage.upload_image(image)
+        except ImageTooLarge as exc:
+            raise HTTPException(status_code=413, detail=str(exc))
         if image_url:
             data["image_url"] = image_url
+            await image.seek(0)
+            return await image.read()
         else:
             raise HTTPException(status_code=500, detail="Image upload failed")
+    return None
+
+def schedule_variants(pizza_service: PizzaService, storage: ImageStorage, pizza: Pizza, content: Optional[bytes]) -> None:
+    """Render the image variants outside the request; the pizza gets them once they are uploaded."""
+    if content:
+        start_variant_job(pizza_service, storage, pizza.store_id, pizza.id, pizza.image_url, content)
 
 @router.post("/", response_model=Pizza)
 async def create_pizza(
@@ -30,40 +46,51 @@ async def create_pizza(
     description: str = Form(...),
     price: str = Form(...),
     image: Optional[UploadFile] = File(None),
+    store_id: str = Depends(current_store),
     pizza_service: PizzaService = Depends(get_pizza_service),
-    firebase_service: FirebaseService = Depends(get_firebase_service)
+    storage: ImageStorage = Depends(get_image_storage)
 ):
     try:
         data = validate_pizza_request(name=name, description=description, price=price, for_create=True)
-        await upload_image(image, firebase_service, data)
-        return await pizza_service.create_pizza(data)
+        data["store_id"] = store_id
+        content = await upload_image(image, storage, data)
+        pizza = await pizza_service.create_pizza(data)
+        schedule_variants(pizza_service, storage, pizza, content)
+        return ORJSONResponse(pizza)
     except HTTPException:
         raise
     except ValueError as ve:
         raise HTTPException(status_code=409, detail=str(ve))
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=PaginatedResponse[Pizza])
 async def get_all_pizzas(
     pagination: PaginationParams = Depends(),
+    fields: Optional[SparseFields] = Depends(sparse_fields(Pizza)),
+    store_id: str = Depends(current_store),
     pizza_service: PizzaService = Depends(get_pizza_service)
 ):
-    pizzas, total = await pizza_service.get_all_pizzas(pagination.skip, pagination.limit)
-    return PaginatedResponse.create(pizzas, total, pagination.page, pagination.limit)
+    pizzas, total = await pizza_service.get_all_pizzas(store_id, pagination.skip, pagination.limit, fields)
+    page = PaginatedResponse.create(pizzas, total, pagination.page, pagination.limit)
+    return ORJSONResponse(page)
 
 @router.get("/{pizza_id}", response_model=Pizza)
 async def get_pizza(
     pizza_id: str,
+    fields: Optional[SparseFields] = Depends(sparse_fields(Pizza)),
+    store_id: str = Depends(current_store),
     pizza_service: PizzaService = Depends(get_pizza_service)
 ):
     if not ObjectId.is_valid(pizza_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
     
-    pizza = await pizza_service.get_pizza_by_id(pizza_id)
+    pizza = await pizza_service.get_pizza_by_id(store_id, pizza_id, fields)
     if not pizza:
         raise HTTPException(status_code=404, detail="Pizza not found")
-    return pizza
+    return ORJSONResponse(pizza)
 
 @router.put("/{pizza_id}", response_model=Pizza)
 async def update_pizza(
@@ -72,8 +99,9 @@ async def update_pizza(
     description: Optional[str] = Form(None),
     price: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
+    store_id: str = Depends(current_store),
     pizza_service: PizzaService = Depends(get_pizza_service),
-    firebase_service: FirebaseService = Depends(get_firebase_service)
+    storage: ImageStorage = Depends(get_image_storage)
 ):
     if not ObjectId.is_valid(pizza_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
@@ -82,25 +110,32 @@ async def update_pizza(
         data = validate_pizza_request(name=name, description=description, price=price, for_create=False)
         if not data:
             return
-        await upload_image(image, firebase_service, data)
-        updated_pizza = await pizza_service.update_pizza(pizza_id, data)
+        content = await upload_image(image, storage, data)
+        if content:
+            # The old variants show the previous image until the new ones are ready
+            data["image_variants"] = {}
+        updated_pizza = await pizza_service.update_pizza(store_id, pizza_id, data)
         if not updated_pizza:
             raise HTTPException(status_code=404, detail="Pizza not found")
-        return updated_pizza
+        schedule_variants(pizza_service, storage, updated_pizza, content)
+        return ORJSONResponse(updated_pizza)
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{pizza_id}", status_code=204)
 async def delete_pizza(
     pizza_id: str,
+    store_id: str = Depends(current_store),
     pizza_service: PizzaService = Depends(get_pizza_service)
 ):
     if not ObjectId.is_valid(pizza_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
-    existing_pizza = await pizza_service.get_pizza_by_id(pizza_id)
+    existing_pizza = await pizza_service.get_pizza_by_id(store_id, pizza_id)
     if not existing_pizza:
         raise HTTPException(status_code=404, detail="Pizza not found")
-    await pizza_service.delete_pizza(pizza_id)
+    await pizza_service.delete_pizza(store_id, pizza_id)
     return None
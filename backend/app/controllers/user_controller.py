@@ -1,27 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional
 from app.services.user_service import UserService
 from app.services.order_service import OrderService
 from app.models.user import User
 from app.models.order import Order
 from app.validation.users.requests import CreateUserRequest, UpdateUserRequest
 from app.utils.pagination import PaginationParams, PaginatedResponse
+from app.utils.fields import SparseFields, sparse_fields
+from app.utils.responses import ORJSONResponse
+from app.utils.stores import current_store
+from app.db import DATABASE_UNAVAILABLE_ERRORS
 from bson import ObjectId
 import re
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-async def get_user_service():
-    from app.main import app
-    return UserService(app.mongodb, app.mongodb_client)
+async def get_user_service(request: Request) -> UserService:
+    return request.app.container.users
 
-async def get_order_service():
-    from app.main import app
-    return OrderService(app.mongodb, app.mongodb_client)
+async def get_order_service(request: Request) -> OrderService:
+    return request.app.container.orders
 
 @router.get("/{user_id}/orders", response_model=List[Order])
 async def get_user_orders(
     user_id: str, 
+    fields: Optional[SparseFields] = Depends(sparse_fields(Order)),
+    store_id: str = Depends(current_store),
     user_service: UserService = Depends(get_user_service),
     order_service: OrderService = Depends(get_order_service)
 ):
@@ -31,35 +35,47 @@ async def get_user_orders(
         user = await user_service.get_user_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        orders = await order_service.get_orders_by_user(user_id)
-        return orders
+        orders = await order_service.get_orders_by_user(store_id, user_id, fields)
+        return ORJSONResponse(orders)
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(user_id: str, user_service: UserService = Depends(get_user_service)):
+async def get_user(
+    user_id: str,
+    fields: Optional[SparseFields] = Depends(sparse_fields(User)),
+    user_service: UserService = Depends(get_user_service)
+):
     if not ObjectId.is_valid(user_id):
         raise HTTPException(status_code=400, detail="Invalid Id")
     try:
-        user = await user_service.get_user_by_id(user_id)
+        user = await user_service.get_user_by_id(user_id, fields)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        return user
+        return ORJSONResponse(user)
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/", response_model=PaginatedResponse[User])
 async def get_all_users(
     pagination: PaginationParams = Depends(),
+    fields: Optional[SparseFields] = Depends(sparse_fields(User)),
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        users, total = await user_service.get_all_users(pagination.skip, pagination.limit)
-        return PaginatedResponse.create(users, total, pagination.page, pagination.limit)
+        users, total = await user_service.get_all_users(pagination.skip, pagination.limit, fields)
+        page = PaginatedResponse.create(users, total, pagination.page, pagination.limit)
+        return ORJSONResponse(page)
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -72,9 +88,11 @@ async def get_user_by_email(email: str, user_service: UserService = Depends(get_
         user = await user_service.get_user_by_email(email)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        return user
+        return ORJSONResponse(user)
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -84,11 +102,13 @@ async def create_user(
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        return await user_service.create_user(user_data.model_dump())
+        return ORJSONResponse(await user_service.create_user(user_data.model_dump()))
     except ValueError as ve:
         raise HTTPException(status_code=409, detail=str(ve))
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -104,9 +124,11 @@ async def update_user(
         user = await user_service.update_user(user_id, update_data.model_dump(exclude_unset=True))
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        return user
+        return ORJSONResponse(user)
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -125,5 +147,7 @@ async def delete_user(
         return None
     except HTTPException:
         raise
+    except DATABASE_UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
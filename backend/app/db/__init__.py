@@ -0,0 +1,28 @@
+from app.db.circuit_breaker import (
+    DATABASE_UNAVAILABLE_ERRORS,
+    CircuitBreaker,
+    CircuitOpenError,
+    mongo_breaker,
+)
+from app.db.deadline import deadline, remaining_time, request_deadline
+from app.db.listeners import BreakerCommandListener
+from app.db.pool import PoolMetricsListener, pool_metrics
+from app.db.client import create_client, event_listeners, pool_options, prewarm
+from app.db.policies import OperationPolicy, policies, policy_collection, policy_for
+from app.db.indexes import (
+    CASE_INSENSITIVE,
+    INDEXES,
+    ORDERS_SHARD_KEY,
+    IndexReconciler,
+    backfill_store_id,
+    index_reconciler,
+    index_usage,
+    reconcile_indexes,
+    shard_orders,
+)
+
+
+def report_unavailable(exc: Exception) -> None:
+    """Count a database timeout or connection failure towards opening the circuit."""
+    if not isinstance(exc, CircuitOpenError):
+        mongo_breaker.record_failure()
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The database circuit is open; the call was not attempted."""
+
+
+# Raised when the database is slow or unreachable rather than the request being wrong
+DATABASE_UNAVAILABLE_ERRORS = (CircuitOpenError, ConnectionFailure, ExecutionTimeout)
+
+
+class CircuitBreaker:
+    """Stop sending work to a database that keeps timing out.
+
+    ``failure_threshold`` timeouts within ``window`` seconds open the circuit:
+    callers fail fast (or fall back to cached data) for ``reset_timeout``
+    seconds. After that the circuit is half-open and lets traffic through; the
+    next success closes it, the next timeout opens it again.
+
+    Successes are reported by a driver command listener running on Motor's
+    worker threads, hence the lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        window: float = 10.0,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures: Deque[float] = deque()
+        self._opened_at = 0.0
+        self._opened = 0
+        self._rejected = 0
+        self._fallbacks = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the database now; counts the rejection if not."""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return True
+            self._rejected += 1
+            return False
+
+    def check(self) -> None:
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets traffic through again."""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._state = CLOSED
+                self._failures.clear()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self._clock()
+            state = self._current_state()
+            if state == OPEN:
+                return
+            self._failures.append(now)
+            while self._failures and self._failures[0] <= now - self.window:
+                self._failures.popleft()
+            if state == HALF_OPEN or len(self._failures) >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = now
+                self._opened += 1
+                self._failures.clear()
+
+    def record_fallback(self) -> None:
+        """Count a call answered from cached data instead of the database."""
+        with self._lock:
+            self._fallbacks += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "recent_failures": len(self._failures),
+                "failure_threshold": self.failure_threshold,
+                "window_seconds": self.window,
+                "reset_timeout_seconds": self.reset_timeout,
+                "opened": self._opened,
+                "rejected": self._rejected,
+                "cache_fallbacks": self._fallbacks,
+            }
+
+
+mongo_breaker = CircuitBreaker(
+    "mongodb",
+    failure_threshold=int(os.getenv("DB_BREAKER_FAILURE_THRESHOLD", "5")),
+    window=float(os.getenv("DB_BREAKER_WINDOW_SECONDS", "10")),
+    reset_timeout=float(os.getenv("DB_BREAKER_RESET_SECONDS", "10")),
+)
@@ -0,0 +1,48 @@
+import asyncio
+import os
+from typing import Any, Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.db.circuit_breaker import mongo_breaker
+from app.db.listeners import BreakerCommandListener
+from app.db.pool import pool_metrics
+from app.metrics import MetricsCommandListener
+
+
+def pool_options() -> Dict[str, Any]:
+    """Motor connection pool settings from ``MONGO_*`` environment variables."""
+    return {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+        "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+    }
+
+
+def event_listeners():
+    """Driver listeners feeding the circuit breaker, the pool stats and ``/metrics``."""
+    return [BreakerCommandListener(mongo_breaker), pool_metrics, MetricsCommandListener()]
+
+
+def create_client(url: Optional[str] = None, **options) -> AsyncIOMotorClient:
+    """Build the app's Motor client with the configured pool and listeners."""
+    settings = {**pool_options(), **options}
+    return AsyncIOMotorClient(url or os.getenv("MONGODB_URL"), event_listeners=event_listeners(), **settings)
+
+
+async def prewarm(database, connections: Optional[int] = None, timeout: float = 5.0) -> None:
+    """Open ``connections`` (``minPoolSize`` by default) pooled connections before traffic arrives.
+
+    Concurrent pings open the first connections; the driver's background task
+    tops the pool up to ``minPoolSize``, which is waited for (up to
+    ``timeout``) so the first requests do not pay for TCP, TLS and
+    authentication handshakes.
+    """
+    if connections is None:
+        connections = database.client.options.pool_options.min_pool_size
+    if connections <= 0:
+        return
+    await asyncio.gather(*(database.command("ping") for _ in range(connections)))
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + timeout
+    while pool_metrics.stats()["open"] < connections and loop.time() < give_up_at:
+        await asyncio.sleep(0.05)
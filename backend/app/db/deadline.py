@@ -0,0 +1,44 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import pymongo
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def request_deadline() -> Optional[float]:
+    """Seconds a request may spend on the database, from ``REQUEST_DEADLINE_SECONDS`` (``0`` disables)."""
+    seconds = float(os.getenv("REQUEST_DEADLINE_SECONDS", "5"))
+    return seconds if seconds > 0 else None
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Give the enclosed block ``seconds`` to finish its database work.
+
+    Uses the driver's operation timeout, so every command sent inside the
+    block (finds, counts, updates and whole transactions, through Motor too)
+    carries the time left as ``maxTimeMS`` and fails with a timeout error once
+    it is used up. Nested deadlines can only shorten the outer one.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        with pymongo.timeout(seconds):
+            yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or ``None`` outside of one."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
@@ -0,0 +1,40 @@
+"""Reconcile MongoDB indexes with the registry once, e.g. as a deploy step.
+
+Run from backend/: ``python -m app.db.ensure_indexes [--dry-run] [--shard]``
+
+``--shard`` (against a mongos) also shards ``orders`` on ``ORDERS_SHARD_KEY``.
+"""
+import argparse
+import asyncio
+import os
+from dotenv import load_dotenv
+from app.db.client import create_client
+from app.db.indexes import ORDERS_SHARD_KEY, reconcile_indexes, shard_orders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create missing MongoDB indexes and drop retired ones.")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--shard", action="store_true", help="also shard orders (the URL must point at a mongos)")
+    args = parser.parse_args()
+    load_dotenv()
+
+    async def run():
+        client = create_client(minPoolSize=0)
+        database_name = os.getenv("MONGODB_DB", "usersnack_db")
+        try:
+            report = await reconcile_indexes(client[database_name], dry_run=args.dry_run)
+            if args.shard and not args.dry_run:
+                await shard_orders(client, database_name)
+                print(f"orders: sharded on {ORDERS_SHARD_KEY}")
+        finally:
+            client.close()
+        for collection, changes in report.items():
+            summary = ", ".join(f"{key}: {', '.join(names)}" for key, names in changes.items() if names)
+            print(f"{collection}: {summary or 'up to date'}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
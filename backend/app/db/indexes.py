@@ -0,0 +1,253 @@
+"""Declarative index registry, reconciled against MongoDB.
+
+Every index the app relies on is listed in ``INDEXES``; ``reconcile_indexes``
+creates the missing ones (one ``createIndexes`` per collection, collections in
+parallel) and drops the names listed in ``RETIRED_INDEXES``. Workers run it in
+the background after startup; deploys can run it once instead with
+``python -m app.db.ensure_indexes``.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collation import Collation
+
+logger = logging.getLogger(__name__)
+
+# Collation of the case-insensitive unique indexes; queries must pass it to use them
+CASE_INSENSITIVE = Collation(locale="en", strength=2)
+
+# Catalog and orders are partitioned by store: store_id leads every index on
+# them, so one store's queries only walk that store's keys.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "pizzas": [
+        # Names are unique (case-insensitively) within a store
+        IndexModel(
+            [("store_id", ASCENDING), ("name", ASCENDING)],
+            name="uniq_pizzas_store_name_ci",
+            unique=True,
+            collation=CASE_INSENSITIVE,
+        ),
+        # Menu reads only ever ask for available pizzas; deleted ones stay out of the index
+        IndexModel(
+            [("store_id", ASCENDING), ("available", ASCENDING)],
+            name="idx_pizzas_store_available_partial",
+            partialFilterExpression={"available": True},
+        ),
+        IndexModel([("store_id", ASCENDING), ("created_at", DESCENDING)], name="idx_pizzas_store_created_at_desc"),
+    ],
+    "extras": [
+        IndexModel([("store_id", ASCENDING), ("name", ASCENDING)], name="uniq_extras_store_name", unique=True),
+        IndexModel(
+            [("store_id", ASCENDING), ("available", ASCENDING)],
+            name="idx_extras_store_available_partial",
+            partialFilterExpression={"available": True},
+        ),
+        IndexModel([("store_id", ASCENDING), ("created_at", DESCENDING)], name="idx_extras_store_created_at_desc"),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="uniq_users_email_ci", unique=True, collation=CASE_INSENSITIVE),
+        IndexModel([("created_at", DESCENDING)], name="idx_users_created_at_desc"),
+        IndexModel(
+            [("active", ASCENDING)],
+            name="idx_users_active_partial",
+            partialFilterExpression={"active": True},
+        ),
+    ],
+    "orders": [
+        IndexModel([("store_id", ASCENDING), ("created_at", DESCENDING)], name="idx_orders_store_created_at_desc"),
+        IndexModel(
+            [("store_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)],
+            name="idx_orders_store_user_id_created_at_desc",
+        ),
+    ],
+    # Refresh tokens: looked up by hash, revoked by family, purged once expired
+    "refresh_tokens": [
+        IndexModel([("token_hash", ASCENDING)], name="uniq_refresh_tokens_hash", unique=True),
+        IndexModel([("family_id", ASCENDING)], name="idx_refresh_tokens_family_id"),
+        IndexModel([("expires_at", ASCENDING)], name="ttl_refresh_tokens_expires_at", expireAfterSeconds=0),
+    ],
+    # Token revocations: polled by creation time, purged once every covered token expired
+    "revocations": [
+        IndexModel([("created_at", ASCENDING)], name="idx_revocations_created_at"),
+        IndexModel([("expires_at", ASCENDING)], name="ttl_revocations_expires_at", expireAfterSeconds=0),
+    ],
+}
+
+# Indexes replaced by an entry above; dropped when found
+RETIRED_INDEXES: Dict[str, List[str]] = {
+    "pizzas": [
+        "idx_pizzas_available",
+        "uniq_pizzas_name_ci",
+        "idx_pizzas_available_partial",
+        "idx_pizzas_created_at_desc",
+    ],
+    "extras": [
+        "idx_extras_available",
+        "uniq_extras_name",
+        "idx_extras_available_partial",
+        "idx_extras_created_at_desc",
+    ],
+    "users": ["idx_users_active"],
+    "orders": ["idx_orders_user_id", "idx_orders_created_at_desc"],
+}
+
+# Shard key for ``orders`` once one replica set is not enough (see shard_orders).
+# Every order query filters on store_id, so mongos routes it to the chunks of
+# that one store; hashing _id within a store spreads a busy store's inserts
+# over several chunks (and shards) instead of appending to the single
+# "newest" chunk a {store_id, created_at} range key would give it, so one
+# store's rush does not pile onto the shard that also serves its neighbours.
+# Zones on store_id ranges can still pin stores to a region.
+ORDERS_SHARD_KEY = {"store_id": ASCENDING, "_id": "hashed"}
+ORDERS_SHARD_INDEX = IndexModel(list(ORDERS_SHARD_KEY.items()), name="shard_orders_store_id_hashed_id")
+
+STORE_SCOPED_COLLECTIONS = ("pizzas", "extras", "orders")
+
+_COMPARED_OPTIONS = ("unique", "partialFilterExpression", "expireAfterSeconds")
+
+
+def _matches(existing: Dict[str, Any], wanted: Dict[str, Any]) -> bool:
+    """Whether an index from ``listIndexes`` has the keys and options of a registry entry."""
+    if list(existing["key"].items()) != list(wanted["key"].items()):
+        return False
+    if any(existing.get(option) != wanted.get(option) for option in _COMPARED_OPTIONS):
+        return False
+    existing_collation = existing.get("collation") or {}
+    wanted_collation = wanted.get("collation") or {}
+    return all(existing_collation.get(field) == wanted_collation.get(field) for field in ("locale", "strength"))
+
+
+async def _existing_indexes(collection) -> Dict[str, Dict[str, Any]]:
+    return {index["name"]: index async for index in collection.list_indexes()}
+
+
+async def _reconcile_collection(database, name: str, dry_run: bool) -> Dict[str, List[str]]:
+    collection = database[name]
+    existing = await _existing_indexes(collection)
+    missing, conflicting = [], []
+    for model in INDEXES[name]:
+        wanted = model.document
+        current = existing.get(wanted["name"])
+        if current is None:
+            missing.append(model)
+        elif not _matches(current, wanted):
+            conflicting.append(wanted["name"])
+    retired = [index for index in RETIRED_INDEXES.get(name, []) if index in existing]
+    if conflicting:
+        logger.warning(
+            "Indexes on %s differ from the registry and were left alone: %s",
+            name, ", ".join(conflicting),
+        )
+    if not dry_run:
+        if missing:
+            await collection.create_indexes(missing)
+        for index in retired:
+            await collection.drop_index(index)
+    known = {model.document["name"] for model in INDEXES[name]} | {"_id_"}
+    return {
+        "missing" if dry_run else "created": [model.document["name"] for model in missing],
+        "missing_retired" if dry_run else "dropped": retired,
+        "conflicting": conflicting,
+        "unknown": sorted(set(existing) - known - set(retired)),
+    }
+
+
+async def reconcile_indexes(database, dry_run: bool = False) -> Dict[str, Dict[str, List[str]]]:
+    """Create missing registry indexes and drop retired ones; ``dry_run`` only reports."""
+    names = list(INDEXES)
+    results = await asyncio.gather(*(_reconcile_collection(database, name, dry_run) for name in names))
+    return dict(zip(names, results))
+
+
+async def index_usage(database) -> Dict[str, Any]:
+    """``$indexStats`` for every registry collection, with unused, missing and unknown hints.
+
+    Access counts are per ``mongod`` and reset when it restarts, so an index
+    only counts as unused once the server has been up for a representative
+    period. Unique and TTL indexes are never reported as unused: they enforce
+    a constraint or expire documents even when no query reads them.
+    """
+    report = {}
+    for name, models in INDEXES.items():
+        wanted = {model.document["name"]: model.document for model in models}
+        stats = {}
+        async for entry in database[name].aggregate([{"$indexStats": {}}]):
+            stats[entry["name"]] = {
+                "ops": entry["accesses"]["ops"],
+                "since": entry["accesses"]["since"],
+                "host": entry.get("host"),
+            }
+        hints = []
+        for index, usage in sorted(stats.items()):
+            spec = wanted.get(index, {})
+            if index == "_id_" or spec.get("unique") or "expireAfterSeconds" in spec:
+                continue
+            if usage["ops"] == 0:
+                hints.append({"index": index, "hint": "unused"})
+            if index not in wanted:
+                hints.append({"index": index, "hint": "unknown: not in the index registry"})
+        for index in wanted:
+            if index not in stats:
+                hints.append({"index": index, "hint": "missing: run python -m app.db.ensure_indexes"})
+        report[name] = {"indexes": stats, "hints": hints}
+    return report
+
+
+async def backfill_store_id(database, store_id: str) -> Dict[str, int]:
+    """Assign documents written before stores existed to ``store_id``.
+
+    ``{store_id: null}`` also matches a missing field and uses the leading
+    store_id key, so once everything is assigned this costs one index probe
+    per collection.
+    """
+    assigned = {}
+    for name in STORE_SCOPED_COLLECTIONS:
+        result = await database[name].update_many({"store_id": None}, {"$set": {"store_id": store_id}})
+        assigned[name] = result.modified_count
+    return assigned
+
+
+async def shard_orders(client, database_name: str) -> None:
+    """Shard ``orders`` on ``ORDERS_SHARD_KEY`` (run against a mongos)."""
+    await client[database_name].orders.create_indexes([ORDERS_SHARD_INDEX])
+    await client.admin.command("shardCollection", f"{database_name}.orders", key=ORDERS_SHARD_KEY)
+
+
+class IndexReconciler:
+    """Runs ``reconcile_indexes`` for a worker and remembers how it went.
+
+    With ``INDEX_RECONCILE_ON_STARTUP`` off (when deploys run the CLI instead)
+    it only checks, and reports missing indexes without creating them.
+    """
+
+    def __init__(self):
+        self.status = "pending"
+        self.report: Optional[Dict[str, Dict[str, List[str]]]] = None
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+
+    async def run(self, database, dry_run: Optional[bool] = None) -> None:
+        if dry_run is None:
+            dry_run = os.getenv("INDEX_RECONCILE_ON_STARTUP", "true").lower() not in ("1", "true", "yes")
+        self.status = "running"
+        start = time.perf_counter()
+        try:
+            self.report = await reconcile_indexes(database, dry_run=dry_run)
+        except Exception as exc:
+            self.status, self.error = "failed", str(exc)
+            raise
+        self.status, self.error = "checked" if dry_run else "reconciled", None
+        self.seconds = round(time.perf_counter() - start, 3)
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"status": self.status, "seconds": self.seconds, "error": self.error, "collections": self.report}
+
+
+index_reconciler = IndexReconciler()
+
@@ -0,0 +1,23 @@
+from pymongo import monitoring
+from app.db.circuit_breaker import CircuitBreaker
+
+
+class BreakerCommandListener(monitoring.CommandListener):
+    """Close a half-open circuit as soon as the database answers a command.
+
+    Failures are not counted here: a timed-out request may fail while
+    connecting or selecting a server, before any command is sent, so they
+    are counted once per request where the error surfaces.
+    """
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.breaker.record_success()
+
+    def failed(self, event):
+        pass
@@ -0,0 +1,80 @@
+import os
+from typing import Any, Dict, NamedTuple, Optional
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import Primary, SecondaryPreferred, _ServerMode
+from pymongo.write_concern import WriteConcern
+
+
+class OperationPolicy(NamedTuple):
+    """Where a service operation reads from and how durable its writes must be."""
+
+    read_preference: _ServerMode = Primary()
+    read_concern: Optional[ReadConcern] = None
+    write_concern: Optional[WriteConcern] = None
+
+    def collection_options(self) -> Dict[str, Any]:
+        options = {"read_preference": self.read_preference}
+        if self.read_concern is not None:
+            options["read_concern"] = self.read_concern
+        if self.write_concern is not None:
+            options["write_concern"] = self.write_concern
+        return options
+
+    def transaction_options(self) -> Dict[str, Any]:
+        """Options for ``session.start_transaction``; transactions always read from the primary."""
+        options = {"read_preference": Primary()}
+        if self.read_concern is not None:
+            options["read_concern"] = self.read_concern
+        if self.write_concern is not None:
+            options["write_concern"] = self.write_concern
+        return options
+
+
+def report_read_preference() -> _ServerMode:
+    """Secondaries (primary if none qualifies) at most ``MONGO_REPORT_MAX_STALENESS_SECONDS`` behind.
+
+    ``MONGO_REPORTS_ON_SECONDARIES=false`` keeps reports on the primary.
+    The driver requires a staleness of at least 90 seconds.
+    """
+    if os.getenv("MONGO_REPORTS_ON_SECONDARIES", "true").lower() not in ("1", "true", "yes"):
+        return Primary()
+    return SecondaryPreferred(max_staleness=max(90, int(os.getenv("MONGO_REPORT_MAX_STALENESS_SECONDS", "120"))))
+
+
+def majority_writes() -> WriteConcern:
+    return WriteConcern("majority", wtimeout=int(os.getenv("MONGO_MAJORITY_WTIMEOUT_MS", "5000")))
+
+
+def default_policies() -> Dict[str, OperationPolicy]:
+    """Policy per ``<collection>.<operation>``; anything not listed uses the client defaults.
+
+    Admin lists are reports: they tolerate lag and go to secondaries with a
+    ``local`` read. Money and credentials are written with ``majority`` so an
+    acknowledged order, status change or token revocation survives a
+    failover; order placement also reads its prices at ``majority``.
+    """
+    reports = OperationPolicy(report_read_preference(), ReadConcern("local"))
+    durable = OperationPolicy(write_concern=majority_writes())
+    return {
+        "orders.create": OperationPolicy(read_concern=ReadConcern("majority"), write_concern=majority_writes()),
+        "orders.update_status": durable,
+        "orders.list": reports,
+        "users.list": reports,
+        "refresh_tokens.write": durable,
+        "revocations.write": durable,
+    }
+
+
+policies = default_policies()
+
+
+def policy_for(operation: str) -> OperationPolicy:
+    return policies.get(operation, OperationPolicy())
+
+
+def policy_collection(database, name: str, operation: str):
+    """``database[name]`` with the read preference and concerns of ``operation``."""
+    policy = policies.get(operation)
+    if policy is None:
+        return database[name]
+    return database[name].with_options(**policy.collection_options())
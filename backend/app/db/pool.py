@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Any, Dict
+from pymongo import monitoring
+from app.metrics import MONGODB_POOL_CHECKOUT_FAILURES, MONGODB_POOL_CHECKOUT_WAIT, MONGODB_POOL_CONNECTIONS
+from app.utils.histogram import Histogram
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Connection pool counters and how long operations wait to check out a connection.
+
+    Each event updates both ``stats()`` and the ``mongodb_pool_*`` Prometheus
+    series. Check-out events carry no duration, but the driver checks a connection
+    out synchronously on the thread running the operation, so the start time
+    is kept per thread.
+    """
+
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {
+            "checked_out": 0,
+            "checkout_failed": 0,
+            "checkout_timeouts": 0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "pool_cleared": 0,
+        }
+        self._in_use = 0
+        self._open = 0
+
+    def _count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += delta
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def _observe_wait(self) -> None:
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            waited = time.perf_counter() - started
+            self.checkout_wait.observe(waited)
+            MONGODB_POOL_CHECKOUT_WAIT.observe(waited)
+            self._local.started = None
+
+    def connection_checked_out(self, event):
+        self._observe_wait()
+        with self._lock:
+            self._counters["checked_out"] += 1
+            self._in_use += 1
+        MONGODB_POOL_CONNECTIONS.labels("in_use").inc()
+
+    def connection_check_out_failed(self, event):
+        self._observe_wait()
+        self._count("checkout_failed")
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self._count("checkout_timeouts")
+        MONGODB_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._in_use -= 1
+        MONGODB_POOL_CONNECTIONS.labels("in_use").dec()
+
+    def connection_created(self, event):
+        with self._lock:
+            self._counters["connections_created"] += 1
+            self._open += 1
+        MONGODB_POOL_CONNECTIONS.labels("open").inc()
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._counters["connections_closed"] += 1
+            self._open -= 1
+        MONGODB_POOL_CONNECTIONS.labels("open").dec()
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count("pool_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters, open=self._open, in_use=self._in_use)
+        stats["checkout_wait_seconds"] = self.checkout_wait.snapshot()
+        return stats
+
+
+pool_metrics = PoolMetricsListener()
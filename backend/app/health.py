@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.db import deadline, index_reconciler, mongo_breaker, pool_metrics
+from app.utils.stores import default_store_id
+
+logger = logging.getLogger(__name__)
+
+# Pages the frontend loads first: the menu (9 per page), its admin list and the extras picker
+WARM_CACHE_PAGES = (
+    ("pizzas", "get_all_pizzas", 0, 9),
+    ("pizzas", "get_all_pizzas", 0, 10),
+    ("extras", "get_all_extras", 0, 10),
+)
+
+
+def warm_cache_stores() -> List[str]:
+    """Stores whose catalog is warmed, from ``WARM_CACHE_STORES`` (the default store if unset)."""
+    stores = os.getenv("WARM_CACHE_STORES", "")
+    return [store.strip() for store in stores.split(",") if store.strip()] or [default_store_id()]
+
+
+async def warm_cache(container) -> None:
+    """Load the first catalog pages through the services so they are cached before traffic arrives."""
+    for store_id in warm_cache_stores():
+        for service, method, skip, limit in WARM_CACHE_PAGES:
+            await getattr(getattr(container, service), method)(store_id, skip, limit, None)
+
+
+class Readiness:
+    """Startup warmup progress and a cached MongoDB ping, reported by ``/health/ready``.
+
+    The app starts serving (``/health/live`` answers) as soon as its clients
+    exist; warmup steps then run in the background, in order, and are retried
+    until they succeed. The worker only reports ready once every step is done
+    and a recent ping succeeded, so a load balancer holds traffic back until
+    the pool is open, indexes exist and the catalog cache is warm. Pings are
+    cached for ``HEALTH_PING_CACHE_SECONDS`` so frequent probes from several
+    balancers cost at most one round trip per interval.
+    """
+
+    def __init__(self, ping_ttl: Optional[float] = None, ping_timeout: Optional[float] = None):
+        self.ping_ttl = float(os.getenv("HEALTH_PING_CACHE_SECONDS", "2")) if ping_ttl is None else ping_ttl
+        self.ping_timeout = float(os.getenv("HEALTH_PING_TIMEOUT_SECONDS", "1")) if ping_timeout is None else ping_timeout
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self._ping: Optional[Dict[str, Any]] = None
+        self._pinged_at = 0.0
+
+    def reset(self) -> None:
+        self.steps = {}
+        self._ping = None
+        self._pinged_at = 0.0
+
+    @property
+    def warmed_up(self) -> bool:
+        return bool(self.steps) and all(step["status"] == "done" for step in self.steps.values())
+
+    async def warm_up(
+        self,
+        steps: Dict[str, Callable[[], Awaitable[Any]]],
+        retry_interval: Optional[float] = None,
+    ) -> None:
+        """Run the named warmup ``steps`` in order, retrying a failed step until it succeeds."""
+        if retry_interval is None:
+            retry_interval = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+        self.steps = {name: {"status": "pending"} for name in steps}
+        for name, step in steps.items():
+            state = self.steps[name]
+            while True:
+                state["status"] = "running"
+                start = time.perf_counter()
+                try:
+                    await step()
+                except Exception as exc:
+                    logger.exception("Warmup step %s failed; retrying in %ss", name, retry_interval)
+                    state.update(status="failed", error=str(exc), attempts=state.get("attempts", 0) + 1)
+                    await asyncio.sleep(retry_interval)
+                    continue
+                state.update(status="done", seconds=round(time.perf_counter() - start, 3))
+                state.pop("error", None)
+                break
+
+    async def ping(self, database) -> Dict[str, Any]:
+        """Result of a MongoDB ping, re-checked at most once every ``ping_ttl`` seconds."""
+        now = time.monotonic()
+        if self._ping is not None and now - self._pinged_at < self.ping_ttl:
+            return {**self._ping, "age_seconds": round(now - self._pinged_at, 3)}
+        start = time.perf_counter()
+        try:
+            with deadline(self.ping_timeout):
+                await database.command("ping")
+            result = {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 3)}
+        except Exception as exc:
+            result = {"ok": False, "error": str(exc) or type(exc).__name__}
+        self._ping, self._pinged_at = result, time.monotonic()
+        return {**result, "age_seconds": 0.0}
+
+    async def check(self, database) -> Dict[str, Any]:
+        """Readiness report; ``ready`` is true once warmup is done and MongoDB answers."""
+        mongo = await self.ping(database)
+        pool = pool_metrics.stats()
+        return {
+            "ready": self.warmed_up and mongo["ok"],
+            "warmup": self.steps,
+            "indexes": index_reconciler.stats(),
+            "mongo": mongo,
+            "pool": {name: pool[name] for name in ("open", "in_use", "checkout_timeouts")},
+            "circuit_breaker": mongo_breaker.stats()["state"],
+        }
+
+
+readiness = Readiness()
@@ -0,0 +1,9 @@
+from app.images.render import FORMATS, VARIANTS, render_variants
+from app.images.variants import (
+    VariantPool,
+    attach_variants,
+    drain_variant_jobs,
+    start_variant_job,
+    store_variants,
+    variant_pool,
+)
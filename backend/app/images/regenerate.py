@@ -0,0 +1,97 @@
+"""Render image variants for pizzas that have an image but no variants yet.
+
+Run from backend/: ``python -m app.images.regenerate [--store STORE] [--force]``
+
+``--force`` re-renders every pizza with an image, e.g. after changing
+``VARIANTS``. Workers' catalog caches are invalidated as each pizza is updated.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, Optional
+import httpx
+from dotenv import load_dotenv
+from app.cache import create_cache_backend
+from app.db.client import create_client
+from app.images.variants import store_variants, variant_pool
+from app.storage import create_storage
+from app.services.pizza_service import PizzaService
+
+logger = logging.getLogger(__name__)
+
+
+async def regenerate_variants(
+    pizza_service: PizzaService,
+    storage,
+    fetch: Callable[[str], Awaitable[bytes]],
+    store_id: Optional[str] = None,
+    force: bool = False,
+    concurrency: int = 4,
+) -> Dict[str, int]:
+    """Fetch each pizza's image, render and upload its variants; returns counts."""
+    query = {"image_url": {"$nin": [None, ""]}}
+    if store_id:
+        query["store_id"] = store_id
+    if not force:
+        query["image_variants"] = {"$in": [None, {}]}
+    projection = {"store_id": 1, "image_url": 1}
+    pizzas = await pizza_service.database.pizzas.find(query, projection).to_list(None)
+
+    counts = {"updated": 0, "failed": 0, "skipped": 0}
+    slots = asyncio.Semaphore(concurrency)
+
+    async def regenerate(pizza):
+        async with slots:
+            try:
+                data = await fetch(pizza["image_url"])
+                variants = await store_variants(storage, data)
+                changed = await pizza_service.set_image_variants(
+                    pizza["store_id"], pizza["_id"], pizza["image_url"], variants
+                )
+            except Exception:
+                logger.exception("Regenerating variants for pizza %s failed", pizza["_id"])
+                counts["failed"] += 1
+                return
+            counts["updated" if changed else "skipped"] += 1
+
+    await asyncio.gather(*(regenerate(pizza) for pizza in pizzas))
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill pizza image variants.")
+    parser.add_argument("--store", help="only pizzas of this store")
+    parser.add_argument("--force", action="store_true", help="also re-render pizzas that already have variants")
+    parser.add_argument("--concurrency", type=int, default=4, help="pizzas processed at once")
+    args = parser.parse_args()
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    async def run():
+        client = create_client(minPoolSize=0)
+        cache = create_cache_backend()
+        storage = create_storage()
+        try:
+            async with httpx.AsyncClient(timeout=30, follow_redirects=True) as http:
+                async def fetch(url: str) -> bytes:
+                    response = await http.get(url)
+                    response.raise_for_status()
+                    return response.content
+
+                pizza_service = PizzaService(client[os.getenv("MONGODB_DB", "usersnack_db")], cache)
+                counts = await regenerate_variants(
+                    pizza_service, storage, fetch, args.store, args.force, args.concurrency
+                )
+        finally:
+            variant_pool.close()
+            storage.close()
+            await cache.close()
+            client.close()
+        print(", ".join(f"{key}: {value}" for key, value in counts.items()))
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Resizing pizza images into the variants the menu shows.
+
+Runs in the variant process pool, so it only imports what a spawned worker
+needs; Pillow is imported on first use rather than by the app.
+"""
+from io import BytesIO
+from typing import Dict, Tuple
+
+# Longest side in pixels, largest first: each variant is scaled down from the previous one
+VARIANTS: Dict[str, int] = {"hero": 1280, "card": 640, "thumbnail": 200}
+
+# Variant format -> (Pillow format, content type, save options)
+FORMATS: Dict[str, Tuple[str, str, dict]] = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def render_variants(data: bytes) -> Dict[str, Dict[str, bytes]]:
+    """Encode ``data`` as every variant in every format: ``{variant: {format: bytes}}``.
+
+    Images are never scaled up; EXIF orientation is applied and metadata
+    dropped. JPEGs are decoded straight at the largest size needed, which
+    skips most of the work for multi-megapixel phone photos.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as source:
+        largest = max(VARIANTS.values())
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    rendered = {}
+    for name, side in VARIANTS.items():
+        image.thumbnail((side, side), Image.LANCZOS)
+        encoded = {}
+        for variant_format, (pil_format, _, options) in FORMATS.items():
+            buffer = BytesIO()
+            image.save(buffer, pil_format, **options)
+            encoded[variant_format] = buffer.getvalue()
+        rendered[name] = encoded
+    return rendered
@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Set
+from app.db import deadline, request_deadline
+from app.images.render import FORMATS, render_variants
+from app.storage import UPLOAD_BUCKETS
+from app.utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class VariantPool:
+    """Renders image variants in a process pool, off the event loop and off the GIL.
+
+    The pool is started on first use with ``spawn``, so workers never inherit
+    the parent's Motor threads or open sockets, and it is reused for every
+    later image. ``IMAGE_VARIANT_PROCESSES`` sets its size per app worker.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = int(os.getenv("IMAGE_VARIANT_PROCESSES", "1")) if processes is None else processes
+        self.duration = Histogram(UPLOAD_BUCKETS)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._counters = {"rendered": 0, "failed": 0}
+        self.in_flight = 0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    async def render(self, data: bytes) -> Dict[str, Dict[str, bytes]]:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+        start = time.perf_counter()
+        self.in_flight += 1
+        try:
+            rendered = await asyncio.get_running_loop().run_in_executor(self._executor, render_variants, data)
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            self.in_flight -= 1
+            self.duration.observe(time.perf_counter() - start)
+        self._count("rendered")
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "processes": self.processes,
+            "in_flight": self.in_flight,
+            "duration_seconds": self.duration.snapshot(),
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+variant_pool = VariantPool()
+
+
+async def store_variants(storage, data: bytes, pool: VariantPool = variant_pool) -> Dict[str, Dict[str, str]]:
+    """Render ``data`` and upload every variant; returns ``{variant: {format: url}}``."""
+    rendered = await pool.render(data)
+    uploads = []
+    for name, encoded in rendered.items():
+        for variant_format, content in encoded.items():
+            _, content_type, _ = FORMATS[variant_format]
+            uploads.append((name, variant_format, storage.upload_bytes(content, content_type)))
+    urls = await asyncio.gather(*(upload for _, _, upload in uploads))
+    if not all(urls):
+        raise RuntimeError("Uploading image variants failed")
+    variants: Dict[str, Dict[str, str]] = {}
+    for (name, variant_format, _), url in zip(uploads, urls):
+        variants.setdefault(name, {})[variant_format] = url
+    return variants
+
+
+async def attach_variants(pizza_service, storage, store_id: str, pizza_id, image_url: str, data: bytes) -> None:
+    """Background task after a pizza image upload: render, upload and record its variants.
+
+    Failures are only logged; the pizza keeps its original ``image_url`` and
+    ``python -m app.images.regenerate`` can fill the variants in later.
+    """
+    try:
+        variants = await store_variants(storage, data)
+        # Rendering may take longer than a request's deadline; the write gets a budget of its own
+        with deadline(request_deadline()):
+            await pizza_service.set_image_variants(store_id, pizza_id, image_url, variants)
+    except Exception:
+        logger.exception("Generating image variants for pizza %s failed", pizza_id)
+
+
+_variant_jobs: Set[asyncio.Task] = set()
+
+
+def start_variant_job(pizza_service, storage, store_id: str, pizza_id, image_url: str, data: bytes) -> asyncio.Task:
+    """Run ``attach_variants`` on its own, not as part of the request that uploaded the image.
+
+    The job starts from an empty context, so it is not bound by the request's
+    database deadline, and the request's bulkhead and admission slots are
+    released as soon as its response is sent.
+    """
+    job = attach_variants(pizza_service, storage, store_id, pizza_id, image_url, data)
+    task = asyncio.get_running_loop().create_task(job, context=contextvars.Context())
+    _variant_jobs.add(task)
+    task.add_done_callback(_variant_jobs.discard)
+    return task
+
+
+async def drain_variant_jobs(timeout: Optional[float] = None) -> None:
+    """Wait up to ``timeout`` seconds for running variant jobs, then cancel what is left.
+
+    A cancelled job leaves the pizza without variants; ``python -m
+    app.images.regenerate`` fills them in later.
+    """
+    jobs = list(_variant_jobs)
+    if not jobs:
+        return
+    _, pending = await asyncio.wait(jobs, timeout=timeout)
+    for job in pending:
+        job.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
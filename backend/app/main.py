@@ -1,6 +1,7 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
 from app.controllers.pizza_controller import router as pizza_router
@@ -8,41 +9,141 @@ from app.controllers.extras_controller import router as extra_router
 from app.controllers.order_controller import router as order_router
 from app.controllers.user_controller import router as user_router
 from app.controllers.auth_controller import router as auth_router
+from app.controllers.admin_controller import router as admin_router
+from app.controllers.images_controller import router as images_router
+from app.controllers.metrics_controller import router as metrics_router
 from app.middleware.auth_middleware import JWTAuthMiddleware
-from pymongo.collation import Collation
+from app.middleware.rate_limit_middleware import RateLimitMiddleware
+from app.middleware.admission_middleware import AdmissionMiddleware
+from app.middleware.bulkhead_middleware import BulkheadMiddleware
+from app.middleware.deadline_middleware import DeadlineMiddleware
+from app.middleware.upload_limit_middleware import UploadLimitMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.profiling_middleware import ProfilingMiddleware
+from app.utils.responses import ORJSONResponse
+from app.cache import create_cache_backend
+from app.ratelimit import create_bucket_store
+from app.auth.revocation import revocation_list
+from app.admission import lag_monitor
+from app.profiling import loop_watchdog
+from app.db import (
+    DATABASE_UNAVAILABLE_ERRORS,
+    backfill_store_id,
+    create_client,
+    index_reconciler,
+    mongo_breaker,
+    prewarm,
+    report_unavailable,
+)
+from app.services.container import ServiceContainer
+from app.storage import create_storage
+from app.images import drain_variant_jobs, variant_pool
+from app.health import readiness, warm_cache
+from app.utils.stores import default_store_id
 
 load_dotenv()
 
-app = FastAPI(title="UserSnack API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database pool, cache and shared services for the app's lifetime.
+
+    Warming the pool, ensuring indexes and filling the catalog cache run in
+    the background; ``/health/ready`` reports not ready until they finish.
+    """
+    await lag_monitor.start()
+    await loop_watchdog.start()
+    app.mongodb_client = create_client()
+    app.mongodb = app.mongodb_client[os.getenv("MONGODB_DB", "usersnack_db")]
+    app.cache = create_cache_backend()
+    await app.cache.start()
+    app.rate_limit_store = create_bucket_store()
+    app.storage = create_storage()
+    await revocation_list.start(app.mongodb, app.cache)
+    app.container = ServiceContainer(app.mongodb_client, app.mongodb, app.cache)
+    readiness.reset()
+    index_reconciler.reset()
+    app.warmup = asyncio.create_task(readiness.warm_up({
+        "pool": lambda: prewarm(app.mongodb),
+        "stores": lambda: backfill_store_id(app.mongodb, default_store_id()),
+        "indexes": lambda: index_reconciler.run(app.mongodb),
+        "cache": lambda: warm_cache(app.container),
+    }))
+    yield
+    app.warmup.cancel()
+    try:
+        await app.warmup
+    except asyncio.CancelledError:
+        pass
+    # Variants still rendering get a few seconds; regenerate fills in any that are cut off
+    await drain_variant_jobs(timeout=5)
+    app.storage.close()
+    variant_pool.close()
+    await revocation_list.stop()
+    await lag_monitor.stop()
+    await loop_watchdog.stop()
+    await app.cache.close()
+    if app.rate_limit_store is not None:
+        await app.rate_limit_store.close()
+    app.mongodb_client.close()
+
+app = FastAPI(title="UserSnack API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Per-request database deadline and fail-fast while the MongoDB circuit is open
+app.add_middleware(DeadlineMiddleware)
+
+# Per-route-class concurrency limits (inside auth, so only authenticated work holds a slot)
+app.add_middleware(BulkheadMiddleware)
+
+# Image upload size cap, enforced while the multipart body streams in
+app.add_middleware(UploadLimitMiddleware)
+
+# JWT Authentication middleware
+app.add_middleware(JWTAuthMiddleware)
+
+# Load shedding by event-loop lag, before any per-request work
+app.add_middleware(AdmissionMiddleware)
 
-# CORS middleware for cross-site request protection
+# Rate limiting for expensive public endpoints (first to reject, so floods cost least)
+app.add_middleware(RateLimitMiddleware)
+
+# Opt-in per-request stack sampling (X-Profile header or PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
+# Request metrics and Server-Timing (outside the rejecting middlewares, so their responses are measured too)
+app.add_middleware(MetricsMiddleware)
+
+# CORS middleware for cross-site request protection (outermost, so 401/429/503
+# rejections carry the CORS headers and the browser can read their Retry-After)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
-# JWT Authentication middleware
-app.add_middleware(JWTAuthMiddleware)
-
 # Include routers
 app.include_router(auth_router)
 app.include_router(pizza_router)
 app.include_router(extra_router)
 app.include_router(order_router)
 app.include_router(user_router)
+app.include_router(admin_router)
+app.include_router(images_router)
+app.include_router(metrics_router)
 
-@app.on_event("startup")
-async def startup_db_client():
-    app.mongodb_client = AsyncIOMotorClient(os.getenv("MONGODB_URL"))
-    app.mongodb = app.mongodb_client[os.getenv("MONGODB_DB", "usersnack_db")]
-    await create_indexes(app.mongodb)
+async def database_unavailable_handler(request: Request, exc: Exception):
+    """Answer database timeouts and an open circuit with a retryable 503."""
+    report_unavailable(exc)
+    return ORJSONResponse(
+        {"detail": "Database temporarily unavailable"},
+        status_code=503,
+        headers={"Retry-After": str(max(1, round(mongo_breaker.retry_after())))},
+    )
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    app.mongodb_client.close()
+for error in DATABASE_UNAVAILABLE_ERRORS:
+    app.add_exception_handler(error, database_unavailable_handler)
 
 def get_database():
     return app.mongodb
@@ -52,42 +153,14 @@ async def root():
     return {"message": "Welcome to UserSnack API"}
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
+    """Liveness: the worker's event loop is serving requests."""
     return {"status": "healthy"}
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: warmup finished and MongoDB answers; 503 until then."""
+    report = await readiness.check(app.mongodb)
+    return ORJSONResponse(report, status_code=200 if report["ready"] else 503)
 
-async def create_indexes(db):
-    """Create required unique and performance indexes."""
-    # Case-insensitive unique index on pizzas.name
-    pizzas_collation = Collation(locale="en", strength=2)
-    await db.pizzas.create_index(
-        "name",
-        name="uniq_pizzas_name_ci",
-        unique=True,
-        collation=pizzas_collation,
-    )
-    # Perf indexes for pizzas
-    await db.pizzas.create_index([("available", 1)], name="idx_pizzas_available")
-    await db.pizzas.create_index([("created_at", -1)], name="idx_pizzas_created_at_desc")
-
-    # Unique index on extras.name (case-sensitive acceptable)
-    await db.extras.create_index("name", name="uniq_extras_name", unique=True)
-    # Perf indexes for extras
-    await db.extras.create_index([("available", 1)], name="idx_extras_available")
-    await db.extras.create_index([("created_at", -1)], name="idx_extras_created_at_desc")
-
-    # Case-insensitive unique index on users.email
-    users_collation = Collation(locale="en", strength=2)
-    await db.users.create_index(
-        "email",
-        name="uniq_users_email_ci",
-        unique=True,
-        collation=users_collation,
-    )
-    # Perf indexes for users
-    await db.users.create_index([("created_at", -1)], name="idx_users_created_at_desc")
-    await db.users.create_index([("active", 1)], name="idx_users_active")
-
-    # Perf indexes for orders
-    await db.orders.create_index([("user_id", 1)], name="idx_orders_user_id")
-    await db.orders.create_index([("created_at", -1)], name="idx_orders_created_at_desc")
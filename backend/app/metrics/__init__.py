@@ -0,0 +1,17 @@
+from app.metrics.registry import (
+    EVENT_LOOP_BLOCKED_SECONDS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    MONGODB_COMMAND_DURATION,
+    MONGODB_POOL_CHECKOUT_FAILURES,
+    MONGODB_POOL_CHECKOUT_WAIT,
+    MONGODB_POOL_CONNECTIONS,
+    ORDER_FAILURES,
+    ORDERS_PLACED,
+    record_order,
+    record_order_failure,
+    render_metrics,
+)
+from app.metrics.timing import RequestTiming, current_timing, start_request_timing
+from app.metrics.listeners import MetricsCommandListener
@@ -0,0 +1,42 @@
+from pymongo import monitoring
+from app.metrics.registry import MONGODB_COMMAND_DURATION, MONGODB_COMMAND_FAILURES
+from app.metrics.timing import current_timing
+
+
+def _collection(event) -> str:
+    """The collection a command targets, ``"none"`` for database and server commands."""
+    if event.command_name == "getMore":
+        target = event.command.get("collection")
+    else:
+        target = event.command.get(event.command_name)
+    return target if isinstance(target, str) and target else "none"
+
+
+class MetricsCommandListener(monitoring.CommandListener):
+    """Command latency per collection and command, and each request's database time.
+
+    Only the started event carries the command document, so its collection is
+    kept until the command finishes, keyed like the driver's own request ids.
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        self._collections[(event.connection_id, event.request_id)] = _collection(event)
+
+    def _finished(self, event) -> str:
+        collection = self._collections.pop((event.connection_id, event.request_id), "none")
+        seconds = event.duration_micros / 1_000_000
+        MONGODB_COMMAND_DURATION.labels(collection, event.command_name).observe(seconds)
+        timing = current_timing()
+        if timing is not None:
+            timing.add_db_time(seconds)
+        return collection
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        collection = self._finished(event)
+        MONGODB_COMMAND_FAILURES.labels(collection, event.command_name).inc()
@@ -0,0 +1,104 @@
+import os
+from typing import Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from app.utils.histogram import LATENCY_BUCKETS
+
+# Request latency also covers slow exports and image uploads
+REQUEST_BUCKETS = LATENCY_BUCKETS + (5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the end of its response.",
+    ["method", "route"],
+    buckets=REQUEST_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled right now.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+MONGODB_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round trips by collection and command.",
+    ["collection", "command"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGODB_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error, by collection and command.",
+    ["collection", "command"],
+)
+MONGODB_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time operations waited to check a connection out of the pool.",
+    buckets=LATENCY_BUCKETS,
+)
+MONGODB_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total",
+    "Connection check-outs that failed, by reason.",
+    ["reason"],
+)
+MONGODB_POOL_CONNECTIONS = Gauge(
+    "mongodb_pool_connections",
+    "Pooled connections, by state (open or in_use).",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+EVENT_LOOP_BLOCKED_SECONDS = Histogram(
+    "event_loop_blocked_seconds",
+    "Callbacks that held the event loop past the watchdog threshold, by the request they ran for.",
+    ["method", "route"],
+    buckets=REQUEST_BUCKETS,
+)
+
+ORDERS_PLACED = Counter("orders_placed_total", "Orders placed, by store.", ["store"])
+ORDER_ITEMS = Counter("order_items_total", "Pizzas ordered, counting quantities, by store.", ["store"])
+ORDER_VALUE = Counter("order_value_total", "Sum of placed orders' total_amount, by store.", ["store"])
+ORDER_FAILURES = Counter(
+    "order_failures_total",
+    "Order placements that failed: rejected (invalid order) or database_unavailable.",
+    ["reason"],
+)
+
+
+def record_order(order) -> None:
+    """Count a placed order towards the business counters."""
+    ORDERS_PLACED.labels(order.store_id).inc()
+    ORDER_ITEMS.labels(order.store_id).inc(sum(item.quantity for item in order.items))
+    ORDER_VALUE.labels(order.store_id).inc(order.total_amount)
+
+
+def record_order_failure(reason: str) -> None:
+    ORDER_FAILURES.labels(reason).inc()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """The exposition text and its content type.
+
+    Under gunicorn every worker writes its samples to
+    ``PROMETHEUS_MULTIPROC_DIR``; a scrape, served by whichever worker gets
+    it, then aggregates the files of all workers.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
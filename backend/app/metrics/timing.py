@@ -0,0 +1,36 @@
+import threading
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestTiming:
+    """Database time spent on behalf of one request.
+
+    Motor runs each operation on a driver thread in a copy of the caller's
+    context, so the command listener finds the request's ``RequestTiming``
+    there; concurrent operations of one request add to it from several
+    threads at once.
+    """
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.db_commands = 0
+        self._lock = threading.Lock()
+
+    def add_db_time(self, seconds: float) -> None:
+        with self._lock:
+            self.db_seconds += seconds
+            self.db_commands += 1
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def start_request_timing() -> RequestTiming:
+    timing = RequestTiming()
+    _current.set(timing)
+    return timing
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
@@ -0,0 +1,26 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.admission import admission_controller, classify
+
+
+class AdmissionMiddleware:
+    """Shed requests with 503 while the event loop lags, least important first."""
+
+    def __init__(self, app, controller=admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            route_class = classify(scope["method"], scope["path"])
+            scope.setdefault("state", {})["route_class"] = route_class
+            if not self.controller.admit(route_class):
+                response = JSONResponse(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    content={"detail": "Server is busy, please retry shortly"},
+                    headers={"Retry-After": "1"},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
@@ -1,7 +1,12 @@
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from jose import JWTError, jwt
+import hashlib
+import hmac
 import os
+import time
+from app.cache import token_ttl
+from app.auth.revocation import revocation_list
 
 # JWT Configuration
 ALGORITHM = "HS256"
@@ -42,13 +47,16 @@ class JWTAuthMiddleware:
             # Extract and verify token
             token = auth_header.split(" ")[1]
             try:
-                payload = jwt.decode(token, get_secret_key(), algorithms=[ALGORITHM])
+                payload = await self._decode_token(scope, token)
                 user_id = payload.get("sub")
                 if not user_id:
                     raise JWTError("Invalid token payload")
+                if revocation_list.is_revoked(payload):
+                    raise JWTError("Token has been revoked")
                 
                 # Add user_id to request state without overwriting existing State object
                 request.state.user_id = user_id
+                request.state.store_id = payload.get("store_id")
                 
             except JWTError:
                 response = JSONResponse(
@@ -61,13 +69,34 @@ class JWTAuthMiddleware:
         
         await self.app(scope, receive, send)
     
+    async def _decode_token(self, scope, token: str) -> dict:
+        """Verify the token, reusing a cached payload for tokens seen recently."""
+        secret_key = get_secret_key()
+        cache = getattr(scope.get("app"), "cache", None)
+        if cache is None:
+            return jwt.decode(token, secret_key, algorithms=[ALGORITHM])
+        # keyed by an HMAC so a leaked cache never exposes usable tokens
+        digest = hmac.new(secret_key.encode(), token.encode(), hashlib.sha256).hexdigest()
+        key = f"tokens:{digest}"
+        payload = await cache.get(key)
+        if payload is None:
+            payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
+            ttl = token_ttl()
+            if "exp" in payload:
+                ttl = min(ttl, payload["exp"] - time.time())
+            if ttl > 0:
+                await cache.set(key, payload, ttl)
+        return payload
+
     def _is_public_endpoint(self, method: str, path: str) -> bool:
         """Define which endpoints don't require authentication.
         Public routes:
         - GET    /pizzas, /pizzas/{id}
         - GET    /extras, /extras/{id}
+        - GET    /images/{key}    (stored images)
         - POST   /orders          (place order)
         - POST   /users           (register user)
+        - GET    /metrics         (Prometheus scrapes; keep it off the public load balancer)
         - Existing public: /, /health, docs, redoc, openapi, /auth
         """
         # Always public basics
@@ -88,6 +117,10 @@ class JWTAuthMiddleware:
                 return True
             if normalized.startswith("/extras"):
                 return True
+            if normalized.startswith("/images"):
+                return True
+            if normalized == "/metrics":
+                return True
 
         # Public POST endpoint for placing orders
         if method == "POST":
@@ -0,0 +1,39 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.admission import BulkheadFull, BulkheadTimeout, bulkheads, classify
+
+
+class BulkheadMiddleware:
+    """Run each route class inside its own bulkhead.
+
+    A request holds a slot of its class until its response has been sent, so a
+    spike of admin reads or exports can only exhaust their own slots (and the
+    database connections behind them), never those of order placement.
+    """
+
+    def __init__(self, app, bulkheads=bulkheads):
+        self.app = app
+        self.bulkheads = bulkheads
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            route_class = scope.get("state", {}).get("route_class") or classify(scope["method"], scope["path"])
+            bulkhead = self.bulkheads.get(route_class.name)
+            if bulkhead is not None:
+                try:
+                    await bulkhead.acquire()
+                except (BulkheadFull, BulkheadTimeout):
+                    response = JSONResponse(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        content={"detail": "Server is busy, please retry shortly"},
+                        headers={"Retry-After": "1"},
+                    )
+                    await response(scope, receive, send)
+                    return
+                try:
+                    await self.app(scope, receive, send)
+                finally:
+                    bulkhead.release()
+                return
+
+        await self.app(scope, receive, send)
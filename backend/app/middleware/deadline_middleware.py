@@ -0,0 +1,39 @@
+import math
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.admission import classify
+from app.db import deadline, mongo_breaker, request_deadline
+
+# Served without the database (probes, in-memory stats) or from cache when it is down
+BREAKER_EXEMPT_CLASSES = {"probes", "ops_stats", "menu_reads"}
+
+
+class DeadlineMiddleware:
+    """Bound each request's database time and fail fast while the database is down.
+
+    Every request runs under ``request_deadline()``, which caps each MongoDB
+    command it sends via ``maxTimeMS``. While the MongoDB circuit breaker is
+    open, requests that need the database get 503 at once instead of queueing
+    on a primary that is not answering.
+    """
+
+    def __init__(self, app, breaker=mongo_breaker):
+        self.app = app
+        self.breaker = breaker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            route_class = scope.get("state", {}).get("route_class") or classify(scope["method"], scope["path"])
+            if route_class.name not in BREAKER_EXEMPT_CLASSES and not self.breaker.allow():
+                response = JSONResponse(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    content={"detail": "Database temporarily unavailable"},
+                    headers={"Retry-After": str(max(1, math.ceil(self.breaker.retry_after())))},
+                )
+                await response(scope, receive, send)
+                return
+            with deadline(request_deadline()):
+                await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
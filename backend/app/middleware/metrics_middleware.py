@@ -0,0 +1,70 @@
+import time
+from starlette.routing import Match
+from app.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS, start_request_timing
+from app.profiling import loop_watchdog
+
+# Label for paths no route matches, so scanners cannot blow up label cardinality
+UNMATCHED = "unmatched"
+
+
+def route_template(scope) -> str:
+    """The path template of the route that will serve ``scope``, e.g. ``/orders/{order_id}``."""
+    app = scope.get("app")
+    partial = None
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED
+
+
+class MetricsMiddleware:
+    """Request metrics for ``/metrics`` and a ``Server-Timing`` header on every response.
+
+    Requests are labelled by route template, not raw path, and counted with
+    their final status, including those rejected by the middlewares inside
+    this one. ``Server-Timing`` splits the time until the response starts
+    into MongoDB round trips (``db``) and everything else (``app``); ``db``
+    sums concurrent commands, so ``app`` is floored at zero. The request's
+    route is also what the loop watchdog blames for blocking it.
+    """
+
+    def __init__(self, app, watchdog=loop_watchdog):
+        self.app = app
+        self.watchdog = watchdog
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        timing = start_request_timing()
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                db_ms = timing.db_seconds * 1000
+                server_timing = (
+                    f'db;dur={db_ms:.1f};desc="MongoDB ({timing.db_commands} commands)", '
+                    f"app;dur={max(0.0, total_ms - db_ms):.1f}, total;dur={total_ms:.1f}"
+                )
+                message["headers"] = [*message.get("headers", []), (b"server-timing", server_timing.encode())]
+            await send(message)
+
+        in_progress.inc()
+        try:
+            with self.watchdog.request(method, route):
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
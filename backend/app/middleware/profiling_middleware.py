@@ -0,0 +1,38 @@
+from app.profiling import request_profiler
+
+
+class ProfilingMiddleware:
+    """Sample the stack of requests picked by the profiler, one profile per request.
+
+    A profiled response carries ``X-Profile-Id``; the profile is listed under
+    ``GET /admin/profiles`` once the response has finished. Requests that are
+    not picked only pay for the header check.
+    """
+
+    def __init__(self, app, profiler=request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = self.profiler.trigger(scope)
+        profile = self.profiler.start(scope, trigger) if trigger else None
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.finish(status)
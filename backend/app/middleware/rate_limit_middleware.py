@@ -0,0 +1,69 @@
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.ratelimit import RateLimitRule, default_rules
+
+
+class RateLimitMiddleware:
+    """Token-bucket limits for expensive public endpoints.
+
+    Every matching request takes a token from the client IP's bucket and from
+    the route's shared bucket; when either is empty the request is answered
+    with 429 and a ``Retry-After`` header before it reaches the app. Buckets
+    live in ``app.rate_limit_store``; without one, nothing is limited.
+    """
+
+    def __init__(self, app, rules: Optional[List[RateLimitRule]] = None):
+        self.app = app
+        rules = default_rules() if rules is None else rules
+        self.rules: Dict[Tuple[str, str], RateLimitRule] = {
+            (rule.method, rule.path): rule for rule in rules
+        }
+        # Only behind a proxy that appends the peer address to X-Forwarded-For
+        self.trust_forwarded_for = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "false").lower() in ("1", "true", "yes")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            rule = self.rules.get((scope["method"], scope["path"].rstrip("/")))
+            store = getattr(scope.get("app"), "rate_limit_store", None)
+            if rule is not None and store is not None:
+                retry_after = await self._take(store, rule, scope)
+                if retry_after:
+                    response = JSONResponse(
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        content={"detail": "Too many requests"},
+                        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                    )
+                    await response(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
+
+    async def _take(self, store, rule: RateLimitRule, scope) -> float:
+        """Take from the IP bucket, then the route bucket; return the wait if either is empty."""
+        if rule.per_ip is not None:
+            retry_after = await store.take(
+                f"{rule.name}:ip:{self._client_ip(scope)}",
+                rule.per_ip.capacity,
+                rule.per_ip.refill_rate,
+            )
+            if retry_after:
+                return retry_after
+        if rule.per_route is not None:
+            return await store.take(
+                f"{rule.name}:route",
+                rule.per_route.capacity,
+                rule.per_route.refill_rate,
+            )
+        return 0.0
+
+    def _client_ip(self, scope) -> str:
+        if self.trust_forwarded_for:
+            forwarded = [value for name, value in scope.get("headers", []) if name == b"x-forwarded-for"]
+            if forwarded:
+                # the last hop is the one our proxy added; earlier ones are client-supplied
+                return forwarded[-1].decode("latin-1").rsplit(",", 1)[-1].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
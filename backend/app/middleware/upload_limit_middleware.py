@@ -0,0 +1,75 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.storage import max_image_bytes
+
+# Room for the other form fields and the multipart boundaries around the image
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """Reject multipart bodies larger than an image upload may be, while they stream in.
+
+    Form parsing spools the whole body before the endpoint (and the image
+    service's own size check) runs, so the cap has to hold here: a declared
+    ``Content-Length`` over the limit is refused before anything is read,
+    and a chunked body is cut off with 413 as soon as it passes the limit.
+    """
+
+    def __init__(self, app, max_bytes=None):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _limit(self) -> int:
+        return (max_image_bytes() if self.max_bytes is None else self.max_bytes) + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit()
+        too_large = JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"Request body is larger than {limit} bytes"},
+        )
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal started
+            # FastAPI answers a failed form parse with its own 400; ours replaces it
+            if exceeded:
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded and not started:
+            await too_large(scope, receive, send)
@@ -0,0 +1,117 @@
+from copy import copy
+from typing import Any, Dict, List, get_args, get_origin
+from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, create_model
+from pydantic_core import core_schema
+
+
+class PyObjectId(ObjectId):
+    """ObjectId field type: accepts ObjectId or a valid hex string, serializes as a string."""
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler
+    ) -> core_schema.CoreSchema:
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.no_info_plain_validator_function(cls.validate),
+            python_schema=core_schema.union_schema([
+                core_schema.is_instance_schema(ObjectId),
+                core_schema.no_info_plain_validator_function(cls.validate),
+            ]),
+            serialization=core_schema.plain_serializer_function_ser_schema(str),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, _core_schema, handler):
+        return {"type": "string"}
+
+    @classmethod
+    def validate(cls, v):
+        if isinstance(v, ObjectId):
+            return v
+        if isinstance(v, str):
+            if not ObjectId.is_valid(v):
+                raise ValueError("Invalid objectid")
+            return ObjectId(v)
+        raise ValueError("Invalid objectid")
+
+
+_TRUSTED_MODELS: Dict[type, type] = {}
+
+
+def _trusted_of(model: type) -> type:
+    return model._trusted_model()
+
+
+def _class_recipe(cls: type) -> Any:
+    """An importable class, or ``(factory, args)`` rebuilding a class made at runtime."""
+    origin = cls.__dict__.get("__pickle_origin__")
+    if origin is None:
+        return cls
+    factory, args = origin
+    return factory, tuple(_class_recipe(arg) if isinstance(arg, type) else arg for arg in args)
+
+
+def _class_from_recipe(recipe: Any) -> type:
+    if isinstance(recipe, type):
+        return recipe
+    factory, args = recipe
+    return factory(*(_class_from_recipe(arg) if isinstance(arg, (type, tuple)) else arg for arg in args))
+
+
+def _restore_model(recipe: Any, state: Dict[str, Any]):
+    model = _class_from_recipe(recipe)
+    instance = model.__new__(model)
+    instance.__setstate__(state)
+    return instance
+
+
+def _trusted_annotation(annotation: Any) -> Any:
+    """Loosen a field type for trusted reads: keep ids and nested models, accept anything else."""
+    if isinstance(annotation, type) and issubclass(annotation, MongoModel):
+        return annotation._trusted_model()
+    args = get_args(annotation)
+    if get_origin(annotation) in (list, List) and args and isinstance(args[0], type) and issubclass(args[0], MongoModel):
+        return List[args[0]._trusted_model()]
+    if annotation is PyObjectId or PyObjectId in args:
+        return annotation
+    return Any
+
+
+class MongoModel(BaseModel):
+    """Base for models stored in MongoDB.
+
+    ``Model(**data)`` fully validates, and is what API input and data built by
+    the services go through. ``Model.from_mongo(document)`` is for documents
+    read back from our own collections: it validates against a subclass whose
+    plain fields are typed ``Any``, so only ids and nested models are checked.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    @classmethod
+    def _trusted_model(cls):
+        trusted = _TRUSTED_MODELS.get(cls)
+        if trusted is None:
+            definitions = {}
+            for name, field in cls.model_fields.items():
+                annotation = _trusted_annotation(field.annotation)
+                trusted_field = copy(field)
+                trusted_field.annotation = annotation
+                definitions[name] = (annotation, trusted_field)
+            trusted = create_model(cls.__name__, __base__=cls, __module__=cls.__module__, **definitions)
+            trusted.__pickle_origin__ = (_trusted_of, (cls,))
+            _TRUSTED_MODELS[cls] = trusted
+        return trusted
+
+    @classmethod
+    def from_mongo(cls, document: Dict[str, Any]):
+        """Build the model from a trusted database document, skipping field validation."""
+        return cls._trusted_model().model_validate(document)
+
+    def __reduce__(self):
+        # Trusted and ?fields= classes are built at runtime, so pickle (the
+        # Redis cache) cannot import them by name; pickle how to rebuild them
+        if "__pickle_origin__" not in type(self).__dict__:
+            return super().__reduce__()
+        return _restore_model, (_class_recipe(type(self)), self.__getstate__())
@@ -1,27 +1,9 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import Field
 from typing import Optional, List
 from datetime import datetime
-from bson import ObjectId
 from enum import Enum
-from pydantic_core import core_schema
-
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_pydantic_core_schema__(
-        cls, source_type, handler
-    ) -> core_schema.CoreSchema:
-        return core_schema.no_info_plain_validator_function(cls.validate)
-
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid objectid")
-        return ObjectId(v)
-
-    @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema, handler):
-        field_schema.update(type="string")
-        return field_schema
+from app.models.base import MongoModel, PyObjectId
+from app.utils.stores import default_store_id
 
 class OrderStatus(str, Enum):
     PENDING = "pending"
@@ -31,7 +13,7 @@ class OrderStatus(str, Enum):
     DELIVERED = "delivered"
     CANCELLED = "cancelled"
 
-class OrderItem(BaseModel):
+class OrderItem(MongoModel):
     pizza_id: str
     pizza_name: str
     pizza_price: float
@@ -39,14 +21,9 @@ class OrderItem(BaseModel):
     quantity: int = 1
     item_total: float
 
-class Order(BaseModel):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
-    
+class Order(MongoModel):
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    store_id: str = Field(default_factory=default_store_id)
     user_id: str  # Foreign key to User
     customer_name: str
     customer_email: str
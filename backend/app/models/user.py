@@ -1,39 +1,9 @@
-from pydantic import BaseModel, Field
-from pydantic_core import core_schema
-from typing import Optional, Any
+from pydantic import Field
+from typing import Optional
 from datetime import datetime
-from bson import ObjectId
+from app.models.base import MongoModel, PyObjectId
 
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_pydantic_core_schema__(
-        cls, source_type: Any, handler
-    ) -> core_schema.CoreSchema:
-        return core_schema.json_or_python_schema(
-            json_schema=core_schema.str_schema(),
-            python_schema=core_schema.union_schema([
-                core_schema.is_instance_schema(ObjectId),
-                core_schema.chain_schema([
-                    core_schema.str_schema(),
-                    core_schema.no_info_plain_validator_function(cls.validate),
-                ])
-            ]),
-            serialization=core_schema.plain_serializer_function_ser_schema(
-                lambda x: str(x)
-            ),
-        )
-
-    @classmethod
-    def validate(cls, v):
-        if isinstance(v, ObjectId):
-            return v
-        if isinstance(v, str):
-            if not ObjectId.is_valid(v):
-                raise ValueError("Invalid objectid")
-            return ObjectId(v)
-        raise ValueError("Invalid objectid")
-
-class User(BaseModel):
+class User(MongoModel):
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     name: str
     email: str
@@ -41,8 +11,7 @@ class User(BaseModel):
     address: Optional[str] = None
     password_hash: Optional[str] = Field(default=None, exclude=True)
     password_salt: Optional[str] = Field(default=None, exclude=True)
+    active: bool = Field(default=True, exclude=True)
+    # Staff store, set by operators; tokens issued to the user are scoped to it
+    store_id: Optional[str] = Field(default=None, exclude=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
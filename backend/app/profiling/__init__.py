@@ -0,0 +1,14 @@
+import os
+from app.profiling.sampler import AWAITING, OTHER_TASKS, StackSampler
+from app.profiling.store import PROFILE_ID_PATTERN, ProfileStore
+from app.profiling.profiler import PROFILE_HEADER, RequestProfile, RequestProfiler
+from app.profiling.watchdog import LoopWatchdog
+
+request_profiler = RequestProfiler(
+    ProfileStore(os.getenv("PROFILE_DIR", "profiles"), int(os.getenv("PROFILE_MAX_FILES", "100"))),
+    token=os.getenv("PROFILE_TOKEN") or None,
+    sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+    interval=float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000,
+    max_concurrent=int(os.getenv("PROFILE_MAX_CONCURRENT", "2")),
+)
+loop_watchdog = LoopWatchdog(threshold=float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "0")) / 1000)
@@ -0,0 +1,121 @@
+import asyncio
+import hmac
+import logging
+import random
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from app.profiling.sampler import StackSampler
+from app.profiling.store import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILES_PATH = "/admin/profiles"
+
+
+class RequestProfile:
+    """One request being profiled; ``finish`` stops sampling and saves it."""
+
+    def __init__(self, profiler: "RequestProfiler", scope, trigger: str):
+        now = datetime.now(timezone.utc)
+        self.id = f"{now:%Y%m%dT%H%M%S}-{secrets.token_hex(6)}"
+        self.details: Dict[str, Any] = {
+            "id": self.id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "trigger": trigger,
+            "started_at": now.isoformat(),
+            "interval_ms": profiler.interval * 1000,
+        }
+        self._profiler = profiler
+        self._start = time.perf_counter()
+        self.sampler = StackSampler(asyncio.current_task(), profiler.interval, on_finish=self._save)
+        self.sampler.start()
+
+    def finish(self, status: int) -> None:
+        self.details["status"] = status
+        self.details["duration_ms"] = round((time.perf_counter() - self._start) * 1000, 3)
+        self.sampler.stop()
+
+    def _save(self, sampler: StackSampler) -> None:
+        self.details["samples"] = sampler.samples
+        try:
+            self._profiler.store.save(self.id, sampler.folded(), self.details)
+        except OSError:
+            logger.exception("Saving request profile %s failed", self.id)
+        finally:
+            self._profiler.released()
+
+
+class RequestProfiler:
+    """Decides which requests are profiled and keeps their profiles.
+
+    A request is profiled when it sends ``X-Profile: <PROFILE_TOKEN>`` (the
+    token is an operator secret, so only admins can ask for a profile) or is
+    picked at random with probability ``sample_rate``. At most
+    ``max_concurrent`` requests per worker are profiled at once; others run
+    unprofiled.
+    """
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        interval: float = 0.001,
+        max_concurrent: int = 2,
+    ):
+        self.store = store
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self._active = 0
+        self._lock = threading.Lock()
+        self._counters = {"profiled": 0, "skipped_busy": 0}
+
+    def authorized(self, scope) -> bool:
+        """Whether the request sends ``X-Profile: <PROFILE_TOKEN>``; always ``False`` without a token."""
+        if not self.token:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token.encode())
+        return False
+
+    def trigger(self, scope) -> Optional[str]:
+        """Why this request should be profiled (``"header"`` or ``"sampled"``), or ``None``."""
+        if scope["path"].startswith(PROFILES_PATH):
+            # Reading profiles (which needs the token) should not add profiles of its own
+            return None
+        if self.authorized(scope):
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def start(self, scope, trigger: str) -> Optional[RequestProfile]:
+        with self._lock:
+            if self._active >= self.max_concurrent:
+                self._counters["skipped_busy"] += 1
+                return None
+            self._active += 1
+            self._counters["profiled"] += 1
+        return RequestProfile(self, scope, trigger)
+
+    def released(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters, active=self._active)
+        return {
+            **counters,
+            "header_enabled": bool(self.token),
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000,
+        }
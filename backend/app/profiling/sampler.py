@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Callable, Optional
+
+try:
+    from asyncio.tasks import _current_tasks
+except ImportError:  # pragma: no cover - interpreters without the shared task registry
+    _current_tasks = None
+
+# Pseudo-frames for samples taken while the request's task was not running
+AWAITING = "(awaiting I/O)"
+OTHER_TASKS = "(other tasks)"
+
+
+def _prefixes():
+    # "" on sys.path is the working directory
+    return sorted({os.path.abspath(path or os.curdir) + os.sep for path in sys.path}, key=len, reverse=True)
+
+
+class StackSampler(threading.Thread):
+    """Samples the event-loop thread's stack while one request's task runs.
+
+    Every ``interval`` seconds the thread looks at the loop's current task:
+    when it is the profiled request's, the loop thread's Python stack is
+    counted; otherwise the sample goes to ``AWAITING`` (nothing running, i.e.
+    waiting for MongoDB or the client) or ``OTHER_TASKS`` (other requests),
+    so the profile still adds up to the request's wall time. Where the task
+    registry is not available every loop sample is counted as the request's.
+    Create it on the event-loop thread, from within the request's task.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float, on_finish: Optional[Callable[["StackSampler"], None]] = None):
+        super().__init__(name="request-profiler", daemon=True)
+        self.task = task
+        self.loop = task.get_loop()
+        self.loop_thread = threading.get_ident()
+        self.interval = interval
+        self.on_finish = on_finish
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._prefixes = _prefixes()
+        self._labels = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in self._prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix):]
+                    break
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def _sample(self) -> None:
+        current = _current_tasks.get(self.loop) if _current_tasks is not None else self.task
+        if current is None:
+            stack = AWAITING
+        elif current is not self.task:
+            stack = OTHER_TASKS
+        else:
+            frame = sys._current_frames().get(self.loop_thread)
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack = ";".join(reversed(labels))
+        self.stacks[stack] += 1
+        self.samples += 1
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+        # e.g. writing the profile, which stays off the event loop this way
+        if self.on_finish is not None:
+            self.on_finish(self)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def folded(self) -> str:
+        """The profile in folded-stack format (``root;...;leaf count`` per line).
+
+        ``flamegraph.pl``, inferno and speedscope read it as is.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
@@ -0,0 +1,67 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{12}$")
+
+
+class ProfileStore:
+    """Request profiles on disk: ``<id>.folded`` stacks and ``<id>.json`` details.
+
+    Every worker writes to the same directory, so the admin list shows the
+    profiles of all of them. Only the newest ``max_files`` are kept.
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, profile_id: str, folded: str, details: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for extension, content in (("folded", folded), ("json", json.dumps(details))):
+            temporary = self._path(profile_id, f"{extension}.tmp")
+            with open(temporary, "w") as f:
+                f.write(content)
+            os.replace(temporary, self._path(profile_id, extension))
+        self.prune()
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        # ids start with their UTC timestamp, so they sort by age
+        return sorted((name[:-len(".json")] for name in names if name.endswith(".json")), reverse=True)
+
+    def prune(self) -> None:
+        with self._lock:
+            for profile_id in self._ids()[self.max_files:]:
+                for extension in ("json", "folded"):
+                    try:
+                        os.remove(self._path(profile_id, extension))
+                    except FileNotFoundError:
+                        pass
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Details of the newest profiles, newest first."""
+        profiles = []
+        for profile_id in self._ids()[:limit]:
+            try:
+                with open(self._path(profile_id, "json")) as f:
+                    profiles.append(json.load(f))
+            except (FileNotFoundError, ValueError):
+                continue
+        return profiles
+
+    def folded_path(self, profile_id: str) -> Optional[str]:
+        """Path of a profile's folded stacks, or ``None`` for unknown or malformed ids."""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self._path(profile_id, "folded")
+        return path if os.path.exists(path) else None
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from app.metrics import EVENT_LOOP_BLOCKED_SECONDS
+from app.profiling.sampler import _current_tasks
+
+logger = logging.getLogger(__name__)
+
+NO_REQUEST = ("", "none")
+
+
+class LoopWatchdog:
+    """Report callbacks that hold the event loop for longer than ``threshold`` seconds.
+
+    A heartbeat task stamps the time every ``interval``. A watchdog thread
+    checks the stamp; once it is more than ``threshold`` late, the loop is
+    still blocked, so the thread captures the loop thread's stack and the
+    request whose task is running. When the heartbeat runs again it knows how
+    long the loop was held and reports the block: a warning with the stack,
+    ``event_loop_blocked_seconds`` by route, and ``recent``. Code that blocks
+    while holding the GIL (a long C call) can only be caught after it
+    returns, so its stack is not captured.
+    """
+
+    def __init__(self, threshold: float, interval: Optional[float] = None, keep: int = 20):
+        self.threshold = threshold
+        self._interval = interval
+        self.interval = interval
+        self.blocks = 0
+        self.recent = deque(maxlen=keep)
+        self._requests: Dict[asyncio.Task, Tuple[str, str]] = {}
+        self._pending: Optional[Dict[str, Any]] = None
+        self._stopped_seen = 0.0
+        self._lock = threading.Lock()
+        self._beat = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    @contextmanager
+    def request(self, method: str, route: str) -> Iterator[None]:
+        """Attribute blocks while the current task runs to this request."""
+        task = asyncio.current_task()
+        self._requests[task] = (method, route)
+        try:
+            yield
+        finally:
+            self._requests.pop(task, None)
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        # Five beats per threshold, so the stack is captured soon after a block passes it
+        self.interval = self._interval if self._interval is not None else min(0.1, max(0.005, self.threshold / 5))
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def reset(self) -> None:
+        self.blocks = 0
+        self.recent.clear()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._beat = now
+            # Time the loop spent stopped (between run_until_complete calls, as
+            # under pytest-asyncio) is not time it was blocked
+            late = now - max(expected, self._stopped_seen)
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if late >= self.threshold:
+                self._report(late, pending)
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            if not self._loop.is_running():
+                self._stopped_seen = now
+                continue
+            if now - max(self._beat, self._stopped_seen) <= self.interval + self.threshold:
+                continue
+            with self._lock:
+                if self._pending is not None:
+                    continue
+            frame = sys._current_frames().get(self._loop_thread)
+            task = _current_tasks.get(self._loop) if _current_tasks is not None else None
+            pending = {
+                "request": self._requests.get(task, NO_REQUEST),
+                "stack": "".join(traceback.format_stack(frame)) if frame is not None else None,
+            }
+            with self._lock:
+                self._pending = pending
+
+    def _report(self, duration: float, pending: Optional[Dict[str, Any]]) -> None:
+        method, route = pending["request"] if pending else NO_REQUEST
+        stack = pending["stack"] if pending else None
+        self.blocks += 1
+        self.recent.append({
+            "method": method,
+            "route": route,
+            "duration_ms": round(duration * 1000, 3),
+            "at": time.time(),
+            "stack": stack,
+        })
+        EVENT_LOOP_BLOCKED_SECONDS.labels(method, route).observe(duration)
+        logger.warning(
+            "Event loop blocked for %.0fms (threshold %.0fms) during %s %s\n%s",
+            duration * 1000,
+            self.threshold * 1000,
+            method or "-",
+            route,
+            stack or "stack not captured: the loop held the GIL throughout\n",
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": round(self.threshold * 1000, 3),
+            "blocks": self.blocks,
+            "recent": list(self.recent),
+        }
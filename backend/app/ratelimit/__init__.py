@@ -0,0 +1,71 @@
+import os
+from typing import List, NamedTuple, Optional, Tuple
+from app.ratelimit.base import BucketStore
+from app.ratelimit.memory import MemoryBucketStore
+
+
+class Limit(NamedTuple):
+    """``capacity`` requests in a burst, refilled at ``capacity`` per ``period`` seconds."""
+
+    capacity: float
+    period: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+class RateLimitRule(NamedTuple):
+    name: str
+    method: str
+    path: str
+    per_ip: Optional[Limit]
+    per_route: Optional[Limit]
+
+
+def parse_limit(value: str) -> Optional[Limit]:
+    """Parse ``"<requests>/<seconds>"``; ``"0"`` or an empty value disables the limit."""
+    value = value.strip()
+    if not value or value == "0":
+        return None
+    requests, _, seconds = value.partition("/")
+    return Limit(float(requests), float(seconds or 1))
+
+
+def _limit(env: str, default: str) -> Optional[Limit]:
+    return parse_limit(os.getenv(env, default))
+
+
+# (name, method, path, per-IP default, per-route default)
+_DEFAULT_RULES: List[Tuple[str, str, str, str, str]] = [
+    # password hashing on every attempt
+    ("auth", "POST", "/auth", "10/60", "50/1"),
+    ("users", "POST", "/users", "5/60", "20/1"),
+    # multi-query transaction per order
+    ("orders", "POST", "/orders", "20/60", "50/1"),
+]
+
+
+def default_rules() -> List[RateLimitRule]:
+    """Rules for the expensive public endpoints.
+
+    Each limit is read from ``RATE_LIMIT_<NAME>_PER_IP`` and
+    ``RATE_LIMIT_<NAME>_PER_ROUTE`` (e.g. ``RATE_LIMIT_AUTH_PER_IP=10/60``).
+    """
+    return [
+        RateLimitRule(
+            name,
+            method,
+            path,
+            _limit(f"RATE_LIMIT_{name.upper()}_PER_IP", per_ip),
+            _limit(f"RATE_LIMIT_{name.upper()}_PER_ROUTE", per_route),
+        )
+        for name, method, path, per_ip, per_route in _DEFAULT_RULES
+    ]
+
+
+def create_bucket_store() -> Optional[BucketStore]:
+    """Build the bucket store, or ``None`` when ``RATE_LIMIT_ENABLED`` is off."""
+    if os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return MemoryBucketStore(int(os.getenv("RATE_LIMIT_MAX_KEYS", "200000")))
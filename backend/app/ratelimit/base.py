@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class BucketStore(ABC):
+    """Token buckets keyed by ``"<rule>:<scope>"`` strings.
+
+    ``take`` is the only hot-path call, so a shared store (e.g. Redis running
+    the same arithmetic in a script) can replace the in-process one without
+    touching the middleware.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens from the bucket.
+
+        Returns 0 when the tokens were taken, otherwise the seconds until the
+        bucket holds enough of them (nothing is taken in that case).
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,55 @@
+import time
+from typing import Any, Callable, Dict
+from app.ratelimit.base import BucketStore
+
+
+class MemoryBucketStore(BucketStore):
+    """In-process token buckets, bounded to ``max_keys`` least recently used keys.
+
+    A bucket is stored as the single float at which it will be full again,
+    which is all the state a token bucket needs: the tokens it holds are
+    ``capacity - (full_at - now) * refill_rate``. A bucket past that moment is
+    indistinguishable from a missing one, so evicting the least recently used
+    keys (nearly always long refilled) does not change any decision.
+    """
+
+    def __init__(self, max_keys: int = 200_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        # dicts keep insertion order; re-inserting a key moves it to the end
+        self._full_at: Dict[str, float] = {}
+        self._allowed = 0
+        self._limited = 0
+        self._evictions = 0
+
+    async def take(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> float:
+        now = self._clock()
+        full_at = self._full_at.pop(key, now)
+        if full_at < now:
+            full_at = now
+        # time it takes to refill what is missing, after taking ``cost`` tokens
+        debt = full_at - now + cost / refill_rate
+        limit = capacity / refill_rate
+        if debt > limit:
+            self._full_at[key] = full_at
+            self._limited += 1
+            return debt - limit
+        self._full_at[key] = now + debt
+        self._allowed += 1
+        if len(self._full_at) > self.max_keys:
+            del self._full_at[next(iter(self._full_at))]
+            self._evictions += 1
+        return 0.0
+
+    def clear(self) -> None:
+        self._full_at.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "keys": len(self._full_at),
+            "max_keys": self.max_keys,
+            "allowed": self._allowed,
+            "limited": self._limited,
+            "evictions": self._evictions,
+        }
@@ -0,0 +1,175 @@
+"""Production entry point: ``python -m app.server``.
+
+Runs the API under gunicorn with uvicorn workers: one worker per CPU the
+container may use, app code imported once before forking, workers recycled
+after ``MAX_REQUESTS`` requests and drained gracefully on SIGTERM. Falls back
+to a single uvicorn process where gunicorn is not installed; that process is
+never recycled, since nothing would start it again.
+
+Under gunicorn, ``/metrics`` aggregates every worker through files in
+``PROMETHEUS_MULTIPROC_DIR`` (a fresh temporary directory unless set).
+"""
+import glob
+import math
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+try:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker as _UvicornWorker
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    GUNICORN_AVAILABLE = False
+
+APP = "app.main:app"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_quota() -> Optional[float]:
+    """CPUs allowed by the cgroup CPU quota (v2 or v1), or ``None`` when unlimited."""
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """``WEB_CONCURRENCY`` if set, else one async worker per usable CPU."""
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return available_cpus()
+
+
+def graceful_timeout() -> int:
+    return int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+
+def prepare_metrics_dir() -> str:
+    """Point ``PROMETHEUS_MULTIPROC_DIR`` at an empty directory before the app is imported.
+
+    Must run before ``prometheus_client`` is first imported, since that
+    decides whether metrics are kept in per-process files; stale files from
+    an earlier run would otherwise be added to this one's counters.
+    """
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="usersnack-metrics-")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+def child_exit(server, worker) -> None:
+    """Drop an exited worker's live gauges (in-flight requests, open connections)."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    return {
+        "bind": f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}",
+        "workers": worker_count(),
+        "worker_class": "app.server.UvicornWorker",
+        "preload_app": True,
+        "max_requests": int(os.getenv("MAX_REQUESTS", "10000")),
+        "max_requests_jitter": int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+        "graceful_timeout": graceful_timeout(),
+        "timeout": int(os.getenv("WORKER_TIMEOUT", "60")),
+        "keepalive": int(os.getenv("KEEPALIVE", "5")),
+        "forwarded_allow_ips": os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        "accesslog": "-" if os.getenv("ACCESS_LOG", "false").lower() in ("1", "true", "yes") else None,
+        "errorlog": "-",
+        "child_exit": child_exit,
+    }
+
+
+if GUNICORN_AVAILABLE:
+    class UvicornWorker(_UvicornWorker):
+        """Uvicorn worker using uvloop and httptools when installed.
+
+        On SIGTERM it stops accepting connections and gives in-flight requests
+        up to ``GRACEFUL_TIMEOUT`` seconds (less a margin for the lifespan
+        shutdown) before gunicorn kills it.
+        """
+
+        CONFIG_KWARGS = {
+            "loop": "uvloop" if UVLOOP_AVAILABLE else "asyncio",
+            "http": "httptools" if HTTPTOOLS_AVAILABLE else "h11",
+            "lifespan": "on",
+            "timeout_graceful_shutdown": max(1, graceful_timeout() - 5),
+        }
+
+    class Server(BaseApplication):
+        """Gunicorn application configured from a dict instead of a config file."""
+
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+
+def main() -> None:
+    if GUNICORN_AVAILABLE:
+        prepare_metrics_dir()
+        Server(gunicorn_options()).run()
+        return
+    import uvicorn
+    uvicorn.run(
+        APP,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        timeout_graceful_shutdown=max(1, graceful_timeout() - 5),
+    )
+
+
+if __name__ == "__main__":
+    main()
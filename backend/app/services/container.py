@@ -0,0 +1,24 @@
+from app.services.extras_service import ExtrasService
+from app.services.order_service import OrderService
+from app.services.pizza_service import PizzaService
+from app.services.token_service import TokenService
+from app.services.user_service import UserService
+
+
+class ServiceContainer:
+    """The services every request shares, built once per app lifespan.
+
+    Services only hold references to the client, database and cache, so one
+    instance of each serves all requests. Controllers get them through their
+    ``get_*_service`` dependencies from ``request.app.container``.
+    """
+
+    def __init__(self, client, database, cache=None):
+        self.client = client
+        self.database = database
+        self.cache = cache
+        self.pizzas = PizzaService(database, cache)
+        self.extras = ExtrasService(database, cache)
+        self.orders = OrderService(database, client)
+        self.users = UserService(database, client)
+        self.tokens = TokenService(database)
@@ -1,14 +1,23 @@
 from typing import List, Optional
 from bson import ObjectId
 from app.models.extra import Extra
+from app.utils.fields import SparseFields
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
+from app.utils.single_flight import single_flight
+from app.cache.decorators import cached
 
 class ExtrasService:
-    def __init__(self, database):
+    def __init__(self, database, cache=None):
         self.database = database
+        self.cache = cache
+
+    async def _invalidate_cache(self) -> None:
+        if self.cache is not None:
+            await self.cache.invalidate("extras")
     
     async def create_extra(self, extra_data: dict) -> Extra:
-        existing = await self.get_extra_by_name(extra_data.get("name"))
+        existing = await self.get_extra_by_name(extra_data["store_id"], extra_data.get("name"))
         if existing:
             raise ValueError("Extra with this name already exists")
 
@@ -18,36 +27,50 @@ class ExtrasService:
         except DuplicateKeyError:
             raise ValueError("Extra with this name already exists")
         extra_data["_id"] = result.inserted_id
+        await self._invalidate_cache()
         return Extra(**extra_data)
     
-    async def get_all_extras(self, skip: int = 0, limit: int = 10) -> tuple[List[Extra], int]:
-        total = await self.database.extras.count_documents({"available": True})
+    @single_flight
+    @cached("extras")
+    async def get_all_extras(self, store_id: str, skip: int = 0, limit: int = 10, fields: Optional[SparseFields] = None) -> tuple[List[Extra], int]:
+        total = await self.database.extras.count_documents({"store_id": store_id, "available": True})
+        model = fields.model if fields else Extra
+        projection = fields.projection if fields else None
         extras = []
-        async for extra_data in self.database.extras.find({"available": True}).skip(skip).limit(limit):
-            extras.append(Extra(**extra_data))
+        async for extra_data in self.database.extras.find({"store_id": store_id, "available": True}, projection).skip(skip).limit(limit):
+            extras.append(model.from_mongo(extra_data))
         return extras, total
     
-    async def get_extra_by_id(self, extra_id: str) -> Optional[Extra]:
-        extra_data = await self.database.extras.find_one({"_id": ObjectId(extra_id)})
+    @single_flight
+    @cached("extras")
+    async def get_extra_by_id(self, store_id: str, extra_id: str, fields: Optional[SparseFields] = None) -> Optional[Extra]:
+        model = fields.model if fields else Extra
+        projection = fields.projection if fields else None
+        extra_data = await self.database.extras.find_one({"_id": ObjectId(extra_id), "store_id": store_id}, projection)
         if extra_data:
-            return Extra(**extra_data)
+            return model.from_mongo(extra_data)
         return None
 
-    async def get_extra_by_name(self, name: str) -> Optional[Extra]:
-        extra_data = await self.database.extras.find_one({"name": name, "available": True})
+    async def get_extra_by_name(self, store_id: str, name: str) -> Optional[Extra]:
+        extra_data = await self.database.extras.find_one({"store_id": store_id, "name": name, "available": True})
         if extra_data:
-            return Extra(**extra_data)
+            return Extra.from_mongo(extra_data)
         return None
     
-    async def update_extra(self, extra_id: str, update_data: dict) -> Optional[Extra]:
-        await self.database.extras.update_one(
-            {"_id": ObjectId(extra_id)}, 
-            {"$set": update_data}
+    async def update_extra(self, store_id: str, extra_id: str, update_data: dict) -> Optional[Extra]:
+        extra_data = await self.database.extras.find_one_and_update(
+            {"_id": ObjectId(extra_id), "store_id": store_id}, 
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
         )
-        return await self.get_extra_by_id(extra_id)
+        await self._invalidate_cache()
+        if extra_data:
+            return Extra.from_mongo(extra_data)
+        return None
     
-    async def delete_extra(self, extra_id: str) -> None:
+    async def delete_extra(self, store_id: str, extra_id: str) -> None:
         await self.database.extras.update_one(
-            {"_id": ObjectId(extra_id)}, 
+            {"_id": ObjectId(extra_id), "store_id": store_id}, 
             {"$set": {"available": False}}
         )
+        await self._invalidate_cache()
@@ -7,6 +7,10 @@ from app.models.user import User
 from app.models.pizza import Pizza
 from app.models.extra import Extra
 from app.services.user_service import UserService
+from app.utils.fields import SparseFields
+from app.utils.single_flight import single_flight
+from app.db.policies import policy_collection, policy_for
+from pymongo import ReturnDocument
 
 class OrderService:
     def __init__(self, database, client=None):
@@ -16,7 +20,7 @@ class OrderService:
     async def create_order(self, order_data: dict) -> Order:
         try:
             async with await self.client.start_session() as session:
-                async with session.start_transaction():
+                async with session.start_transaction(**policy_for("orders.create").transaction_options()):
                     return await self._create_order_using_transaction(order_data, session)
         except Exception as e:
             if "Transaction numbers are only allowed" in str(e) or "IllegalOperation" in str(e):
@@ -27,15 +31,18 @@ class OrderService:
     async def _create_order_using_transaction(self, order_data: dict, session=None) -> Order:
         user_service = UserService(self.database, self.client)
         user_id, customer_email = await user_service.get_or_create_user(order_data, session)
+        store_id = order_data["store_id"]
+        pizzas, extras = await self._load_menu_items(store_id, order_data["items"], session)
         processed_items = []
         total_amount = Decimal("0.00")
 
         for item_data in order_data["items"]:
-            order_item, item_total = await self._process_order_item(item_data, session)
+            order_item, item_total = self._process_order_item(item_data, pizzas, extras)
             processed_items.append(order_item.model_dump())
             total_amount += item_total
 
         order_dict = {
+            "store_id": store_id,
             "user_id": user_id,
             "customer_name": order_data["customer_name"],
             "customer_email": customer_email,
@@ -47,12 +54,44 @@ class OrderService:
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
-        result = await self.database.orders.insert_one(order_dict, session=session)
+        result = await policy_collection(self.database, "orders", "orders.create").insert_one(order_dict, session=session)
         order_dict["_id"] = result.inserted_id
         return Order(**order_dict)
-    
-    async def _process_order_item(self, item_data: dict, session=None) -> tuple[OrderItem, Decimal]:
-        pizza = await self.database.pizzas.find_one({"_id": ObjectId(item_data["pizza_id"])}, session=session)
+
+    @staticmethod
+    def _extra_reference(extra_data) -> tuple[str, int]:
+        if isinstance(extra_data, str):
+            return extra_data, 1
+        return extra_data.get("extra_id"), extra_data.get("quantity", 1)
+
+    async def _load_menu_items(self, store_id: str, items: list, session=None) -> tuple[dict, dict]:
+        """Every pizza and extra the order refers to, by id, in one query per collection."""
+        pizza_ids = {ObjectId(item["pizza_id"]) for item in items}
+        extra_ids = {
+            ObjectId(self._extra_reference(extra_data)[0])
+            for item in items
+            for extra_data in item.get("extras", [])
+        }
+        pizzas_collection = policy_collection(self.database, "pizzas", "orders.create")
+        pizzas = {
+            str(pizza["_id"]): pizza
+            async for pizza in pizzas_collection.find(
+                {"_id": {"$in": list(pizza_ids)}, "store_id": store_id}, session=session
+            )
+        }
+        extras = {}
+        if extra_ids:
+            extras_collection = policy_collection(self.database, "extras", "orders.create")
+            extras = {
+                str(extra["_id"]): extra
+                async for extra in extras_collection.find(
+                    {"_id": {"$in": list(extra_ids)}, "store_id": store_id}, session=session
+                )
+            }
+        return pizzas, extras
+
+    def _process_order_item(self, item_data: dict, pizzas: dict, extras: dict) -> tuple[OrderItem, Decimal]:
+        pizza = pizzas.get(str(ObjectId(item_data["pizza_id"])))
         if not pizza:
             raise ValueError(f"Pizza with id {item_data['pizza_id']} not found")
         
@@ -60,7 +99,7 @@ class OrderService:
         pizza_price = Decimal(str(pizza["price"]))
         item_total = pizza_price * Decimal(quantity)
         
-        extras, extras_cost = await self._process_extras(item_data.get("extras", []), quantity, session)
+        item_extras, extras_cost = self._process_extras(item_data.get("extras", []), quantity, extras)
         item_total += extras_cost
         item_total = item_total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
         
@@ -68,27 +107,21 @@ class OrderService:
             pizza_id=item_data["pizza_id"],
             pizza_name=pizza["name"],
             pizza_price=float(pizza_price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)),
-            extras=extras,
+            extras=item_extras,
             quantity=quantity,
             item_total=float(item_total)
         )
         
         return order_item, item_total
     
-    async def _process_extras(self, extras_data: list, quantity: int, session=None) -> tuple[list, Decimal]:
-        extras = []
+    def _process_extras(self, extras_data: list, quantity: int, extras: dict) -> tuple[list, Decimal]:
+        item_extras = []
         extras_cost = Decimal("0.00")
         for extra_data in extras_data:
-            if isinstance(extra_data, str):
-                extra_id = extra_data
-                extra_quantity = 1
-            else:
-                extra_id = extra_data.get("extra_id")
-                extra_quantity = extra_data.get("quantity", 1)
-            
-            extra = await self.database.extras.find_one({"_id": ObjectId(extra_id)}, session=session)
+            extra_id, extra_quantity = self._extra_reference(extra_data)
+            extra = extras.get(str(ObjectId(extra_id)))
             if extra:
-                extras.append({
+                item_extras.append({
                     "id": str(extra["_id"]),
                     "name": extra["name"],
                     "price": extra["price"]
@@ -96,32 +129,43 @@ class OrderService:
                 price = Decimal(str(extra["price"]))
                 extras_cost += price * Decimal(extra_quantity) * Decimal(quantity)
         extras_cost = extras_cost.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        return extras, extras_cost
+        return item_extras, extras_cost
     
-    async def get_all_orders(self, skip: int = 0, limit: int = 10) -> tuple[List[Order], int]:
-        total = await self.database.orders.count_documents({})
+    @single_flight
+    async def get_all_orders(self, store_id: str, skip: int = 0, limit: int = 10, fields: Optional[SparseFields] = None) -> tuple[List[Order], int]:
+        orders_collection = policy_collection(self.database, "orders", "orders.list")
+        total = await orders_collection.count_documents({"store_id": store_id})
+        model = fields.model if fields else Order
+        projection = fields.projection if fields else None
         orders = []
-        async for order_data in self.database.orders.find().sort("created_at", -1).skip(skip).limit(limit):
-            orders.append(Order(**order_data))
+        async for order_data in orders_collection.find({"store_id": store_id}, projection).sort("created_at", -1).skip(skip).limit(limit):
+            orders.append(model.from_mongo(order_data))
         return orders, total
     
-    async def get_order_by_id(self, order_id: str) -> Optional[Order]:
-        order_data = await self.database.orders.find_one({"_id": ObjectId(order_id)})
+    @single_flight
+    async def get_order_by_id(self, store_id: str, order_id: str, fields: Optional[SparseFields] = None) -> Optional[Order]:
+        model = fields.model if fields else Order
+        projection = fields.projection if fields else None
+        order_data = await self.database.orders.find_one({"_id": ObjectId(order_id), "store_id": store_id}, projection)
         if order_data:
-            return Order(**order_data)
+            return model.from_mongo(order_data)
         return None
     
-    async def get_orders_by_user(self, user_id: str) -> List[Order]:
+    @single_flight
+    async def get_orders_by_user(self, store_id: str, user_id: str, fields: Optional[SparseFields] = None) -> List[Order]:
+        model = fields.model if fields else Order
+        projection = fields.projection if fields else None
         orders = []
-        async for order_data in self.database.orders.find({"user_id": user_id}).sort("created_at", -1):
-            orders.append(Order(**order_data))
+        async for order_data in self.database.orders.find({"store_id": store_id, "user_id": user_id}, projection).sort("created_at", -1):
+            orders.append(model.from_mongo(order_data))
         return orders
     
-    async def update_order_status(self, order_id: str, status: str) -> Optional[Order]:
-        result = await self.database.orders.update_one(
-            {"_id": ObjectId(order_id)}, 
-            {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+    async def update_order_status(self, store_id: str, order_id: str, status: str) -> Optional[Order]:
+        order_data = await policy_collection(self.database, "orders", "orders.update_status").find_one_and_update(
+            {"_id": ObjectId(order_id), "store_id": store_id}, 
+            {"$set": {"status": status, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
         )
-        if result.modified_count == 0:
-            return None
-        return await self.get_order_by_id(order_id)
+        if order_data:
+            return Order.from_mongo(order_data)
+        return None
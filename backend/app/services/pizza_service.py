@@ -1,14 +1,23 @@
 from typing import List, Optional
 from bson import ObjectId
 from app.models.pizza import Pizza
+from app.utils.fields import SparseFields
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
+from app.utils.single_flight import single_flight
+from app.cache.decorators import cached
 
 class PizzaService:
-    def __init__(self, database):
+    def __init__(self, database, cache=None):
         self.database = database
+        self.cache = cache
+
+    async def _invalidate_cache(self) -> None:
+        if self.cache is not None:
+            await self.cache.invalidate("pizzas")
     
     async def create_pizza(self, pizza_data: dict) -> Pizza:
-        existing = await self.get_pizza_by_name(pizza_data.get("name"))
+        existing = await self.get_pizza_by_name(pizza_data["store_id"], pizza_data.get("name"))
         if existing:
             raise ValueError("Pizza with this name already exists")
         pizza_data["available"] = pizza_data.get("available", True)
@@ -17,38 +26,63 @@ class PizzaService:
         except DuplicateKeyError:
             raise ValueError("Pizza with this name already exists")
         pizza_data["_id"] = result.inserted_id
+        await self._invalidate_cache()
         return Pizza(**pizza_data)
     
-    async def get_all_pizzas(self, skip: int = 0, limit: int = 10) -> tuple[List[Pizza], int]:
-        total = await self.database.pizzas.count_documents({"available": True})
+    @single_flight
+    @cached("pizzas")
+    async def get_all_pizzas(self, store_id: str, skip: int = 0, limit: int = 10, fields: Optional[SparseFields] = None) -> tuple[List[Pizza], int]:
+        total = await self.database.pizzas.count_documents({"store_id": store_id, "available": True})
+        model = fields.model if fields else Pizza
+        projection = fields.projection if fields else None
         
         pizzas = []
-        async for pizza_data in self.database.pizzas.find({"available": True}).skip(skip).limit(limit):
-            pizzas.append(Pizza(**pizza_data))
+        async for pizza_data in self.database.pizzas.find({"store_id": store_id, "available": True}, projection).skip(skip).limit(limit):
+            pizzas.append(model.from_mongo(pizza_data))
         
         return pizzas, total
     
-    async def get_pizza_by_id(self, pizza_id: str) -> Optional[Pizza]:
-        pizza_data = await self.database.pizzas.find_one({"_id": ObjectId(pizza_id)})
+    @single_flight
+    @cached("pizzas")
+    async def get_pizza_by_id(self, store_id: str, pizza_id: str, fields: Optional[SparseFields] = None) -> Optional[Pizza]:
+        model = fields.model if fields else Pizza
+        projection = fields.projection if fields else None
+        pizza_data = await self.database.pizzas.find_one({"_id": ObjectId(pizza_id), "store_id": store_id}, projection)
         if pizza_data:
-            return Pizza(**pizza_data)
+            return model.from_mongo(pizza_data)
         return None
 
-    async def get_pizza_by_name(self, name: str) -> Optional[Pizza]:
-        pizza_data = await self.database.pizzas.find_one({"name": name, "available": True})
+    async def get_pizza_by_name(self, store_id: str, name: str) -> Optional[Pizza]:
+        pizza_data = await self.database.pizzas.find_one({"store_id": store_id, "name": name, "available": True})
         if pizza_data:
-            return Pizza(**pizza_data)
+            return Pizza.from_mongo(pizza_data)
         return None
     
-    async def update_pizza(self, pizza_id: str, update_data: dict) -> Optional[Pizza]:
-        await self.database.pizzas.update_one(
-            {"_id": ObjectId(pizza_id)}, 
-            {"$set": update_data}
+    async def update_pizza(self, store_id: str, pizza_id: str, update_data: dict) -> Optional[Pizza]:
+        # Read back in the same round trip; a coalesced get_pizza_by_id could
+        # join a read that started before this write.
+        pizza_data = await self.database.pizzas.find_one_and_update(
+            {"_id": ObjectId(pizza_id), "store_id": store_id}, 
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
         )
-        return await self.get_pizza_by_id(pizza_id)
+        await self._invalidate_cache()
+        if pizza_data:
+            return Pizza.from_mongo(pizza_data)
+        return None
     
-    async def delete_pizza(self, pizza_id: str) -> None:
+    async def set_image_variants(self, store_id: str, pizza_id, image_url: str, variants: dict) -> bool:
+        """Record variants rendered from ``image_url``, unless the pizza's image changed meanwhile."""
+        result = await self.database.pizzas.update_one(
+            {"_id": ObjectId(pizza_id), "store_id": store_id, "image_url": image_url},
+            {"$set": {"image_variants": variants}},
+        )
+        await self._invalidate_cache()
+        return result.modified_count > 0
+
+    async def delete_pizza(self, store_id: str, pizza_id: str) -> None:
         await self.database.pizzas.update_one(
-            {"_id": ObjectId(pizza_id)}, 
+            {"_id": ObjectId(pizza_id), "store_id": store_id}, 
             {"$set": {"available": False}}
         )
+        await self._invalidate_cache()
@@ -0,0 +1,117 @@
+from typing import Optional
+from datetime import datetime, timedelta
+from jose import jwt
+from pymongo import ReturnDocument
+from app.auth.revocation import revocation_list
+from app.db.policies import policy_collection
+import hashlib
+import hmac
+import os
+import secrets
+import uuid
+
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+def get_secret_key():
+    return os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
+
+def get_refresh_token_ttl() -> timedelta:
+    return timedelta(days=int(os.getenv("REFRESH_TOKEN_TTL_DAYS", "14")))
+
+class RefreshTokenReuseError(Exception):
+    """An already-rotated refresh token was presented again."""
+
+class TokenService:
+    """Issues access tokens and rotating refresh tokens.
+
+    Refresh tokens are random strings; only their HMAC is stored, in the
+    ``refresh_tokens`` collection (TTL index on ``expires_at``). Every token
+    belongs to a family started at login. Refreshing marks the presented token
+    used and issues the next one in the family; presenting a used token again
+    revokes the whole family.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._refresh_tokens = policy_collection(database, "refresh_tokens", "refresh_tokens.write")
+
+    def create_access_token(self, user_id: str, store_id: Optional[str] = None) -> str:
+        issued_at = datetime.utcnow()
+        expire = issued_at + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        to_encode = {"sub": user_id, "exp": expire, "iat": issued_at, "jti": uuid.uuid4().hex}
+        if store_id:
+            to_encode["store_id"] = store_id
+        return jwt.encode(to_encode, get_secret_key(), algorithm=ALGORITHM)
+
+    def decode_access_token(self, access_token: str) -> dict:
+        return jwt.decode(access_token, get_secret_key(), algorithms=[ALGORITHM])
+
+    def hash_refresh_token(self, refresh_token: str) -> str:
+        return hmac.new(get_secret_key().encode(), refresh_token.encode(), hashlib.sha256).hexdigest()
+
+    async def issue_tokens(self, user_id: str, family_id: Optional[str] = None, store_id: Optional[str] = None) -> dict:
+        """Create an access token and a refresh token (starting a new family unless given one).
+
+        ``store_id`` becomes the access token's ``store_id`` claim and is kept
+        with the refresh token, so refreshed tokens stay scoped to the store.
+        """
+        refresh_token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        await self._refresh_tokens.insert_one({
+            "token_hash": self.hash_refresh_token(refresh_token),
+            "user_id": user_id,
+            "family_id": family_id or secrets.token_hex(16),
+            "store_id": store_id,
+            "created_at": now,
+            "expires_at": now + get_refresh_token_ttl(),
+            "used_at": None,
+            "revoked": False,
+        })
+        return {
+            "access_token": self.create_access_token(user_id, store_id),
+            "refresh_token": refresh_token,
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        }
+
+    async def rotate_refresh_token(self, refresh_token: str) -> Optional[dict]:
+        """Exchange a refresh token for a new token pair.
+
+        Returns None for unknown, expired or revoked tokens and raises
+        RefreshTokenReuseError (after revoking the family) for reused ones.
+        """
+        now = datetime.utcnow()
+        # Marking the token used and reading its previous state is one atomic
+        # indexed operation, so two concurrent refreshes cannot both succeed.
+        token = await self._refresh_tokens.find_one_and_update(
+            {"token_hash": self.hash_refresh_token(refresh_token)},
+            {"$set": {"used_at": now}},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if not token or token["revoked"] or token["expires_at"] <= now:
+            return None
+        if token["used_at"] is not None:
+            await self.revoke_family(token["family_id"])
+            raise RefreshTokenReuseError("Refresh token reuse detected")
+        return await self.issue_tokens(token["user_id"], token["family_id"], token.get("store_id"))
+
+    async def revoke_family(self, family_id: str) -> None:
+        await self._refresh_tokens.update_many(
+            {"family_id": family_id},
+            {"$set": {"revoked": True}}
+        )
+
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
+        token = await self.database.refresh_tokens.find_one(
+            {"token_hash": self.hash_refresh_token(refresh_token)}
+        )
+        if token:
+            await self.revoke_family(token["family_id"])
+
+    async def revoke_user_tokens(self, user_id: str) -> None:
+        """Revoke every refresh token and every access token issued so far to ``user_id``."""
+        await self._refresh_tokens.update_many(
+            {"user_id": user_id, "revoked": False},
+            {"$set": {"revoked": True}}
+        )
+        await revocation_list.revoke_subject(self.database, user_id)
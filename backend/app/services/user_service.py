@@ -1,7 +1,13 @@
 from typing import List, Optional, Tuple
 from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime
 from app.models.user import User
+from app.utils.fields import SparseFields
+from app.services.token_service import TokenService
+from app.db.indexes import CASE_INSENSITIVE
+from app.db.policies import policy_collection
+import asyncio
 import os
 import hashlib
 import secrets
@@ -27,9 +33,13 @@ class UserService:
         existing_user = await self.get_user_by_email(user_data.get("email"))
         if existing_user:
             raise ValueError("User with this email already exists")
+        return await self._insert_user(user_data)
+
+    async def _insert_user(self, user_data: dict) -> User:
         raw_password = user_data.pop("password", None)
         if raw_password:
-            password_hash, password_salt = self.get_hashed_password(raw_password)
+            # PBKDF2 takes tens of milliseconds; hashlib releases the GIL, so a thread keeps the loop free
+            password_hash, password_salt = await asyncio.to_thread(self.get_hashed_password, raw_password)
             user_data["password_hash"] = password_hash
             user_data["password_salt"] = password_salt
         try:
@@ -39,23 +49,24 @@ class UserService:
         user_data["_id"] = result.inserted_id
         return User(**user_data)
     
-    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+    async def get_user_by_id(self, user_id: str, fields: Optional[SparseFields] = None) -> Optional[User]:
+        model = fields.model if fields else User
+        projection = fields.projection if fields else None
         try:
-            user_data = await self.database.users.find_one({"_id": ObjectId(user_id)})
-            if user_data:
-                return User(**user_data)
-            return None
-        except Exception:
+            object_id = ObjectId(user_id)
+        except (InvalidId, TypeError):
             return None
+        user_data = await self.database.users.find_one({"_id": object_id}, projection)
+        if user_data:
+            return model.from_mongo(user_data)
+        return None
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
-        try:
-            user_data = await self.database.users.find_one({"email": email})
-            if user_data:
-                return User(**user_data)
-            return None
-        except Exception:
-            return None
+        # Emails are unique case-insensitively; matching the index's collation lets the lookup use it
+        user_data = await self.database.users.find_one({"email": email}, collation=CASE_INSENSITIVE)
+        if user_data:
+            return User.from_mongo(user_data)
+        return None
 
     def verify_password(self, raw_password: str, password_hash: str, password_salt: str) -> bool:
         try:
@@ -70,12 +81,15 @@ class UserService:
         except Exception:
             return False
     
-    async def get_all_users(self, skip: int = 0, limit: int = 10) -> tuple[List[User], int]:
-        total = await self.database.users.count_documents({})
+    async def get_all_users(self, skip: int = 0, limit: int = 10, fields: Optional[SparseFields] = None) -> tuple[List[User], int]:
+        users_collection = policy_collection(self.database, "users", "users.list")
+        total = await users_collection.count_documents({})
+        model = fields.model if fields else User
+        projection = fields.projection if fields else None
         
         users = []
-        async for user_data in self.database.users.find().sort("created_at", -1).skip(skip).limit(limit):
-            users.append(User(**user_data))
+        async for user_data in users_collection.find({}, projection).sort("created_at", -1).skip(skip).limit(limit):
+            users.append(model.from_mongo(user_data))
         
         return users, total
     
@@ -84,7 +98,7 @@ class UserService:
         existing = await self.get_user_by_email(email)
         if existing:
             return str(existing.id), email
-        new_user = await self.create_user({
+        new_user = await self._insert_user({
             "name": order_data["customer_name"],
             "email": email,
             "phone": order_data.get("customer_phone"),
@@ -107,3 +121,4 @@ class UserService:
             {"_id": ObjectId(user_id)}, 
             {"$set": {"active": False}}
         )
+        await TokenService(self.database).revoke_user_tokens(user_id)
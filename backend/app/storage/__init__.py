@@ -0,0 +1,25 @@
+import os
+from app.storage.base import (
+    IMMUTABLE_CACHE_CONTROL,
+    KEY_PATTERN,
+    ImageStorage,
+    ImageTooLarge,
+    UPLOAD_BUCKETS,
+    max_image_bytes,
+)
+from app.storage.firebase import FIREBASE_AVAILABLE, FirebaseStorage
+from app.storage.local import LocalStorage
+from app.storage.memory import MemoryStorage
+
+
+def create_storage() -> ImageStorage:
+    """Build the image storage selected by ``STORAGE_BACKEND`` (``firebase``, ``local`` or ``memory``).
+
+    Defaults to Firebase when its SDK is installed and to the local directory otherwise.
+    """
+    backend = os.getenv("STORAGE_BACKEND", "firebase" if FIREBASE_AVAILABLE else "local").lower()
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "local":
+        return LocalStorage()
+    return FirebaseStorage()
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+from fastapi import Response, UploadFile
+from app.utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Upload durations reach seconds, unlike the database latencies in LATENCY_BUCKETS
+UPLOAD_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# A key names its content, so whatever is stored under it never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# "<first two hex digits>/<sha256>.<extension>"
+KEY_PATTERN = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]{1,5}$")
+
+EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp", "image/gif": "gif"}
+
+# Extensions taken from a client filename must fit KEY_PATTERN, or the stored URL would not be served
+_FILENAME_EXTENSION = re.compile(r"^[a-z0-9]{1,5}$")
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def max_image_bytes() -> int:
+    return int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+
+
+def upload_extension(content_type: Optional[str], filename: Optional[str]) -> str:
+    """The key extension for an upload: from its content type, else its filename, else ``bin``."""
+    if content_type in EXTENSIONS:
+        return EXTENSIONS[content_type]
+    name, dot, extension = (filename or "").rpartition(".")
+    extension = extension.lower()
+    if dot and name and _FILENAME_EXTENSION.match(extension):
+        return extension
+    return "bin"
+
+
+def content_type_for(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+class ImageTooLarge(Exception):
+    """The uploaded image is larger than ``MAX_IMAGE_UPLOAD_BYTES``."""
+
+
+class UploadMetrics:
+    """Upload counts, bytes and durations, plus uploads running and waiting for a slot."""
+
+    def __init__(self):
+        self.duration = Histogram(UPLOAD_BUCKETS)
+        self.wait = Histogram(UPLOAD_BUCKETS)
+        self._lock = threading.Lock()
+        self._counters = {"uploaded": 0, "deduplicated": 0, "failed": 0, "too_large": 0, "bytes": 0}
+        self.in_flight = 0
+        self.waiting = 0
+
+    def count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "duration_seconds": self.duration.snapshot(),
+            "slot_wait_seconds": self.wait.snapshot(),
+        }
+
+
+class ImageStorage(ABC):
+    """Content-addressed image store.
+
+    Every blob is keyed by the SHA-256 of its bytes, so an image that is
+    already stored (the same photo uploaded again, or an unchanged variant)
+    is only hashed, never transferred twice, and a key's content never
+    changes, which lets it be cached forever. Backends implement blocking
+    ``_exists``/``_write``/``url``; they run on a thread pool of
+    ``MAX_CONCURRENT_UPLOADS`` threads behind a semaphore of the same size,
+    so a burst of uploads queues here instead of blocking the event loop.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_concurrent = int(os.getenv("MAX_CONCURRENT_UPLOADS", "4")) if max_concurrent is None else max_concurrent
+        self.max_bytes = max_image_bytes() if max_bytes is None else max_bytes
+        self.metrics = UploadMetrics()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @abstractmethod
+    def _exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def _write(self, key: str, file_obj: BinaryIO, size: int, content_type: Optional[str]) -> None:
+        """Store ``size`` bytes read from ``file_obj`` under ``key``."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+    async def response(self, key: str) -> Optional[Response]:
+        """Serve ``key`` from the API (``GET /images/{key}``); ``None`` when the backend serves its own URLs."""
+        return None
+
+    async def _run(self, fn: Callable, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_concurrent, thread_name_prefix="image-storage")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    @staticmethod
+    def _size(file: UploadFile) -> int:
+        if file.size is not None:
+            return file.size
+        file.file.seek(0, os.SEEK_END)
+        return file.file.tell()
+
+    async def upload_image(self, file: UploadFile) -> Optional[str]:
+        """Store an uploaded image and return its URL; ``None`` if storing failed."""
+        if not file:
+            return None
+
+        size = self._size(file)
+        if size > self.max_bytes:
+            self.metrics.count("too_large")
+            raise ImageTooLarge(f"Image is larger than {self.max_bytes} bytes")
+
+        return await self._store(file.file, size, file.content_type, upload_extension(file.content_type, file.filename))
+
+    async def upload_bytes(self, data: bytes, content_type: str) -> Optional[str]:
+        """Store generated content (e.g. image variants) and return its URL."""
+        return await self._store(BytesIO(data), len(data), content_type, EXTENSIONS.get(content_type, "bin"))
+
+    def _put(self, file_obj: BinaryIO, size: int, content_type: Optional[str], extension: str) -> Tuple[str, bool]:
+        """Hash ``file_obj`` and write it unless its key exists; returns ``(url, written)``."""
+        digest = hashlib.sha256()
+        file_obj.seek(0)
+        for chunk in iter(lambda: file_obj.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+        hex_digest = digest.hexdigest()
+        key = f"{hex_digest[:2]}/{hex_digest}.{extension}"
+        if self._exists(key):
+            return self.url(key), False
+        file_obj.seek(0)
+        self._write(key, file_obj, size, content_type)
+        return self.url(key), True
+
+    async def _store(self, file_obj: BinaryIO, size: int, content_type: Optional[str], extension: str) -> Optional[str]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+
+        queued = time.perf_counter()
+        self.metrics.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.metrics.waiting -= 1
+        started = time.perf_counter()
+        self.metrics.wait.observe(started - queued)
+        self.metrics.in_flight += 1
+        try:
+            url, written = await self._run(self._put, file_obj, size, content_type, extension)
+        except Exception:
+            self.metrics.count("failed")
+            logger.exception("Error storing image")
+            return None
+        finally:
+            self.metrics.in_flight -= 1
+            self._slots.release()
+            self.metrics.duration.observe(time.perf_counter() - started)
+        if written:
+            self.metrics.count("uploaded")
+            self.metrics.count("bytes", size)
+        else:
+            self.metrics.count("deduplicated")
+        return url
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor, self._slots = None, None
@@ -0,0 +1,92 @@
+import os
+import threading
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import BinaryIO, Optional
+from app.storage.base import IMMUTABLE_CACHE_CONTROL, ImageStorage
+
+# Checked without importing: the SDK pulls in the Google Cloud and gRPC
+# libraries, which only image uploads need
+FIREBASE_AVAILABLE = find_spec("firebase_admin") is not None
+
+# Resumable upload chunks must be a multiple of 256 KiB
+_CHUNK_UNIT = 256 * 1024
+
+
+@lru_cache(maxsize=None)
+def _firebase():
+    """Import the Firebase Admin SDK on first use."""
+    import firebase_admin
+    from firebase_admin import credentials, storage
+    return firebase_admin, credentials, storage
+
+
+class FirebaseStorage(ImageStorage):
+    """Blobs in the Firebase Storage bucket, public and served by Google's CDN.
+
+    The SDK and bucket are set up on the first upload, not per request. The
+    image is streamed from the request's spooled upload file: images up to
+    one chunk go in a single request, larger ones as a resumable upload in
+    ``FIREBASE_UPLOAD_CHUNK_BYTES`` pieces. Writes only succeed if the blob
+    does not exist yet, so a blob, once written, is never replaced.
+    """
+
+    def __init__(self, bucket=None, chunk_size: Optional[int] = None, timeout: Optional[float] = None, **options):
+        super().__init__(**options)
+        self.bucket = bucket
+        chunk_size = int(os.getenv("FIREBASE_UPLOAD_CHUNK_BYTES", str(1024 * 1024))) if chunk_size is None else chunk_size
+        self.chunk_size = max(_CHUNK_UNIT, chunk_size - chunk_size % _CHUNK_UNIT)
+        self.timeout = float(os.getenv("FIREBASE_UPLOAD_TIMEOUT_SECONDS", "30")) if timeout is None else timeout
+        self._bucket_lock = threading.Lock()
+
+    def _initialize_firebase(self):
+        """Initialize the Firebase Admin SDK and return the storage bucket."""
+        firebase_admin, credentials, storage = _firebase()
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            firebase_config_path = os.getenv("FIREBASE_CONFIG_PATH")
+            if firebase_config_path and os.path.exists(firebase_config_path):
+                cred = credentials.Certificate(firebase_config_path)
+                firebase_admin.initialize_app(cred, {
+                    'storageBucket': os.getenv("FIREBASE_STORAGE_BUCKET")
+                })
+            else:
+                firebase_admin.initialize_app(options={
+                    'storageBucket': os.getenv("FIREBASE_STORAGE_BUCKET")
+                })
+        return storage.bucket()
+
+    def _get_bucket(self):
+        with self._bucket_lock:
+            if self.bucket is None:
+                self.bucket = self._initialize_firebase()
+            return self.bucket
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return f"images/{key}"
+
+    def _exists(self, key: str) -> bool:
+        return self._get_bucket().blob(self._name(key)).exists(timeout=self.timeout)
+
+    def _write(self, key: str, file_obj: BinaryIO, size: int, content_type: Optional[str]) -> None:
+        blob = self._get_bucket().blob(self._name(key), chunk_size=self.chunk_size)
+        blob.cache_control = IMMUTABLE_CACHE_CONTROL
+        try:
+            blob.upload_from_file(
+                file_obj,
+                # Without a size the client uses a resumable upload in chunk_size pieces
+                size=size if size <= self.chunk_size else None,
+                content_type=content_type,
+                predefined_acl="publicRead",
+                if_generation_match=0,
+                timeout=self.timeout,
+            )
+        except Exception as exc:
+            # Another worker stored the same content first
+            if getattr(exc, "code", None) != 412:
+                raise
+
+    def url(self, key: str) -> str:
+        return self._get_bucket().blob(self._name(key)).public_url
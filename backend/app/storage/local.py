@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Optional
+from fastapi import Response
+from fastapi.responses import FileResponse
+from app.storage.base import IMMUTABLE_CACHE_CONTROL, ImageStorage, content_type_for
+
+
+class LocalStorage(ImageStorage):
+    """Blobs in a directory (``IMAGE_STORAGE_DIR``), served by the API from ``/images``.
+
+    Files are written to a temporary name and renamed into place, so a
+    concurrent reader never sees a partial image and two workers storing the
+    same content both end up with the same complete file. Responses carry a
+    one-year ``immutable`` Cache-Control: a key's content never changes.
+    """
+
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None, **options):
+        super().__init__(**options)
+        self.root = os.path.abspath(os.getenv("IMAGE_STORAGE_DIR", "media") if root is None else root)
+        self.base_url = (os.getenv("IMAGE_BASE_URL", "/images") if base_url is None else base_url).rstrip("/")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def _write(self, key: str, file_obj: BinaryIO, size: int, content_type: Optional[str]) -> None:
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as temp_file:
+            shutil.copyfileobj(file_obj, temp_file)
+        os.replace(temp_file.name, path)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    async def response(self, key: str) -> Optional[Response]:
+        path = self._path(key)
+        if not await self._run(os.path.isfile, path):
+            return None
+        return FileResponse(
+            path,
+            media_type=content_type_for(key),
+            headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{key.rsplit("/", 1)[-1]}"'},
+        )
@@ -0,0 +1,37 @@
+import os
+from typing import BinaryIO, Dict, Optional, Tuple
+from fastapi import Response
+from app.storage.base import IMMUTABLE_CACHE_CONTROL, ImageStorage, content_type_for
+
+
+class MemoryStorage(ImageStorage):
+    """Keeps blobs in this process and serves them from ``/images``; for tests and local runs."""
+
+    def __init__(self, base_url: Optional[str] = None, **options):
+        super().__init__(**options)
+        self.base_url = (os.getenv("IMAGE_BASE_URL", "/images") if base_url is None else base_url).rstrip("/")
+        self.blobs: Dict[str, Tuple[bytes, str]] = {}
+
+    async def _run(self, fn, *args):
+        # Nothing here blocks on I/O, so a thread hop would only add latency
+        return fn(*args)
+
+    def _exists(self, key: str) -> bool:
+        return key in self.blobs
+
+    def _write(self, key: str, file_obj: BinaryIO, size: int, content_type: Optional[str]) -> None:
+        self.blobs[key] = (file_obj.read(), content_type or content_type_for(key))
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    async def response(self, key: str) -> Optional[Response]:
+        blob = self.blobs.get(key)
+        if blob is None:
+            return None
+        content, content_type = blob
+        return Response(
+            content,
+            media_type=content_type,
+            headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{key.rsplit("/", 1)[-1]}"'},
+        )
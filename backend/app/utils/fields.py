@@ -0,0 +1,89 @@
+from typing import Optional, Type, FrozenSet, Dict
+from functools import lru_cache
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, create_model
+from app.models.base import MongoModel
+
+
+def _selectable_fields(model: Type[BaseModel]) -> Dict[str, str]:
+    """Map every accepted field name (attribute and alias) to the attribute name."""
+    selectable = {}
+    for name, field in model.model_fields.items():
+        if field.exclude:
+            continue
+        selectable[name] = name
+        if field.alias:
+            selectable[field.alias] = name
+    return selectable
+
+
+@lru_cache(maxsize=256)
+def slim_model(model: Type[BaseModel], names: FrozenSet[str]) -> Type[BaseModel]:
+    """Build (and cache) a response model holding only the given fields of ``model``."""
+    definitions = {
+        name: (field.annotation, field)
+        for name, field in model.model_fields.items()
+        if name in names
+    }
+    slim = create_model(
+        f"{model.__name__}Fields",
+        __base__=MongoModel,
+        **definitions,
+    )
+    slim.__pickle_origin__ = (slim_model, (model, names))
+    return slim
+
+
+class SparseFields:
+    """Subset of a model's fields requested through ``?fields=``."""
+
+    def __init__(self, model: Type[BaseModel], names: FrozenSet[str]):
+        self.source_model = model
+        self.names = names
+        self.model = slim_model(model, names)
+        self.projection = {
+            model.model_fields[name].alias or name: 1 for name in sorted(names)
+        }
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, SparseFields)
+            and other.source_model is self.source_model
+            and other.names == self.names
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.source_model, self.names))
+
+    def __str__(self) -> str:
+        return f"fields({','.join(sorted(self.names))})"
+
+
+def sparse_fields(model: Type[BaseModel]):
+    """Create a ``fields`` query dependency for endpoints returning ``model``."""
+    selectable = _selectable_fields(model)
+    id_field = next(
+        (name for name, field in model.model_fields.items() if field.alias == "_id"),
+        None,
+    )
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated list of fields to return (e.g. _id,name,price)",
+        )
+    ) -> Optional[SparseFields]:
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            return None
+        unknown = sorted(name for name in requested if name not in selectable)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        names = {selectable[name] for name in requested}
+        if id_field:
+            names.add(id_field)
+        return SparseFields(model, frozenset(names))
+
+    return dependency
@@ -0,0 +1,35 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Sequence
+
+# Upper bounds in seconds, as in a Prometheus histogram
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds; safe to feed from driver threads."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative bucket counts, sample count and sum."""
+        with self._lock:
+            counts, count, total = list(self._counts), self._count, self._sum
+        buckets = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            buckets.append({"le": "+Inf" if bound == float("inf") else bound, "count": cumulative})
+        return {"buckets": buckets, "count": count, "sum": round(total, 6)}
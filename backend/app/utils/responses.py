@@ -0,0 +1,26 @@
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded once with orjson.
+
+    Endpoints return this with the models their services already built, which
+    skips FastAPI's response_model re-validation and ``jsonable_encoder`` pass.
+    Routes keep declaring ``response_model`` so the OpenAPI schema stays accurate.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
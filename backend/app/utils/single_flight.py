@@ -0,0 +1,82 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls so they share one in-flight awaitable.
+
+    Only calls that overlap in time are merged; once the shared call finishes
+    the next caller starts a fresh one, so this is not a cache.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, name: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        counters = self._counters.setdefault(name, {"requests": 0, "executions": 0})
+        counters["requests"] += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            counters["executions"] += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(functools.partial(self._forget, key))
+        # shield: one waiter being cancelled must not cancel the call the others share
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            future.exception()  # mark as retrieved when every waiter has gone away
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-method request/execution counts and the share of requests that were coalesced."""
+        methods = {}
+        total_requests = total_executions = 0
+        for name, counters in sorted(self._counters.items()):
+            requests, executions = counters["requests"], counters["executions"]
+            total_requests += requests
+            total_executions += executions
+            methods[name] = _summary(requests, executions)
+        return {
+            **_summary(total_requests, total_executions),
+            "in_flight": len(self._in_flight),
+            "methods": methods,
+        }
+
+    def reset(self) -> None:
+        self._counters.clear()
+
+
+def _summary(requests: int, executions: int) -> Dict[str, Any]:
+    coalesced = requests - executions
+    return {
+        "requests": requests,
+        "executions": executions,
+        "coalesced": coalesced,
+        "coalescing_ratio": round(coalesced / requests, 4) if requests else 0.0,
+    }
+
+
+flights = SingleFlight()
+
+
+def single_flight(method):
+    """Coalesce concurrent calls of a service read method with the same arguments.
+
+    The key is the method, the service's database name and the call arguments,
+    which therefore must be hashable. Writes must not read their result back
+    through a coalesced method (it may join a read that started before the
+    write); they use ``find_one_and_update`` instead.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (name, self.database.name, args, tuple(sorted(kwargs.items())))
+        return await flights.do(name, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
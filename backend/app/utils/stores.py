@@ -0,0 +1,32 @@
+import os
+import re
+from typing import Optional
+from fastapi import Header, HTTPException, Request
+
+STORE_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+
+
+def default_store_id() -> str:
+    """Store that requests without a store (and documents written before stores existed) belong to."""
+    return os.getenv("DEFAULT_STORE_ID", "main")
+
+
+async def current_store(
+    request: Request,
+    x_store_id: Optional[str] = Header(None, description="Store to work on (defaults to DEFAULT_STORE_ID)"),
+) -> str:
+    """Store the request works on.
+
+    A token's ``store_id`` claim wins and a different ``X-Store-Id`` is
+    refused, so staff tokens stay scoped to their store. Otherwise (public
+    endpoints, tokens without the claim) the header picks the store.
+    """
+    claimed = getattr(request.state, "store_id", None)
+    if claimed:
+        if x_store_id and x_store_id != claimed:
+            raise HTTPException(status_code=403, detail="Token is not valid for this store")
+        return claimed
+    store_id = x_store_id or default_store_id()
+    if not STORE_ID_PATTERN.match(store_id):
+        raise HTTPException(status_code=400, detail="Invalid store id")
+    return store_id
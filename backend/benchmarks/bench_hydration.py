@@ -0,0 +1,23 @@
+"""Per-document hydration cost of an order with 10 items.
+
+Compares full validation (``Order(**doc)``) with the trusted read path
+(``Order.from_mongo(doc)``). Needs no database.
+
+Run from backend/: ``python -m benchmarks.bench_hydration``
+"""
+from app.models.order import Order
+from factories import make_order_document
+from benchmarks.common import time_calls, print_table
+
+
+def main():
+    document = make_order_document(items_per_order=10)
+    rows = {
+        "Order(**doc)": time_calls(lambda: Order(**document), iterations=5000),
+        "Order.from_mongo(doc)": time_calls(lambda: Order.from_mongo(document), iterations=5000),
+    }
+    print_table("Hydrate one order with 10 items", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Encoding cost of a 100-order page: FastAPI response_model path vs ORJSONResponse.
+
+The first table needs no database: it times FastAPI's own ``serialize_response``
+(re-validation + ``jsonable_encoder``) followed by ``JSONResponse`` against
+``ORJSONResponse`` on the same in-memory page. The second table times
+``GET /orders/?limit=100`` end to end against MongoDB.
+
+Run from backend/: ``python -m benchmarks.bench_response_encoding [--offline]``
+"""
+import asyncio
+import json
+import sys
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.order import Order
+from app.utils.pagination import PaginatedResponse
+from app.utils.responses import ORJSONResponse
+from factories import make_order_document
+from benchmarks.common import bench_client, seed_orders, summarize, time_requests, print_table
+
+ITERATIONS = 200
+
+
+def build_page() -> PaginatedResponse:
+    orders = [Order(**make_order_document(10, i)) for i in range(100)]
+    return PaginatedResponse.create(orders, 100, 1, 100)
+
+
+async def time_encoders(page: PaginatedResponse) -> dict:
+    field = create_response_field(name="Response_get_all_orders", type_=PaginatedResponse[Order])
+
+    async def response_model_path():
+        content = await serialize_response(field=field, response_content=page, is_coroutine=True)
+        return JSONResponse(content).body
+
+    async def orjson_path():
+        return ORJSONResponse(page).body
+
+    assert json.loads(await response_model_path()) == json.loads(await orjson_path())
+
+    results = {}
+    for label, encode in (("response_model + json", response_model_path), ("ORJSONResponse", orjson_path)):
+        await encode()
+        timings = []
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            await encode()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[label] = summarize(timings)
+    return results
+
+
+async def main(offline: bool = False):
+    print_table("Encode 100 orders x 10 items (no database)", await time_encoders(build_page()))
+    if offline:
+        return
+    async with bench_client() as (client, db):
+        await seed_orders(db, count=100, items_per_order=10)
+        rows = {"GET /orders/?limit=100": await time_requests(client, "/orders/?limit=100")}
+    print_table("End to end (current code path)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(offline="--offline" in sys.argv))
@@ -0,0 +1,25 @@
+"""Payload size and latency of a 100-row orders page with and without ?fields=.
+
+Run from backend/: ``python -m benchmarks.bench_sparse_fields``
+"""
+import asyncio
+
+from benchmarks.common import bench_client, seed_orders, time_requests, print_table
+
+ADMIN_TABLE_FIELDS = "customer_name,total_amount,status"
+
+
+async def main():
+    async with bench_client() as (client, db):
+        await seed_orders(db, count=100, items_per_order=10)
+        rows = {
+            "full documents": await time_requests(client, "/orders/?limit=100"),
+            f"fields={ADMIN_TABLE_FIELDS}": await time_requests(
+                client, f"/orders/?limit=100&fields={ADMIN_TABLE_FIELDS}"
+            ),
+        }
+    print_table("GET /orders/?limit=100 (100 orders x 10 items)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
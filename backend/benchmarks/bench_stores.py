@@ -0,0 +1,46 @@
+"""Per-store cost of an orders page as the number of stores grows.
+
+Every store gets the same number of orders, so a query that really is scoped
+by the leading ``store_id`` index key examines the same keys (and takes about
+the same time) with 1 store or 50; a scan would grow with the store count.
+
+Run from backend/: ``python -m benchmarks.bench_stores``
+"""
+import asyncio
+
+from app.db import reconcile_indexes
+from benchmarks.common import bench_client, seed_orders, time_requests, print_table
+
+STORE_COUNTS = (1, 10, 50)
+ORDERS_PER_STORE = 200
+PAGE = 20
+
+
+async def explain_page(db, store_id: str) -> dict:
+    plan = await db.command(
+        "explain",
+        {"find": "orders", "filter": {"store_id": store_id}, "sort": {"created_at": -1}, "limit": PAGE},
+        verbosity="executionStats",
+    )
+    stats = plan["executionStats"]
+    return {"keys_examined": stats["totalKeysExamined"], "docs_examined": stats["totalDocsExamined"]}
+
+
+async def main():
+    rows = {}
+    async with bench_client() as (client, db):
+        await reconcile_indexes(db)
+        seeded = 0
+        for stores in STORE_COUNTS:
+            for index in range(seeded, stores):
+                await seed_orders(db, count=ORDERS_PER_STORE, items_per_order=2, store_id=f"store-{index}")
+            seeded = stores
+            store_id = f"store-{stores // 2}"
+            client.headers["X-Store-Id"] = store_id
+            timing = await time_requests(client, f"/orders/?limit={PAGE}")
+            rows[f"{stores} stores ({stores * ORDERS_PER_STORE} orders)"] = {**timing, **await explain_page(db, store_id)}
+    print_table(f"GET /orders/?limit={PAGE} for one store ({ORDERS_PER_STORE} orders per store)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Cost of the image upload path on the local storage backend.
+
+Stores 1 MiB photos as new content and again as duplicates (only hashed,
+never rewritten), then serves one from ``GET /images/{key}``. With MongoDB
+available it also times ``POST /pizzas/`` with an image end to end. Images
+go to a temporary directory, so no Firebase project or network is needed.
+The in-process client waits for background tasks, so the POST row also
+includes rendering and storing the variants, which a real client does not
+wait for.
+
+Run from backend/: ``python -m benchmarks.bench_uploads [--offline]``
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from tempfile import SpooledTemporaryFile
+
+from httpx import AsyncClient
+from starlette.datastructures import Headers, UploadFile
+
+from app.storage import LocalStorage
+from benchmarks.common import bench_client, summarize, time_requests, print_table
+
+PHOTO_BYTES = 1024 * 1024
+ITERATIONS = 50
+
+
+def spooled_upload(data: bytes) -> UploadFile:
+    """An upload the way the multipart parser hands it over: spooled to disk past 1 MiB."""
+    spooled = SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(data)
+    spooled.seek(0)
+    return UploadFile(spooled, size=len(data), filename="photo.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+
+async def time_uploads(storage: LocalStorage, photos: list) -> dict:
+    timings = []
+    for photo in photos:
+        upload = spooled_upload(photo)
+        start = time.perf_counter()
+        url = await storage.upload_image(upload)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert url, "upload failed"
+    return summarize(timings)
+
+
+def jpeg_photos(count: int) -> list:
+    """Distinct noisy JPEGs (trailing bytes differ), so the background variant render has real work."""
+    from io import BytesIO
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.frombytes("RGB", (1200, 900), os.urandom(1200 * 900 * 3)).save(buffer, "JPEG", quality=90)
+    return [buffer.getvalue() + index.to_bytes(4, "big") for index in range(count)]
+
+
+async def time_create_pizzas(client: AsyncClient, photos: list) -> dict:
+    timings = []
+    for index, photo in enumerate(photos):
+        start = time.perf_counter()
+        response = await client.post(
+            "/pizzas/",
+            data={"name": f"Bench Pizza {index}", "description": "Benchmark", "price": "10.00"},
+            files={"image": ("photo.jpg", photo, "image/jpeg")},
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return summarize(timings)
+
+
+async def main(offline: bool = False):
+    from app.main import app
+
+    photos = [os.urandom(PHOTO_BYTES) for _ in range(ITERATIONS)]
+    rows = {}
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalStorage(root=root, base_url="/images")
+        rows["store new 1 MiB photo"] = await time_uploads(storage, photos)
+        rows["store duplicate (hash only)"] = await time_uploads(storage, photos)
+        url = await storage.upload_bytes(photos[0], "image/jpeg")
+
+        app.storage = storage
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            rows["GET /images/{key} (1 MiB)"] = await time_requests(client, url, iterations=ITERATIONS)
+
+        if not offline:
+            async with bench_client() as (client, _):
+                app.storage = LocalStorage(root=root, base_url="/images")
+                rows["POST /pizzas/ + variant render"] = await time_create_pizzas(client, jpeg_photos(ITERATIONS))
+        storage.close()
+    print_table(f"Image uploads on local storage ({ITERATIONS} x {PHOTO_BYTES // 1024} KiB)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(offline="--offline" in sys.argv))
@@ -0,0 +1,138 @@
+"""Throughput of the production server with one worker versus one per CPU.
+
+Starts ``python -m app.server`` as a subprocess (so gunicorn, uvloop and
+httptools are used exactly as in the container) and drives it from several
+client processes, so the load generator is not the bottleneck.
+
+Run from backend/: ``python -m benchmarks.bench_workers [--workers 1,4] [--duration 10]``
+
+The multi-worker number only means something on a machine with more than one
+core available; the script prints how many it found.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.server import available_cpus
+from benchmarks.common import BENCH_MONGODB_DB, BENCH_MONGODB_URL, summarize, print_table
+
+HOST = "127.0.0.1"
+PORT = 8765
+PATH = "/pizzas/?limit=20"
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start listening on {port}")
+
+
+async def _drive(url: str, connections: int, duration: float):
+    timings, errors = [], 0
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        stop_at = time.monotonic() + duration
+
+        async def loop():
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    timings.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(loop() for _ in range(connections)))
+    return timings, errors
+
+
+def _client_process(url: str, connections: int, duration: float, results) -> None:
+    results.put(asyncio.run(_drive(url, connections, duration)))
+
+
+def run_load(url: str, processes: int, connections: int, duration: float) -> dict:
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=_client_process, args=(url, connections, duration, results))
+        for _ in range(processes)
+    ]
+    for client in clients:
+        client.start()
+    timings, errors = [], 0
+    for _ in clients:
+        client_timings, client_errors = results.get()
+        timings.extend(client_timings)
+        errors += client_errors
+    for client in clients:
+        client.join()
+    if not timings:
+        raise RuntimeError(f"no successful requests ({errors} errors)")
+    return {
+        "req_per_s": round(len(timings) / duration, 1),
+        **summarize(timings),
+        "p99_ms": round(sorted(timings)[int(len(timings) * 0.99) - 1], 3),
+        "errors": errors,
+    }
+
+
+def bench(workers: int, args) -> dict:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "HOST": HOST,
+        "PORT": str(PORT),
+        "MONGODB_URL": BENCH_MONGODB_URL,
+        "MONGODB_DB": BENCH_MONGODB_DB,
+        # the benchmark measures raw throughput, not the overload protections
+        "LOAD_SHED_NORMAL_LAG_MS": "0",
+        "LOAD_SHED_LOW_LAG_MS": "0",
+        "BULKHEAD_MENU_READS": "0",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(PORT)
+        url = f"http://{HOST}:{PORT}{PATH}"
+        run_load(url, 1, 4, 1.0)  # warm up every worker's pool and cache
+        return run_load(url, args.clients, args.connections, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default=f"1,{available_cpus()}", help="comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per run")
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--connections", type=int, default=16, help="connections per client process")
+    args = parser.parse_args()
+
+    counts = sorted({int(count) for count in args.workers.split(",")})
+    rows = {f"{count} worker(s)": bench(count, args) for count in counts}
+    print_table(f"GET {PATH} ({available_cpus()} CPU(s) available to the server)", rows)
+
+
+if __name__ == "__main__":
+    main()
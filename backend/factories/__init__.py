@@ -0,0 +1,2 @@
+"""Sample documents for the tests and the benchmarks, so neither depends on the other."""
+from factories.orders import make_order_document
@@ -0,0 +1,35 @@
+"""Order documents shaped like the ones OrderService writes."""
+from datetime import datetime, timedelta
+from bson import ObjectId
+
+
+def make_order_document(items_per_order: int = 10, index: int = 0, store_id: str = "main") -> dict:
+    """Build an order document shaped like the ones OrderService writes."""
+    items = []
+    for item_index in range(items_per_order):
+        items.append({
+            "pizza_id": str(ObjectId()),
+            "pizza_name": f"Pizza {item_index}",
+            "pizza_price": 12.5,
+            "extras": [
+                {"id": str(ObjectId()), "name": "Extra Cheese", "price": 1.5},
+                {"id": str(ObjectId()), "name": "Olives", "price": 1.0},
+            ],
+            "quantity": 2,
+            "item_total": 30.0,
+        })
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "store_id": store_id,
+        "user_id": str(ObjectId()),
+        "customer_name": f"Customer {index}",
+        "customer_email": f"customer{index}@example.com",
+        "customer_phone": "1234567890",
+        "customer_address": f"{index} Benchmark Street",
+        "items": items,
+        "total_amount": 30.0 * items_per_order,
+        "status": "pending",
+        "created_at": now - timedelta(seconds=index),
+        "updated_at": now,
+    }
@@ -5,7 +5,14 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from httpx import AsyncClient
 import os
 from app.main import app
+from app.cache import MemoryCacheBackend
+from app.ratelimit import MemoryBucketStore
+from app.storage import MemoryStorage
+from app.db import mongo_breaker, reconcile_indexes
+from app.profiling import loop_watchdog
+from app.services.container import ServiceContainer
 from jose import jwt
+from tests.query_recorder import QueryRecorder, find_collection_scans
 from datetime import datetime, timedelta
 
 # Test database configuration
@@ -16,6 +23,16 @@ TEST_MONGODB_DB = os.getenv("MONGODB_DB", "usersnack_test_db")
 TEST_SECRET_KEY = "test-secret-key-for-testing-only"
 TEST_USER_ID = "test-user-123"
 
+# anyio loads its asyncio backend on the first threadpool call; importing it
+# here keeps that one-off import out of whichever request happens to be first
+import anyio._backends._asyncio  # noqa: F401
+
+# Longest a request may hold the event loop before the test fails; 0 turns the check off
+TEST_LOOP_BLOCK_BUDGET = float(os.getenv("TEST_LOOP_BLOCK_BUDGET_MS", "100")) / 1000
+
+# Sees every command the app sends to the test database; see the client and queries fixtures
+query_recorder = QueryRecorder()
+
 def create_test_token(user_id: str = TEST_USER_ID) -> str:
     """Create a mock JWT token for testing."""
     expires_delta = timedelta(minutes=30)
@@ -27,7 +44,7 @@ def create_test_token(user_id: str = TEST_USER_ID) -> str:
 @pytest_asyncio.fixture
 async def test_db():
     """Create test database connection."""
-    client = AsyncIOMotorClient(TEST_MONGODB_URL)
+    client = AsyncIOMotorClient(TEST_MONGODB_URL, event_listeners=[query_recorder])
     db = client[TEST_MONGODB_DB]
     yield db, client
     # Clean up after tests
@@ -36,13 +53,19 @@ async def test_db():
 
 @pytest_asyncio.fixture
 async def client(test_db):
-    """Create test client with test database."""
+    """Create test client with test database.
+
+    The test fails at teardown if one of its finds scanned a whole collection
+    or a request blocked the event loop beyond ``TEST_LOOP_BLOCK_BUDGET_MS``.
+    """
     db, test_client = test_db
     
     # Clean database before each test
     collections = await db.list_collection_names()
     for collection in collections:
         await db[collection].drop()
+    # Registry indexes as in production, so every recorded find can be explained against them
+    await reconcile_indexes(db)
     
     # Set test environment variables
     os.environ["JWT_SECRET_KEY"] = TEST_SECRET_KEY
@@ -50,28 +73,37 @@ async def client(test_db):
     # Set up app with test database - use the same client instance
     app.mongodb_client = test_client
     app.mongodb = db
+    app.cache = MemoryCacheBackend()
+    app.rate_limit_store = MemoryBucketStore()
+    app.storage = MemoryStorage()
+    mongo_breaker.reset()
+    app.container = ServiceContainer(test_client, db, app.cache)
         
     # Override the database dependency
     def override_get_database():
         return db
     
-    # Mock Firebase service for tests
-    class MockFirebaseService:
-        async def upload_image(self, file):
-            return "https://mock-firebase-url.com/test-image.jpg"
-    
-    def override_get_firebase_service():
-        return MockFirebaseService()
-    
     from app.main import get_database
-    from app.controllers.pizza_controller import get_firebase_service
     
     app.dependency_overrides[get_database] = override_get_database
-    app.dependency_overrides[get_firebase_service] = override_get_firebase_service
+
+    threshold = loop_watchdog.threshold
+    loop_watchdog.threshold = TEST_LOOP_BLOCK_BUDGET
+    loop_watchdog.reset()
+    await loop_watchdog.start()
+    query_recorder.commands.clear()
+    query_recorder.recording = True
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     
+    query_recorder.recording = False
+    recorded = list(query_recorder.commands)
+    query_recorder.commands.clear()
+    await loop_watchdog.stop()
+    blocks = list(loop_watchdog.recent)
+    loop_watchdog.reset()
+    loop_watchdog.threshold = threshold
     # Clean up
     app.dependency_overrides.clear()
     # Clean up app attributes
@@ -79,10 +111,32 @@ async def client(test_db):
         delattr(app, 'mongodb_client')
     if hasattr(app, 'mongodb'):
         delattr(app, 'mongodb')
+    if hasattr(app, 'cache'):
+        delattr(app, 'cache')
+    if hasattr(app, 'rate_limit_store'):
+        delattr(app, 'rate_limit_store')
+    if hasattr(app, 'storage'):
+        delattr(app, 'storage')
+    if hasattr(app, 'container'):
+        delattr(app, 'container')
+    scans = await find_collection_scans(db, recorded)
+    if scans:
+        pytest.fail("Queries scanned a whole collection (add or fix an index in app/db/indexes.py):\n" + "\n".join(scans))
+    if blocks:
+        pytest.fail(
+            f"The event loop was blocked for longer than {TEST_LOOP_BLOCK_BUDGET * 1000:.0f}ms "
+            "(move the work to a thread, or raise TEST_LOOP_BLOCK_BUDGET_MS):\n"
+            + "\n".join(f"{block['method']} {block['route']}: {block['duration_ms']:.0f}ms\n{block['stack'] or ''}" for block in blocks)
+        )
 
 @pytest_asyncio.fixture
 async def auth_client(client):
     """Create authenticated test client with JWT token."""
     token = create_test_token()
     client.headers.update({"Authorization": f"Bearer {token}"})
-    return client
\ No newline at end of file
+    return client
+
+@pytest_asyncio.fixture
+async def queries(client):
+    """The recorder of the MongoDB commands the test sends, for ``queries.at_most(n)`` budgets."""
+    return query_recorder
@@ -0,0 +1,124 @@
+import asyncio
+import fnmatch
+import time
+
+
+class FakeRedisServer:
+    """Minimal RESP2 server implementing the Redis commands the cache backend uses.
+
+    Strings with PX/EX expiry, DEL/UNLINK, PTTL, SCAN MATCH and PUBLISH/SUBSCRIBE;
+    anything else gets an error reply.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+        self.commands = []
+        self._server = None
+        self.url = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"redis://127.0.0.1:{port}/0"
+        return self
+
+    async def stop(self):
+        self._server.close()
+        for writers in self.subscribers.values():
+            for writer in writers:
+                writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                self.commands.append(command[0].upper())
+                writer.write(self._execute(command, writer))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for writers in self.subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    async def _read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        count = int(line[1:].strip())
+        args = []
+        for _ in range(count):
+            length = int((await reader.readline())[1:].strip())
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return [args[0].decode()] + args[1:]
+
+    def _alive(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def _execute(self, command, writer):
+        name, args = command[0].upper(), command[1:]
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name in ("CLIENT", "SELECT"):
+            return b"+OK\r\n"
+        if name == "GET":
+            entry = self._alive(args[0])
+            return _bulk(entry[0] if entry else None)
+        if name == "SET":
+            expires_at = None
+            options = [arg.decode().upper() for arg in args[2:]]
+            if "PX" in options:
+                expires_at = time.monotonic() + int(options[options.index("PX") + 1]) / 1000
+            if "EX" in options:
+                expires_at = time.monotonic() + int(options[options.index("EX") + 1])
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if name == "PTTL":
+            entry = self._alive(args[0])
+            if entry is None:
+                return b":-2\r\n"
+            if entry[1] is None:
+                return b":-1\r\n"
+            return b":%d\r\n" % int((entry[1] - time.monotonic()) * 1000)
+        if name in ("DEL", "UNLINK"):
+            removed = sum(1 for key in args if self.data.pop(key, None) is not None)
+            return b":%d\r\n" % removed
+        if name == "SCAN":
+            options = [arg.decode() for arg in args[1:]]
+            pattern = options[options.index("MATCH") + 1] if "MATCH" in options else "*"
+            keys = [key for key in list(self.data) if self._alive(key) and fnmatch.fnmatchcase(key.decode(), pattern)]
+            return b"*2\r\n" + _bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(_bulk(key) for key in keys)
+        if name == "PUBLISH":
+            receivers = self.subscribers.get(args[0], set())
+            for subscriber in list(receivers):
+                subscriber.write(b"*3\r\n" + _bulk(b"message") + _bulk(args[0]) + _bulk(args[1]))
+            return b":%d\r\n" % len(receivers)
+        if name in ("SUBSCRIBE", "UNSUBSCRIBE"):
+            reply = b""
+            for channel in args:
+                if name == "SUBSCRIBE":
+                    self.subscribers.setdefault(channel, set()).add(writer)
+                else:
+                    self.subscribers.get(channel, set()).discard(writer)
+                count = sum(1 for writers in self.subscribers.values() if writer in writers)
+                reply += b"*3\r\n" + _bulk(name.lower().encode()) + _bulk(channel) + b":%d\r\n" % count
+            return reply
+        return b"-ERR unknown command '" + name.encode() + b"'\r\n"
+
+
+def _bulk(value):
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
@@ -0,0 +1,99 @@
+"""Records the MongoDB commands tests issue, for query budgets and COLLSCAN checks.
+
+The ``client`` fixture records every test's commands; when the test ends each
+recorded ``find`` and ``findAndModify`` is explained against the test database
+and the test fails if any winning plan scans a whole collection. Take the
+``queries`` fixture for budgets: ``with queries.at_most(3): await client.get(...)``
+fails if the block sends more than three commands.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+from pymongo import monitoring
+
+# Handshakes, authentication and session cleanup, not queries an endpoint issues
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "saslStart", "saslContinue", "endSessions", "killCursors"}
+# Commands whose filter is explained
+EXPLAINED_COMMANDS = {"find", "findAndModify"}
+# Session, transaction and routing fields that ``explain`` does not accept
+_UNEXPLAINABLE_FIELDS = {
+    "lsid", "txnNumber", "autocommit", "startTransaction", "$clusterTime",
+    "$db", "$readPreference", "readConcern", "writeConcern",
+}
+
+
+class QueryRecorder(monitoring.CommandListener):
+    """Keeps the commands started while ``recording`` is set."""
+
+    def __init__(self):
+        self.recording = False
+        self.commands: List[Dict[str, Any]] = []
+
+    def started(self, event):
+        if self.recording and event.command_name not in IGNORED_COMMANDS:
+            self.commands.append({
+                "name": event.command_name,
+                "database": event.database_name,
+                "command": dict(event.command),
+            })
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    @contextmanager
+    def at_most(self, budget: int, label: str = "block") -> Iterator[List[Dict[str, Any]]]:
+        """Fail if the commands sent inside the block exceed ``budget``; yields them."""
+        start = len(self.commands)
+        issued: List[Dict[str, Any]] = []
+        yield issued
+        issued.extend(self.commands[start:])
+        assert len(issued) <= budget, (
+            f"{label} sent {len(issued)} MongoDB commands, budget is {budget}:\n" + describe(issued)
+        )
+
+
+def describe(commands: List[Dict[str, Any]]) -> str:
+    return "\n".join(f"  {command['name']} {command['command'].get(command['name'])}" for command in commands)
+
+
+def collection_scans(explain: Dict[str, Any]) -> bool:
+    """Whether any winning plan in an ``explain`` result contains a ``COLLSCAN`` stage."""
+    def scans(node) -> bool:
+        if isinstance(node, dict):
+            return node.get("stage") == "COLLSCAN" or any(scans(value) for value in node.values())
+        if isinstance(node, list):
+            return any(scans(value) for value in node)
+        return False
+
+    def winning_plans(node) -> Iterator[Any]:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "winningPlan":
+                    yield value
+                else:
+                    yield from winning_plans(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from winning_plans(value)
+
+    return any(scans(plan) for plan in winning_plans(explain))
+
+
+async def find_collection_scans(database, commands: List[Dict[str, Any]]) -> List[str]:
+    """Explain each distinct recorded find on ``database``; describe those that scan a collection."""
+    scanned, seen = [], set()
+    for command in commands:
+        if command["name"] not in EXPLAINED_COMMANDS or command["database"] != database.name:
+            continue
+        body = {key: value for key, value in command["command"].items() if key not in _UNEXPLAINABLE_FIELDS}
+        query = body.get("filter", body.get("query"))
+        shape = repr((command["name"], body[command["name"]], query, body.get("sort"), body.get("collation")))
+        if shape in seen:
+            continue
+        seen.add(shape)
+        explain = await database.command({"explain": body, "verbosity": "queryPlanner"})
+        if collection_scans(explain):
+            scanned.append(f"  {command['name']} {body[command['name']]} {query}")
+    return scanned
@@ -0,0 +1,70 @@
+import asyncio
+
+
+class SlowProxy:
+    """TCP proxy that delays every reply from the upstream server by ``delay`` seconds.
+
+    Point a client at ``host:port`` to simulate a slow database; ``delay`` can
+    be changed while connections are open.
+    """
+
+    def __init__(self, upstream_host: str, upstream_port: int, delay: float = 0.0):
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.delay = delay
+        self.host = "127.0.0.1"
+        self.port = None
+        self._server = None
+        self._writers = set()
+        self._tasks = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        for writer in list(self._writers):
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+        # let the transports actually close their sockets
+        await asyncio.sleep(0)
+
+    async def _handle(self, client_reader, client_writer):
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host, self.upstream_port)
+        except OSError:
+            client_writer.close()
+            return
+        self._writers.update((client_writer, upstream_writer))
+        try:
+            await asyncio.gather(
+                self._pump(client_reader, upstream_writer, slow=False),
+                self._pump(upstream_reader, client_writer, slow=True),
+            )
+        except asyncio.CancelledError:
+            pass
+
+    async def _pump(self, reader, writer, slow: bool):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                if slow and self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
@@ -0,0 +1,107 @@
+import asyncio
+import time
+import pytest
+from httpx import AsyncClient
+from app.admission import admission_controller, bulkheads, classify, create_bulkheads, lag_monitor
+from app.admission.bulkhead import Bulkhead, BulkheadFull, BulkheadTimeout
+from app.admission.lag import LoopLagMonitor
+from app.admission.routes import ADMIN_READS, AUTH, DEFAULT, MENU_READS, ORDER_PLACEMENT, OPS_STATS, PROBES
+
+def test_classify_routes():
+    """Requests should map to the route class their priority is based on."""
+    assert classify("POST", "/orders/") == ORDER_PLACEMENT
+    assert classify("GET", "/orders/") == ADMIN_READS
+    assert classify("GET", "/users") == ADMIN_READS
+    assert classify("GET", "/pizzas/abc") == MENU_READS
+    assert classify("GET", "/admin/stats/load") == OPS_STATS
+    assert classify("GET", "/admin/stats/indexes") == ADMIN_READS
+    assert classify("GET", "/health") == PROBES
+    assert classify("POST", "/auth/") == AUTH
+    assert classify("POST", "/users/") == DEFAULT
+
+def test_bulkheads_fit_the_connection_pool(monkeypatch):
+    """Every database-backed class should get a bulkhead, together no larger than the Motor pool."""
+    limits = {name: bulkhead.max_concurrent for name, bulkhead in create_bulkheads(pool_size=40).items()}
+    assert set(limits) == {"order_placement", "menu_reads", "default", "auth", "admin_reads", "exports"}
+    assert sum(limits.values()) <= 40
+
+    monkeypatch.setenv("BULKHEAD_ORDER_PLACEMENT", "40,200,5")
+    with pytest.raises(ValueError, match="MONGO_MAX_POOL_SIZE"):
+        create_bulkheads(pool_size=40)
+    monkeypatch.setenv("BULKHEAD_MENU_READS", "0")
+    monkeypatch.setenv("BULKHEAD_DEFAULT", "0")
+    assert create_bulkheads(pool_size=60)["order_placement"].max_concurrent == 40
+
+@pytest.mark.asyncio
+async def test_monitor_measures_blocked_loop():
+    """Blocking the event loop should show up as lag in the monitor's histogram."""
+    monitor = LoopLagMonitor(interval=0.01)
+    await monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    
+    assert monitor.max_lag >= 0.05
+    histogram = monitor.histogram()
+    assert histogram["count"] >= 2
+    assert histogram["buckets"][-1]["count"] == histogram["count"]
+
+@pytest.mark.asyncio
+async def test_lag_sheds_admin_reads_but_not_order_placement(auth_client: AsyncClient, monkeypatch):
+    """Under moderate lag admin lists get 503 while menu reads and order placement go through."""
+    admission_controller.reset()
+    monkeypatch.setattr(lag_monitor, "lag", 0.2)
+    
+    response = await auth_client.get("/orders/")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    response = await auth_client.get("/pizzas/")
+    assert response.status_code == 200
+    response = await auth_client.post("/orders/", json={})
+    assert response.status_code != 503
+    
+    stats = (await auth_client.get("/admin/stats/load")).json()
+    assert stats["admission"]["routes"]["admin_reads"]["shed"] == 1
+    assert stats["admission"]["routes"]["order_placement"]["admitted"] == 1
+
+@pytest.mark.asyncio
+async def test_heavy_lag_sheds_normal_traffic(client: AsyncClient, monkeypatch):
+    """Under heavy lag only critical routes are served."""
+    monkeypatch.setattr(lag_monitor, "lag", 5.0)
+    
+    assert (await client.get("/pizzas/")).status_code == 503
+    assert (await client.get("/health")).status_code == 200
+
+@pytest.mark.asyncio
+async def test_bulkhead_queues_then_rejects():
+    """A full bulkhead should queue up to its limit, hand freed slots over in order and time out waiters."""
+    bulkhead = Bulkhead("admin_reads", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    await bulkhead.acquire()
+    waiter = asyncio.ensure_future(bulkhead.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(BulkheadFull):
+        await bulkhead.acquire()
+    
+    bulkhead.release()
+    await waiter
+    assert bulkhead.active == 1
+    with pytest.raises(BulkheadTimeout):
+        await bulkhead.acquire()
+    bulkhead.release()
+    stats = bulkhead.stats()
+    assert (stats["active"], stats["waiting"], stats["rejected"], stats["timeouts"]) == (0, 0, 1, 1)
+
+@pytest.mark.asyncio
+async def test_exhausted_bulkhead_does_not_affect_other_classes(auth_client: AsyncClient, monkeypatch):
+    """With the admin-reads bulkhead exhausted, menu reads and order placement still run."""
+    monkeypatch.setitem(bulkheads, "admin_reads", Bulkhead("admin_reads", max_concurrent=0, max_queue=0, queue_timeout=0.01))
+    
+    response = await auth_client.get("/users/")
+    assert response.status_code == 503
+    assert (await auth_client.get("/pizzas/")).status_code == 200
+    assert (await auth_client.post("/orders/", json={})).status_code != 503
+    
+    stats = (await auth_client.get("/admin/stats/load")).json()
+    assert stats["bulkheads"]["admin_reads"]["rejected"] == 1
+    assert stats["bulkheads"]["order_placement"]["active"] == 0
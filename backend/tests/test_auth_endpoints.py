@@ -0,0 +1,115 @@
+import pytest
+from httpx import AsyncClient
+from app.services.user_service import UserService
+
+async def _login(client: AsyncClient, email: str = "login@example.com", password: str = "secret123") -> dict:
+    user_data = {"name": "Login User", "email": email, "password": password}
+    await client.post("/users/", json=user_data)
+    response = await client.post("/auth/", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()
+
+@pytest.mark.asyncio
+async def test_login_returns_access_and_refresh_tokens(client: AsyncClient):
+    """Test that logging in issues both an access token and a refresh token."""
+    tokens = await _login(client)
+    
+    assert tokens["token_type"] == "bearer"
+    assert tokens["expires_in"] == 1800
+    assert tokens["access_token"]
+    assert tokens["refresh_token"]
+
+@pytest.mark.asyncio
+async def test_login_invalid_credentials(client: AsyncClient):
+    """Test that a wrong password is rejected."""
+    await _login(client)
+    response = await client.post("/auth/", json={"email": "login@example.com", "password": "wrong-password"})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_tokens_without_password_hashing(client: AsyncClient, monkeypatch):
+    """Test that refreshing issues a new pair and never runs the password hash."""
+    tokens = await _login(client)
+    
+    def fail_verify(*args, **kwargs):
+        raise AssertionError("refresh must not verify the password")
+    monkeypatch.setattr(UserService, "verify_password", fail_verify)
+    
+    response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    
+    refreshed = response.json()
+    assert refreshed["access_token"]
+    assert refreshed["refresh_token"] != tokens["refresh_token"]
+    
+    response = await client.get("/orders/", headers={"Authorization": f"Bearer {refreshed['access_token']}"})
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_family(client: AsyncClient):
+    """Test that reusing a rotated refresh token revokes every token in its family."""
+    tokens = await _login(client)
+    
+    first = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    rotated = first.json()["refresh_token"]
+    
+    reuse = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reuse.status_code == 401
+    
+    response = await client.post("/auth/refresh", json={"refresh_token": rotated})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_refresh_with_unknown_token(client: AsyncClient):
+    """Test that an unknown refresh token is rejected."""
+    response = await client.post("/auth/refresh", json={"refresh_token": "not-a-real-token"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid refresh token"
+
+@pytest.mark.asyncio
+async def test_deleting_user_revokes_their_tokens(auth_client: AsyncClient):
+    """Test that a deactivated user's access and refresh tokens stop working at once."""
+    tokens = await _login(auth_client, email="revoked@example.com")
+    user_headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = await auth_client.get("/orders/", headers=user_headers)
+    assert response.status_code == 200
+    
+    user = (await auth_client.get("/users/email/revoked@example.com")).json()
+    response = await auth_client.delete(f"/users/{user['_id']}")
+    assert response.status_code == 204
+    
+    response = await auth_client.get("/orders/", headers=user_headers)
+    assert response.status_code == 401
+    response = await auth_client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    response = await auth_client.post("/auth/", json={"email": "revoked@example.com", "password": "secret123"})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_and_refresh_tokens(client: AsyncClient):
+    """Test that logging out revokes the presented access token and refresh token."""
+    tokens = await _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    
+    response = await client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 204
+    
+    response = await client.get("/orders/", headers=headers)
+    assert response.status_code == 401
+    response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_revocations_reach_other_workers_by_polling(test_db):
+    """Test that a worker picks up revocations written by another one on its next sync."""
+    from app.auth.revocation import RevocationList
+    db, _ = test_db
+    worker_a, worker_b = RevocationList(), RevocationList()
+    await worker_b.sync(db)
+    
+    await worker_a.revoke_subject(db, "user-1")
+    assert not worker_b.is_revoked({"sub": "user-1", "iat": 0})
+    
+    await worker_b.sync(db)
+    assert worker_b.is_revoked({"sub": "user-1", "iat": 0})
+    assert not worker_b.is_revoked({"sub": "user-2", "iat": 0})
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from app.cache import MemoryCacheBackend
+from app.main import app
+from app.services.container import ServiceContainer
+from tests.fake_redis import FakeRedisServer
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used():
+    """The LRU should evict the entry that was used least recently."""
+    cache = MemoryCacheBackend(max_entries=2)
+    await cache.set("pizzas:a", 1)
+    await cache.set("pizzas:b", 2)
+    assert await cache.get("pizzas:a") == 1
+    await cache.set("pizzas:c", 3)
+    
+    assert await cache.get("pizzas:b") is None
+    assert await cache.get("pizzas:a") == 1
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl_and_namespace_invalidation():
+    """Entries should expire after their TTL and be dropped with their namespace."""
+    cache = MemoryCacheBackend()
+    await cache.set("tokens:short", {"sub": "1"}, ttl=0.01)
+    await cache.set("pizzas:page:1", ["margherita"])
+    await cache.set("extras:page:1", ["olives"])
+    await asyncio.sleep(0.02)
+    
+    assert await cache.get("tokens:short") is None
+    await cache.invalidate("pizzas")
+    assert await cache.get("pizzas:page:1") is None
+    assert await cache.get("extras:page:1") == ["olives"]
+    assert cache.stats()["expirations"] == 1
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    pytest.importorskip("redis")
+    server = await FakeRedisServer().start()
+    yield server
+    await server.stop()
+
+async def _redis_backend(url, local=True):
+    from app.cache import RedisCacheBackend
+    backend = RedisCacheBackend(url, local=MemoryCacheBackend() if local else None)
+    await backend.start()
+    return backend
+
+async def _eventually(predicate, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_redis_cache_round_trip_with_ttl(fake_redis):
+    """Values should round-trip through the Redis protocol and honour per-key TTLs."""
+    cache = await _redis_backend(fake_redis.url, local=False)
+    try:
+        await cache.set("pizzas:get_pizza_by_id:1", {"name": "Margherita"}, ttl=60)
+        await cache.set("tokens:abc", {"sub": "1"}, ttl=0.01)
+        await asyncio.sleep(0.02)
+        
+        assert await cache.get("pizzas:get_pizza_by_id:1") == {"name": "Margherita"}
+        assert await cache.get("tokens:abc") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    finally:
+        await cache.close()
+
+@pytest.mark.asyncio
+async def test_redis_invalidation_reaches_other_workers(fake_redis):
+    """Invalidating a namespace in one worker should drop local copies in the others."""
+    worker_a = await _redis_backend(fake_redis.url)
+    worker_b = await _redis_backend(fake_redis.url)
+    try:
+        await worker_a.set("pizzas:page:1", ["margherita"], ttl=60)
+        assert await worker_b.get("pizzas:page:1") == ["margherita"]
+        assert await worker_b.local.get("pizzas:page:1") == ["margherita"]
+        
+        await worker_a.invalidate("pizzas")
+        
+        async def dropped_locally():
+            return await worker_b.local.get("pizzas:page:1") is None
+        await _eventually(dropped_locally)
+        assert await worker_b.get("pizzas:page:1") is None
+        assert "SCAN" in fake_redis.commands
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+
+@pytest.mark.asyncio
+async def test_catalog_reads_are_cached_and_invalidated(auth_client: AsyncClient):
+    """Pizza reads should be served from cache until the pizza is updated."""
+    pizza_data = {"name": "Cached Pizza", "description": "Cache me", "price": "10.00"}
+    pizza = (await auth_client.post("/pizzas/", data=pizza_data)).json()
+    
+    await auth_client.get(f"/pizzas/{pizza['_id']}")
+    await auth_client.get(f"/pizzas/{pizza['_id']}")
+    stats = (await auth_client.get("/admin/stats/cache")).json()
+    assert stats["hits"] >= 1
+    
+    await auth_client.put(f"/pizzas/{pizza['_id']}", data={"price": "12.00"})
+    response = await auth_client.get(f"/pizzas/{pizza['_id']}")
+    assert response.json()["price"] == 12.00
+
+@pytest.mark.asyncio
+async def test_redis_cache_serves_catalog_pages(auth_client: AsyncClient, test_db, fake_redis):
+    """Pizza pages and pizzas, including ?fields= ones, should round-trip through the Redis cache."""
+    pizza = (await auth_client.post("/pizzas/", data={"name": "Redis Pizza", "description": "Pickled", "price": "10.00"})).json()
+    db, mongo_client = test_db
+    cache = await _redis_backend(fake_redis.url, local=False)
+    app.cache = cache
+    app.container = ServiceContainer(mongo_client, db, cache)
+    try:
+        for path in ("/pizzas/", "/pizzas/?fields=name,price", f"/pizzas/{pizza['_id']}", f"/pizzas/{pizza['_id']}?fields=name"):
+            first = await auth_client.get(path)
+            cached = await auth_client.get(path)
+            assert first.status_code == cached.status_code == 200
+            assert cached.json() == first.json()
+        assert cache.stats()["hits"] == 4
+        assert (await auth_client.get("/pizzas/?fields=name,price")).json()["items"] == [{"_id": pizza["_id"], "name": "Redis Pizza", "price": 10.0}]
+    finally:
+        await cache.close()
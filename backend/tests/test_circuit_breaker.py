@@ -0,0 +1,109 @@
+import pytest
+from httpx import AsyncClient
+from pymongo import _csot
+from pymongo.errors import ExecutionTimeout
+from app.db import CircuitBreaker, deadline, mongo_breaker, remaining_time
+from app.db.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+from app.services.order_service import OrderService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+def test_breaker_opens_after_threshold_and_recovers():
+    """Timeouts within the window should open the circuit; a success after the reset timeout closes it."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=3, window=10, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now += 11
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(5)
+    
+    clock.now += 5
+    assert breaker.state == HALF_OPEN
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 5
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["opened"] == 2
+
+def test_deadline_sets_driver_timeout():
+    """A deadline should set the driver's operation timeout, and nested ones can only shorten it."""
+    assert remaining_time() is None
+    with deadline(0.5):
+        assert 0 < remaining_time() <= 0.5
+        assert _csot.get_timeout() == 0.5
+        with deadline(10):
+            assert remaining_time() <= 0.5
+            assert _csot.remaining() <= 0.5
+    assert remaining_time() is None
+    assert _csot.get_timeout() is None
+
+@pytest.mark.asyncio
+async def test_requests_run_under_deadline(auth_client: AsyncClient, monkeypatch):
+    """Service calls made while handling a request should see the request deadline."""
+    monkeypatch.setenv("REQUEST_DEADLINE_SECONDS", "2")
+    seen = []
+    
+    async def get_all_orders(self, store_id, skip=0, limit=10, fields=None):
+        seen.append(remaining_time())
+        return [], 0
+    monkeypatch.setattr(OrderService, "get_all_orders", get_all_orders)
+    
+    response = await auth_client.get("/orders/")
+    assert response.status_code == 200
+    assert 0 < seen[0] <= 2
+
+@pytest.mark.asyncio
+async def test_timeouts_open_circuit_and_fail_fast(auth_client: AsyncClient, monkeypatch):
+    """Database timeouts should answer 503 and, past the threshold, stop reaching the database."""
+    monkeypatch.setattr(mongo_breaker, "failure_threshold", 2)
+    calls = []
+    
+    async def get_all_orders(self, store_id, skip=0, limit=10, fields=None):
+        calls.append(1)
+        raise ExecutionTimeout("operation exceeded time limit", 50)
+    monkeypatch.setattr(OrderService, "get_all_orders", get_all_orders)
+    
+    for _ in range(2):
+        response = await auth_client.get("/orders/")
+        assert response.status_code == 503
+    assert mongo_breaker.state == OPEN
+    
+    response = await auth_client.get("/orders/")
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+    assert len(calls) == 2
+    
+    stats = (await auth_client.get("/admin/stats/database")).json()
+    assert stats["circuit_breaker"]["rejected"] >= 1
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_cached_menu(auth_client: AsyncClient):
+    """While the circuit is open the menu should be served from the last cached copy."""
+    from app.main import app
+    pizza_data = {"name": "Stale Margherita", "description": "Classic", "price": "9.50"}
+    await auth_client.post("/pizzas/", data=pizza_data)
+    assert (await auth_client.get("/pizzas/")).json()["total"] == 1
+    # let the fresh entries expire; the fallback copies remain
+    await app.cache.invalidate("pizzas")
+    
+    for _ in range(mongo_breaker.failure_threshold):
+        mongo_breaker.record_failure()
+    response = await auth_client.get("/pizzas/")
+    assert response.status_code == 200
+    assert response.json()["items"][0]["name"] == "Stale Margherita"
+    
+    response = await auth_client.get("/pizzas/64b7f0f0f0f0f0f0f0f0f0f0")
+    assert response.status_code == 503
+    assert mongo_breaker.stats()["cache_fallbacks"] >= 1
@@ -0,0 +1,63 @@
+import pytest
+from pymongo import monitoring
+from app.db import pool_options
+from app.db.pool import PoolMetricsListener
+from tests.conftest import TEST_MONGODB_DB, TEST_MONGODB_URL
+
+ADDRESS = ("localhost", 27017)
+
+def test_pool_options_from_environment(monkeypatch):
+    """Pool sizes and timeouts should come from the MONGO_* variables."""
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "5")
+    monkeypatch.setenv("MONGO_MAX_IDLE_TIME_MS", "60000")
+    monkeypatch.setenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "1500")
+    assert pool_options() == {
+        "maxPoolSize": 50,
+        "minPoolSize": 5,
+        "maxIdleTimeMS": 60000,
+        "waitQueueTimeoutMS": 1500,
+    }
+
+def test_pool_listener_records_checkout_waits():
+    """Check-outs should be timed from start to checked-out, failures counted by reason."""
+    listener = PoolMetricsListener()
+    listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+    listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+    listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1))
+    listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+    listener.connection_check_out_failed(
+        monitoring.ConnectionCheckOutFailedEvent(ADDRESS, monitoring.ConnectionCheckOutFailedReason.TIMEOUT)
+    )
+    
+    stats = listener.stats()
+    assert stats["in_use"] == 1
+    assert stats["open"] == 1
+    assert stats["checkout_timeouts"] == 1
+    assert stats["checkout_wait_seconds"]["count"] == 2
+    
+    listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    assert listener.stats()["in_use"] == 0
+
+@pytest.mark.asyncio
+async def test_lifespan_builds_shared_services_on_a_warm_pool(monkeypatch):
+    """Startup should pre-open minPoolSize connections and build the services once."""
+    from app.main import app, lifespan
+    from app.db import pool_metrics
+    monkeypatch.setenv("MONGODB_URL", TEST_MONGODB_URL)
+    monkeypatch.setenv("MONGODB_DB", TEST_MONGODB_DB)
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "3")
+    created = pool_metrics.stats()["connections_created"]
+    
+    try:
+        async with lifespan(app):
+            await app.warmup
+            assert pool_metrics.stats()["connections_created"] - created >= 3
+            container = app.container
+            assert container.pizzas.database is app.mongodb
+            assert container.orders.client is app.mongodb_client
+            assert container.pizzas.cache is app.cache
+    finally:
+        for name in ("mongodb_client", "mongodb", "cache", "rate_limit_store", "container", "warmup"):
+            if hasattr(app, name):
+                delattr(app, name)
@@ -297,3 +297,17 @@ async def test_delete_extra_invalid_object_id(auth_client: AsyncClient):
     
     error_detail = response.json()
     assert "Invalid Id" in error_detail["detail"]
+
+@pytest.mark.asyncio
+async def test_get_extras_sparse_fields(auth_client: AsyncClient):
+    """Test that ?fields= returns only the requested extra fields."""
+    create_response = await auth_client.post("/extras/", json={"name": "Olives", "price": 1.25})
+    extra = create_response.json()
+    
+    response = await auth_client.get("/extras/?fields=name")
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"_id": extra["_id"], "name": "Olives"}]
+    
+    response = await auth_client.get(f"/extras/{extra['_id']}?fields=price")
+    assert response.status_code == 200
+    assert response.json() == {"_id": extra["_id"], "price": 1.25}
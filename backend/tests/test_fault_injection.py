@@ -0,0 +1,95 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from pymongo.uri_parser import parse_uri
+from app.db import create_client, mongo_breaker
+from app.db.circuit_breaker import OPEN
+from tests.conftest import TEST_MONGODB_DB, TEST_MONGODB_URL
+from app.services.container import ServiceContainer
+from tests.slow_proxy import SlowProxy
+
+@pytest_asyncio.fixture
+async def slow_database(client, monkeypatch):
+    """Route the app's database traffic through a proxy whose delay the test controls."""
+    from app.main import app
+    parsed = parse_uri(TEST_MONGODB_URL)
+    host, port = parsed["nodelist"][0]
+    proxy = await SlowProxy(host, port).start()
+    proxied_client = create_client(
+        f"mongodb://{proxy.host}:{proxy.port}",
+        username=parsed["username"],
+        password=parsed["password"],
+        directConnection=True,
+    )
+    app.mongodb_client = proxied_client
+    app.mongodb = proxied_client[TEST_MONGODB_DB]
+    app.container = ServiceContainer(proxied_client, app.mongodb, app.cache)
+    monkeypatch.setenv("REQUEST_DEADLINE_SECONDS", "0.5")
+    yield proxy
+    # close() blocks the loop the proxy runs on, so stop the proxy first
+    await proxy.stop()
+    proxied_client.close()
+
+@pytest.mark.asyncio
+async def test_slow_proxy_delays_replies():
+    """The proxy should hold back every reply by its delay."""
+    async def echo(reader, writer):
+        writer.write(await reader.read(100))
+        await writer.drain()
+        writer.close()
+    server = await asyncio.start_server(echo, "127.0.0.1", 0)
+    proxy = await SlowProxy("127.0.0.1", server.sockets[0].getsockname()[1], delay=0.2).start()
+    
+    reader, writer = await asyncio.open_connection(proxy.host, proxy.port)
+    started = time.perf_counter()
+    writer.write(b"ping")
+    assert await reader.read(100) == b"ping"
+    assert time.perf_counter() - started >= 0.2
+    writer.close()
+    await proxy.stop()
+    server.close()
+
+@pytest.mark.asyncio
+async def test_slow_database_fails_at_request_deadline(auth_client: AsyncClient, slow_database):
+    """A request against a database slower than the deadline should get 503 once the deadline passes."""
+    assert (await auth_client.get("/orders/")).status_code == 200
+    
+    slow_database.delay = 3.0
+    started = time.perf_counter()
+    response = await auth_client.get("/orders/")
+    assert response.status_code == 503
+    assert time.perf_counter() - started < 2.0
+
+@pytest.mark.asyncio
+async def test_slow_database_fails_user_lookups_and_login_with_503(auth_client: AsyncClient, slow_database):
+    """A slow database should surface as 503, not as a missing user or invalid credentials."""
+    credentials = {"email": "slow@example.com", "password": "secret123"}
+    user = (await auth_client.post("/users/", json={"name": "Slow User", **credentials})).json()
+    
+    slow_database.delay = 3.0
+    assert (await auth_client.get(f"/users/{user['_id']}")).status_code == 503
+    assert (await auth_client.post("/auth/", json=credentials)).status_code == 503
+
+@pytest.mark.asyncio
+async def test_slow_database_opens_circuit_and_serves_cached_menu(auth_client: AsyncClient, slow_database, monkeypatch):
+    """Repeated timeouts should open the circuit: orders fail fast, the menu comes from cache."""
+    from app.main import app
+    monkeypatch.setattr(mongo_breaker, "failure_threshold", 2)
+    pizza_data = {"name": "Proxy Pepperoni", "description": "Spicy", "price": "11.00"}
+    assert (await auth_client.post("/pizzas/", data=pizza_data)).status_code == 200
+    assert (await auth_client.get("/pizzas/")).json()["total"] == 1
+    await app.cache.invalidate("pizzas")
+    
+    slow_database.delay = 3.0
+    for _ in range(2):
+        assert (await auth_client.get("/orders/")).status_code == 503
+    assert mongo_breaker.state == OPEN
+    
+    started = time.perf_counter()
+    assert (await auth_client.get("/orders/")).status_code == 503
+    assert time.perf_counter() - started < 0.2
+    response = await auth_client.get("/pizzas/")
+    assert response.status_code == 200
+    assert response.json()["items"][0]["name"] == "Proxy Pepperoni"
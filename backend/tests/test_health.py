@@ -0,0 +1,96 @@
+import pytest
+from httpx import AsyncClient
+from app.health import Readiness, readiness, warm_cache
+
+class CountingDatabase:
+    """Stands in for a Motor database, counting (or failing) pings."""
+    def __init__(self, fail=False):
+        self.pings = 0
+        self.fail = fail
+
+    async def command(self, name):
+        self.pings += 1
+        if self.fail:
+            raise ConnectionError("connection refused")
+        return {"ok": 1}
+
+@pytest.mark.asyncio
+async def test_liveness_is_unconditional(client: AsyncClient):
+    """Liveness should answer even before warmup has run."""
+    readiness.reset()
+    for path in ("/health", "/health/live"):
+        response = await client.get(path)
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+
+@pytest.mark.asyncio
+async def test_ready_only_after_warmup(client: AsyncClient):
+    """Readiness should be 503 until every warmup step is done, then 200."""
+    readiness.reset()
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["mongo"]["ok"] is True
+
+    steps = []
+    async def step():
+        steps.append(1)
+    await readiness.warm_up({"pool": step, "indexes": step, "cache": step})
+    readiness._ping = None
+    response = await client.get("/health/ready")
+    data = response.json()
+    assert response.status_code == 200
+    assert data["ready"] is True
+    assert {name: state["status"] for name, state in data["warmup"].items()} == {
+        "pool": "done", "indexes": "done", "cache": "done",
+    }
+    assert "open" in data["pool"]
+    assert data["circuit_breaker"] == "closed"
+    readiness.reset()
+
+@pytest.mark.asyncio
+async def test_warmup_retries_failed_steps():
+    """A failing step should be retried, and later steps wait for it."""
+    state = Readiness()
+    attempts = []
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("not yet")
+    order = []
+    async def after():
+        order.append(len(attempts))
+    await state.warm_up({"indexes": flaky, "cache": after}, retry_interval=0)
+
+    assert state.warmed_up
+    assert state.steps["indexes"]["attempts"] == 2
+    assert "error" not in state.steps["indexes"]
+    assert order == [3]
+
+@pytest.mark.asyncio
+async def test_ping_is_cached():
+    """Probes within the cache interval should share one ping; failures make the worker unready."""
+    state = Readiness(ping_ttl=60)
+    database = CountingDatabase()
+    for _ in range(5):
+        assert (await state.ping(database))["ok"] is True
+    assert database.pings == 1
+
+    async def noop():
+        pass
+    await state.warm_up({"pool": noop})
+    down = Readiness(ping_ttl=60)
+    down.steps = state.steps
+    report = await down.check(CountingDatabase(fail=True))
+    assert report["ready"] is False
+    assert "connection refused" in report["mongo"]["error"]
+
+@pytest.mark.asyncio
+async def test_warm_cache_fills_catalog_pages(client: AsyncClient):
+    """Warming should cache the menu pages the frontend requests first."""
+    from app.main import app
+    await warm_cache(app.container)
+    sets = app.cache.stats()["sets"]
+
+    response = await client.get("/pizzas/?page=1&limit=9")
+    assert response.status_code == 200
+    assert app.cache.stats()["sets"] == sets
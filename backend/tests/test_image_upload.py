@@ -0,0 +1,177 @@
+import asyncio
+import io
+import threading
+import time
+import pytest
+from httpx import AsyncClient
+from starlette.datastructures import Headers, UploadFile
+from app.middleware.upload_limit_middleware import MULTIPART_OVERHEAD_BYTES, UploadLimitMiddleware
+from app.storage import IMMUTABLE_CACHE_CONTROL, FirebaseStorage, ImageTooLarge
+
+class FakeBlob:
+    def __init__(self, bucket, name, chunk_size):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = chunk_size
+        self.cache_control = None
+        self.public_url = f"https://storage.example.com/{name}"
+
+    def exists(self, timeout=None):
+        return self.name in self.bucket.names
+
+    def upload_from_file(self, file_obj, size=None, content_type=None, predefined_acl=None,
+                         if_generation_match=None, timeout=None):
+        bucket = self.bucket
+        with bucket.lock:
+            bucket.running += 1
+            bucket.peak = max(bucket.peak, bucket.running)
+        try:
+            time.sleep(bucket.delay)
+            bucket.uploads.append({
+                "thread": threading.get_ident(),
+                "file": file_obj,
+                "size": size,
+                "chunk_size": self.chunk_size,
+                "acl": predefined_acl,
+                "if_generation_match": if_generation_match,
+                "cache_control": self.cache_control,
+                "data": file_obj.read(),
+            })
+            bucket.names.add(self.name)
+        finally:
+            with bucket.lock:
+                bucket.running -= 1
+
+class FakeBucket:
+    """Records uploads and how many ran at once; each upload blocks for ``delay`` seconds."""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = self.peak = 0
+        self.uploads = []
+        self.names = set()
+
+    def blob(self, name, chunk_size=None):
+        return FakeBlob(self, name, chunk_size)
+
+def _image(data: bytes, name: str = "pizza.jpg") -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=len(data), filename=name, headers=Headers({"content-type": "image/jpeg"}))
+
+@pytest.mark.asyncio
+async def test_upload_streams_the_spooled_file_off_the_event_loop():
+    """Uploads should read the request's own file object on a worker thread, in one request when small."""
+    bucket = FakeBucket()
+    service = FirebaseStorage(bucket=bucket, max_concurrent=2, chunk_size=256 * 1024)
+    image = _image(b"small image")
+
+    url = await service.upload_image(image)
+
+    upload = bucket.uploads[0]
+    assert url.startswith("https://storage.example.com/images/") and url.endswith(".jpg")
+    assert upload["file"] is image.file
+    assert upload["thread"] != threading.get_ident()
+    assert upload["size"] == len(b"small image") and upload["data"] == b"small image"
+    assert upload["acl"] == "publicRead"
+    assert upload["if_generation_match"] == 0
+    assert upload["cache_control"] == IMMUTABLE_CACHE_CONTROL
+    service.close()
+
+@pytest.mark.asyncio
+async def test_large_images_use_chunked_resumable_upload():
+    """Images bigger than one chunk should be sent without a size, i.e. resumable in chunk_size pieces."""
+    bucket = FakeBucket()
+    service = FirebaseStorage(bucket=bucket, chunk_size=300 * 1024)
+    await service.upload_image(_image(b"x" * (600 * 1024)))
+
+    upload = bucket.uploads[0]
+    assert upload["size"] is None
+    assert upload["chunk_size"] == 256 * 1024
+    service.close()
+
+@pytest.mark.asyncio
+async def test_oversized_image_is_rejected_before_uploading():
+    """An image over the cap should raise ImageTooLarge and never reach the bucket."""
+    bucket = FakeBucket()
+    service = FirebaseStorage(bucket=bucket, max_bytes=10)
+    with pytest.raises(ImageTooLarge):
+        await service.upload_image(_image(b"x" * 11))
+    assert bucket.uploads == []
+    assert service.metrics.stats()["too_large"] == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads_are_capped_and_timed():
+    """No more than max_concurrent uploads should run at once, while the loop stays responsive."""
+    bucket = FakeBucket(delay=0.05)
+    service = FirebaseStorage(bucket=bucket, max_concurrent=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    urls = await asyncio.gather(*(service.upload_image(_image(b"img %d" % i)) for i in range(6)))
+    task.cancel()
+
+    assert all(urls) and bucket.peak == 2
+    assert ticks >= 10
+    stats = service.metrics.stats()
+    assert stats["uploaded"] == 6 and stats["bytes"] == 30
+    assert stats["in_flight"] == 0 and stats["waiting"] == 0
+    assert stats["duration_seconds"]["count"] == 6
+    service.close()
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_counted():
+    """A storage error should return no URL and count as a failure."""
+    class BrokenBucket(FakeBucket):
+        def blob(self, name, chunk_size=None):
+            raise ConnectionError("storage unavailable")
+
+    service = FirebaseStorage(bucket=BrokenBucket())
+    assert await service.upload_image(_image(b"img")) is None
+    assert service.metrics.stats()["failed"] == 1
+    service.close()
+
+@pytest.mark.asyncio
+async def test_oversized_multipart_body_is_rejected(auth_client: AsyncClient, monkeypatch):
+    """A pizza upload whose body is over the cap should get 413 before the endpoint runs."""
+    monkeypatch.setenv("MAX_IMAGE_UPLOAD_BYTES", "1000")
+    data = {"name": "Huge", "description": "Too big", "price": "10.99"}
+    files = {"image": ("huge.jpg", b"x" * (MULTIPART_OVERHEAD_BYTES + 2000), "image/jpeg")}
+    response = await auth_client.post("/pizzas/", data=data, files=files)
+    assert response.status_code == 413
+    assert (await auth_client.get("/pizzas/")).json()["total"] == 0
+
+@pytest.mark.asyncio
+async def test_chunked_body_is_cut_off_once_over_the_cap():
+    """Without Content-Length the body should be refused as soon as it passes the cap."""
+    chunks = [b"x" * 1024] * 100
+    read = 0
+
+    async def app(scope, receive, send):
+        nonlocal read
+        while True:
+            message = await receive()
+            read += 1
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        body = chunks.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    sent = []
+    async def send(message):
+        sent.append(message)
+
+    middleware = UploadLimitMiddleware(app, max_bytes=0)
+    scope = {"type": "http", "headers": [(b"content-type", b"multipart/form-data; boundary=x")]}
+    await middleware(scope, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert read <= MULTIPART_OVERHEAD_BYTES // 1024 + 1
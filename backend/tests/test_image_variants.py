@@ -0,0 +1,122 @@
+import asyncio
+from io import BytesIO
+import pytest
+from bson import ObjectId
+from httpx import AsyncClient
+from PIL import Image
+from app.images import VARIANTS, VariantPool, drain_variant_jobs, render_variants, variants
+from app.images.regenerate import regenerate_variants
+from app.services.pizza_service import PizzaService
+from app.storage import MemoryStorage
+
+def _jpeg(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 60, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+def test_render_variants_sizes_and_formats():
+    """Every variant should be rendered as WebP and JPEG, bounded by its size and never upscaled."""
+    rendered = render_variants(_jpeg(3000, 2000))
+    assert set(rendered) == set(VARIANTS)
+    for name, side in VARIANTS.items():
+        with Image.open(BytesIO(rendered[name]["jpeg"])) as image:
+            assert max(image.size) == side and image.format == "JPEG"
+        with Image.open(BytesIO(rendered[name]["webp"])) as image:
+            assert max(image.size) == side and image.format == "WEBP"
+
+    small = render_variants(_jpeg(120, 80))
+    with Image.open(BytesIO(small["hero"]["jpeg"])) as image:
+        assert image.size == (120, 80)
+
+@pytest.mark.asyncio
+async def test_variant_pool_renders_in_another_process():
+    """Rendering should run in the process pool while the event loop keeps ticking."""
+    pool = VariantPool(processes=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    try:
+        rendered = await pool.render(_jpeg(2400, 1800))
+    finally:
+        task.cancel()
+        pool.close()
+    assert set(rendered) == set(VARIANTS)
+    assert ticks > 5
+    assert pool.stats()["rendered"] == 1
+
+@pytest.mark.asyncio
+async def test_create_pizza_with_image_gets_variants(auth_client: AsyncClient):
+    """Creating a pizza with an image should record variant URLs once the background render finishes."""
+    data = {"name": "Photo Pizza", "description": "From a phone", "price": "12.50"}
+    files = {"image": ("photo.jpg", _jpeg(1600, 1200), "image/jpeg")}
+    response = await auth_client.post("/pizzas/", data=data, files=files)
+    assert response.status_code == 200
+    pizza_id = response.json()["_id"]
+
+    await drain_variant_jobs()
+    pizza = (await auth_client.get(f"/pizzas/{pizza_id}")).json()
+    assert set(pizza["image_variants"]) == set(VARIANTS)
+    assert pizza["image_variants"]["card"]["webp"].endswith(".webp")
+    assert pizza["image_url"].startswith("/images/")
+
+@pytest.mark.asyncio
+async def test_variants_are_stored_after_the_request_deadline(auth_client: AsyncClient, monkeypatch):
+    """Rendering outlasting the request's deadline should not stop the variants from being recorded."""
+    monkeypatch.setenv("REQUEST_DEADLINE_SECONDS", "0.2")
+    async def slow_store_variants(storage, data):
+        await asyncio.sleep(0.4)
+        return {"card": {"jpeg": "/images/card.jpg"}}
+    monkeypatch.setattr(variants, "store_variants", slow_store_variants)
+
+    data = {"name": "Slow Photo Pizza", "description": "Big photo", "price": "12.50"}
+    files = {"image": ("photo.jpg", _jpeg(64, 64), "image/jpeg")}
+    pizza_id = (await auth_client.post("/pizzas/", data=data, files=files)).json()["_id"]
+
+    await drain_variant_jobs()
+    pizza = (await auth_client.get(f"/pizzas/{pizza_id}")).json()
+    assert pizza["image_variants"] == {"card": {"jpeg": "/images/card.jpg"}}
+
+@pytest.mark.asyncio
+async def test_variants_of_a_replaced_image_are_discarded(test_db):
+    """Variants rendered from an image the pizza no longer has should not be recorded."""
+    db, _ = test_db
+    service = PizzaService(db)
+    pizza_id = ObjectId()
+    await db.pizzas.insert_one({"_id": pizza_id, "store_id": "main", "name": "Swap", "image_url": "https://new.jpg"})
+
+    assert not await service.set_image_variants("main", pizza_id, "https://old.jpg", {"card": {"jpeg": "old"}})
+    assert await service.set_image_variants("main", pizza_id, "https://new.jpg", {"card": {"jpeg": "new"}})
+    assert (await db.pizzas.find_one({"_id": pizza_id}))["image_variants"] == {"card": {"jpeg": "new"}}
+
+@pytest.mark.asyncio
+async def test_regenerate_backfills_pizzas_without_variants(test_db):
+    """The regeneration command should fill in missing variants and leave done pizzas alone."""
+    db, _ = test_db
+    await db.pizzas.insert_many([
+        {"store_id": "main", "name": "Old", "image_url": "https://images.example.com/old.jpg"},
+        {"store_id": "main", "name": "Done", "image_url": "https://images.example.com/done.jpg",
+         "image_variants": {"card": {"jpeg": "https://done"}}},
+        {"store_id": "main", "name": "No image"},
+    ])
+    fetched = []
+
+    async def fetch(url):
+        fetched.append(url)
+        return _jpeg(800, 600)
+
+    storage = MemoryStorage()
+    counts = await regenerate_variants(PizzaService(db), storage, fetch)
+    assert counts == {"updated": 1, "failed": 0, "skipped": 0}
+    assert fetched == ["https://images.example.com/old.jpg"]
+    old = await db.pizzas.find_one({"name": "Old"})
+    assert set(old["image_variants"]) == set(VARIANTS)
+    assert len(storage.blobs) == len(VARIANTS) * 2
+
+    again = await regenerate_variants(PizzaService(db), storage, fetch)
+    assert again == {"updated": 0, "failed": 0, "skipped": 0}
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Cumulative import time of app.main; every worker pays it on boot
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+# Optional dependencies that must only load when their feature is used
+LAZY_MODULES = ("firebase_admin", "google.cloud.storage", "grpc", "redis", "PIL")
+
+def _import_app(*flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", "import sys, app.main; print(','.join(sorted(sys.modules)))"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+def _cumulative_ms(importtime_output: str, module: str) -> float:
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+def test_heavy_optional_dependencies_load_lazily():
+    """Importing the app should not import Firebase, Google Cloud, gRPC, Redis or Pillow."""
+    loaded = set(_import_app().stdout.strip().split(","))
+    assert not loaded.intersection(LAZY_MODULES)
+
+def test_app_import_time_within_budget():
+    """Importing app.main should stay within IMPORT_TIME_BUDGET_MS (-X importtime)."""
+    _import_app()  # compile bytecode first so only the import itself is measured
+    elapsed_ms = _cumulative_ms(_import_app("-X", "importtime").stderr, "app.main")
+    assert elapsed_ms < IMPORT_TIME_BUDGET_MS, (
+        f"importing app.main took {elapsed_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms); "
+        f"run `python -X importtime -c 'import app.main'` to find the slow import"
+    )
@@ -0,0 +1,65 @@
+import pytest
+from httpx import AsyncClient
+from app.db import INDEXES, IndexReconciler, index_usage, reconcile_indexes
+
+async def _index_names(collection):
+    return {index["name"] async for index in collection.list_indexes()}
+
+@pytest.mark.asyncio
+async def test_reconcile_creates_registry_indexes_once(test_db):
+    """Reconciling should create every registry index, then find nothing left to do."""
+    db, _ = test_db
+    report = await reconcile_indexes(db)
+    assert "idx_pizzas_store_available_partial" in report["pizzas"]["created"]
+    for collection, models in INDEXES.items():
+        assert {model.document["name"] for model in models} <= await _index_names(db[collection])
+
+    partial = [index async for index in db.pizzas.list_indexes() if index["name"] == "idx_pizzas_store_available_partial"]
+    assert partial[0]["partialFilterExpression"] == {"available": True}
+
+    again = await reconcile_indexes(db)
+    assert all(not changes["created"] and not changes["conflicting"] for changes in again.values())
+
+@pytest.mark.asyncio
+async def test_reconcile_drops_retired_and_reports_unknown(test_db):
+    """Retired indexes should be dropped and indexes outside the registry only reported."""
+    db, _ = test_db
+    await db.pizzas.create_index([("available", 1)], name="idx_pizzas_available")
+    await db.pizzas.create_index([("price", 1)], name="idx_pizzas_price")
+
+    report = await reconcile_indexes(db)
+    assert report["pizzas"]["dropped"] == ["idx_pizzas_available"]
+    assert report["pizzas"]["unknown"] == ["idx_pizzas_price"]
+    names = await _index_names(db.pizzas)
+    assert "idx_pizzas_available" not in names
+    assert "idx_pizzas_price" in names
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_without_changes(test_db):
+    """A dry run (startup reconciliation disabled) should list missing indexes and create none."""
+    db, _ = test_db
+    reconciler = IndexReconciler()
+    await reconciler.run(db, dry_run=True)
+
+    stats = reconciler.stats()
+    assert stats["status"] == "checked"
+    assert "uniq_users_email_ci" in stats["collections"]["users"]["missing"]
+    assert "uniq_users_email_ci" not in await _index_names(db.users)
+
+@pytest.mark.asyncio
+async def test_index_usage_hints(client: AsyncClient, test_db):
+    """The admin report should show $indexStats access counts and flag unused indexes."""
+    db, _ = test_db
+    await reconcile_indexes(db)
+    await db.pizzas.insert_one({"store_id": "main", "name": "Margherita", "available": True})
+    await db.pizzas.find_one({"store_id": "main", "available": True}, hint="idx_pizzas_store_available_partial")
+
+    usage = await index_usage(db)
+    assert usage["pizzas"]["indexes"]["idx_pizzas_store_available_partial"]["ops"] >= 1
+    hints = {(hint["index"], hint["hint"]) for hint in usage["orders"]["hints"]}
+    assert ("idx_orders_store_user_id_created_at_desc", "unused") in hints
+    assert not any(hint["index"] == "uniq_pizzas_store_name_ci" for hint in usage["pizzas"]["hints"])
+
+    response = await client.get("/admin/stats/indexes")
+    assert response.status_code == 200
+    assert "pizzas" in response.json()["usage"]
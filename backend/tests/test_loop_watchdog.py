@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+import pytest
+from httpx import AsyncClient
+from app.metrics import EVENT_LOOP_BLOCKED_SECONDS
+from app.profiling import LoopWatchdog, loop_watchdog
+from app.main import app
+from app.services.user_service import UserService
+
+def hold_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+@pytest.mark.asyncio
+async def test_watchdog_reports_the_blocking_stack_route_and_duration():
+    """A callback holding the loop past the threshold should be reported with its stack, request and duration."""
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.005)
+    before = EVENT_LOOP_BLOCKED_SECONDS.labels("GET", "/slow")._sum.get()
+    await watchdog.start()
+    with watchdog.request("GET", "/slow"):
+        await asyncio.sleep(0.02)
+        hold_the_loop(0.2)
+    await asyncio.sleep(0.02)
+    await watchdog.stop()
+
+    [block] = watchdog.stats()["recent"]
+    assert (block["method"], block["route"]) == ("GET", "/slow")
+    assert 150 <= block["duration_ms"] < 1000
+    assert "in hold_the_loop" in block["stack"]
+    assert EVENT_LOOP_BLOCKED_SECONDS.labels("GET", "/slow")._sum.get() - before >= 0.15
+
+@pytest.mark.asyncio
+async def test_short_callbacks_are_not_reported():
+    """Awaiting and brief synchronous work should stay under the threshold."""
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.005)
+    await watchdog.start()
+    for _ in range(10):
+        hold_the_loop(0.005)
+        await asyncio.sleep(0.01)
+    await watchdog.stop()
+    assert watchdog.blocks == 0
+
+@pytest.mark.asyncio
+async def test_blocking_endpoint_is_attributed_to_its_route(auth_client: AsyncClient, monkeypatch):
+    """A blocking handler should be blamed on its route template, and would fail the test via the client fixture."""
+    async def blocking_get(store_id, pizza_id, fields=None):
+        hold_the_loop(0.3)
+        return None
+    monkeypatch.setattr(app.container.pizzas, "get_pizza_by_id", blocking_get)
+
+    response = await auth_client.get("/pizzas/65a1b2c3d4e5f6a7b8c9d0e1")
+    await asyncio.sleep(0.05)
+
+    assert response.status_code == 404
+    [block] = loop_watchdog.recent
+    assert (block["method"], block["route"]) == ("GET", "/pizzas/{pizza_id}")
+    assert "in blocking_get" in block["stack"]
+    # Reported as expected; clear it so the client fixture's budget check passes
+    loop_watchdog.reset()
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_off_the_loop(client: AsyncClient, monkeypatch):
+    """Registering and logging in should run PBKDF2 in a worker thread, not on the event loop."""
+    threads = []
+    for name in ("get_hashed_password", "verify_password"):
+        def on_thread(self, *args, _original=getattr(UserService, name)):
+            threads.append(threading.get_ident())
+            return _original(self, *args)
+        monkeypatch.setattr(UserService, name, on_thread)
+
+    credentials = {"email": "hash@example.com", "password": "correct-horse"}
+    assert (await client.post("/users/", json={"name": "Hash", **credentials})).status_code == 200
+    assert (await client.post("/auth/", json=credentials)).status_code == 200
+    assert len(threads) == 2 and threading.get_ident() not in threads
@@ -0,0 +1,127 @@
+import re
+from types import SimpleNamespace
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from app.db.pool import PoolMetricsListener
+from app.metrics import MetricsCommandListener
+from app.middleware.metrics_middleware import MetricsMiddleware
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def _command(name: str, command: dict, request_id: int = 1, micros: int = 0):
+    return SimpleNamespace(
+        command_name=name,
+        command=command,
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+        duration_micros=micros,
+    )
+
+@pytest.mark.asyncio
+async def test_requests_are_counted_by_route_template(client: AsyncClient):
+    """Requests should be labelled by route template and status, and exposed on /metrics."""
+    route = "/pizzas/{pizza_id}"
+    before = _sample("http_requests_total", method="GET", route=route, status="404")
+    for _ in range(2):
+        await client.get(f"/pizzas/{'a' * 24}")
+    await client.get("/no-such-page")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert _sample("http_requests_total", method="GET", route=route, status="404") == before + 2
+    assert _sample("http_request_duration_seconds_count", method="GET", route=route) >= 2
+    assert _sample("http_requests_in_progress", method="GET", route=route) == 0
+    assert 'route="unmatched"' in response.text
+    assert "/no-such-page" not in response.text
+
+@pytest.mark.asyncio
+async def test_server_timing_splits_database_and_app_time():
+    """Database time reported by the command listener should show up as the db entry."""
+    listener = MetricsCommandListener()
+
+    async def app(scope, receive, send):
+        listener.started(_command("find", {"find": "pizzas"}))
+        listener.succeeded(_command("find", {}, micros=40_000))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+    async def send(message):
+        sent.append(message)
+
+    await MetricsMiddleware(app)({"type": "http", "method": "GET", "path": "/"}, None, send)
+
+    header = dict(sent[0]["headers"])[b"server-timing"].decode()
+    timings = {name: float(value) for name, value in re.findall(r"(\w+);dur=([\d.]+)", header)}
+    assert timings["db"] == 40.0
+    assert "(1 commands)" in header
+    assert timings["app"] == pytest.approx(max(0.0, timings["total"] - 40.0), abs=0.2)
+
+@pytest.mark.asyncio
+async def test_responses_carry_server_timing(client: AsyncClient):
+    """Every API response should carry a Server-Timing header."""
+    response = await client.get("/pizzas/")
+    assert re.match(r'db;dur=[\d.]+;desc="MongoDB \(\d+ commands\)", app;dur=[\d.]+, total;dur=[\d.]+',
+                    response.headers["server-timing"])
+
+def test_command_latency_is_recorded_per_collection_and_command():
+    """Succeeded and failed commands should be timed by collection and command name."""
+    listener = MetricsCommandListener()
+    before = _sample("mongodb_command_duration_seconds_count", collection="orders", command="insert")
+    failures = _sample("mongodb_command_failures_total", collection="orders", command="getMore")
+
+    listener.started(_command("insert", {"insert": "orders"}, request_id=7))
+    listener.succeeded(_command("insert", {}, request_id=7, micros=2_000))
+    listener.started(_command("getMore", {"getMore": 123, "collection": "orders"}, request_id=8))
+    listener.failed(_command("getMore", {}, request_id=8, micros=1_000))
+    listener.started(_command("ping", {"ping": 1}, request_id=9))
+    listener.succeeded(_command("ping", {}, request_id=9))
+
+    assert _sample("mongodb_command_duration_seconds_count", collection="orders", command="insert") == before + 1
+    assert _sample("mongodb_command_failures_total", collection="orders", command="getMore") == failures + 1
+    assert _sample("mongodb_command_duration_seconds_count", collection="none", command="ping") >= 1
+    assert listener._collections == {}
+
+def test_pool_listener_records_checkout_waits_and_connections():
+    """One pool listener should feed both its own stats and the Prometheus series."""
+    listener = PoolMetricsListener()
+    waits = _sample("mongodb_pool_checkout_wait_seconds_count")
+    in_use = _sample("mongodb_pool_connections", state="in_use")
+
+    listener.connection_created(None)
+    listener.connection_check_out_started(None)
+    listener.connection_checked_out(None)
+    assert _sample("mongodb_pool_connections", state="in_use") == in_use + 1
+    listener.connection_checked_in(None)
+    listener.connection_check_out_started(None)
+    listener.connection_check_out_failed(SimpleNamespace(reason="timeout"))
+
+    stats = listener.stats()
+    assert stats["checkout_wait_seconds"]["count"] == 2
+    assert stats["open"] == 1 and stats["in_use"] == 0 and stats["checkout_timeouts"] == 1
+    assert _sample("mongodb_pool_checkout_wait_seconds_count") == waits + 2
+    assert _sample("mongodb_pool_connections", state="in_use") == in_use
+    assert _sample("mongodb_pool_checkout_failures_total", reason="timeout") >= 1
+
+@pytest.mark.asyncio
+async def test_order_placement_updates_business_counters(auth_client: AsyncClient):
+    """Placed orders should count orders, pizzas and value per store; rejected ones as failures."""
+    pizza = (await auth_client.post("/pizzas/", data={"name": "Counted", "description": "d", "price": "10.00"})).json()
+    placed = _sample("orders_placed_total", store="main")
+    items = _sample("order_items_total", store="main")
+    value = _sample("order_value_total", store="main")
+    rejected = _sample("order_failures_total", reason="rejected")
+    order = {"customer_name": "Ada", "customer_email": "ada@example.com", "customer_address": "1 Main St"}
+
+    response = await auth_client.post("/orders/", json={**order, "items": [{"pizza_id": pizza["_id"], "quantity": 3}]})
+    assert response.status_code == 200
+    missing = await auth_client.post("/orders/", json={**order, "items": [{"pizza_id": "a" * 24, "quantity": 1}]})
+    assert missing.status_code == 400
+
+    assert _sample("orders_placed_total", store="main") == placed + 1
+    assert _sample("order_items_total", store="main") == items + 3
+    assert _sample("order_value_total", store="main") == pytest.approx(value + 30.0)
+    assert _sample("order_failures_total", reason="rejected") == rejected + 1
@@ -0,0 +1,38 @@
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+from app.models.order import Order, OrderItem
+from app.models.user import User
+from factories import make_order_document
+
+def test_from_mongo_matches_validated_model():
+    """Trusted hydration should produce the same output as full validation."""
+    document = make_order_document(items_per_order=10)
+    
+    trusted = Order.from_mongo(document)
+    validated = Order(**document)
+    
+    assert isinstance(trusted.items[0], OrderItem)
+    assert trusted.model_dump(by_alias=True) == validated.model_dump(by_alias=True)
+    assert trusted.model_dump(by_alias=True)["_id"] == str(document["_id"])
+
+def test_from_mongo_ignores_unknown_keys():
+    """Document keys that are not model fields should not end up on the model."""
+    user = User.from_mongo({
+        "_id": ObjectId(),
+        "name": "Jane",
+        "email": "jane@example.com",
+        "password_hash": "hash",
+        "updated_at": "2024-01-01T00:00:00",
+    })
+    
+    assert not hasattr(user, "updated_at")
+    assert "password_hash" not in user.model_dump()
+
+def test_object_id_validation_is_strict_for_input():
+    """Constructing a model directly should still reject invalid ids."""
+    with pytest.raises(ValidationError):
+        User(_id="not-an-object-id", name="Jane", email="jane@example.com")
+    
+    user = User(_id=str(ObjectId()), name="Jane", email="jane@example.com")
+    assert isinstance(user.id, ObjectId)
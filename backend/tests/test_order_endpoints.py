@@ -430,3 +430,58 @@ async def test_update_order_status_all_valid_statuses(auth_client: AsyncClient):
         
         updated_order = response.json()
         assert updated_order["status"] == status
+
+@pytest.mark.asyncio
+async def test_get_all_orders_sparse_fields(auth_client: AsyncClient):
+    """Test that ?fields= returns only the requested order fields."""
+    pizza_data = {
+        "name": "Sparse Pizza",
+        "description": "Pizza for sparse fields test",
+        "price": "11.99",
+    }
+    pizza_response = await auth_client.post("/pizzas/", data=pizza_data)
+    pizza = pizza_response.json()
+    
+    order_data = {
+        "customer_name": "Sparse User",
+        "customer_email": "sparse@example.com",
+        "customer_address": "Sparse Address",
+        "items": [{"pizza_id": pizza["_id"], "quantity": 2, "extras": []}]
+    }
+    order_response = await auth_client.post("/orders/", json=order_data)
+    order = order_response.json()
+    
+    response = await auth_client.get("/orders/?fields=customer_name,total_amount,status")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0] == {
+        "_id": order["_id"],
+        "customer_name": "Sparse User",
+        "total_amount": order["total_amount"],
+        "status": "pending",
+    }
+    
+    response = await auth_client.get(f"/orders/{order['_id']}?fields=items")
+    assert response.status_code == 200
+    assert set(response.json().keys()) == {"_id", "items"}
+
+@pytest.mark.asyncio
+async def test_get_orders_unknown_field(auth_client: AsyncClient):
+    """Test that requesting an unknown field is rejected."""
+    response = await auth_client.get("/orders/?fields=customer_name,secret")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: secret"
+
+@pytest.mark.asyncio
+async def test_openapi_documents_order_response_models(client: AsyncClient):
+    """Test that endpoints returning ORJSONResponse still document their response models."""
+    response = await client.get("/openapi.json")
+    assert response.status_code == 200
+    
+    paths = response.json()["paths"]
+    list_schema = paths["/orders/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    detail_schema = paths["/orders/{order_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert list_schema == {"$ref": "#/components/schemas/PaginatedResponse_Order_"}
+    assert detail_schema == {"$ref": "#/components/schemas/Order"}
@@ -232,3 +232,22 @@ async def test_delete_nonexistent_pizza(auth_client: AsyncClient):
     fake_id = str(ObjectId())
     response = await auth_client.delete(f"/pizzas/{fake_id}")
     assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_pizzas_sparse_fields(auth_client: AsyncClient):
+    """Test that ?fields= returns only the requested pizza fields."""
+    pizza_data = {
+        "name": "Sparse Margherita",
+        "description": "Pizza for sparse fields test",
+        "price": "9.99",
+    }
+    create_response = await auth_client.post("/pizzas/", data=pizza_data)
+    pizza = create_response.json()
+    
+    response = await auth_client.get("/pizzas/?fields=name,price")
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"_id": pizza["_id"], "name": "Sparse Margherita", "price": 9.99}]
+    
+    response = await auth_client.get(f"/pizzas/{pizza['_id']}?fields=description")
+    assert response.status_code == 200
+    assert response.json() == {"_id": pizza["_id"], "description": "Pizza for sparse fields test"}
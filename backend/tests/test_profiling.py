@@ -0,0 +1,123 @@
+import asyncio
+import time
+import pytest
+from httpx import AsyncClient
+from app.middleware.profiling_middleware import ProfilingMiddleware
+from app.profiling import AWAITING, OTHER_TASKS, ProfileStore, RequestProfiler, request_profiler
+
+def spin_profiled(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def spin_other(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+async def _saved(store: ProfileStore, count: int = 1):
+    """Profiles are written by the sampler thread just after the response; wait for them."""
+    for _ in range(200):
+        profiles = store.recent()
+        if len(profiles) >= count:
+            return profiles
+        await asyncio.sleep(0.01)
+    raise AssertionError("profile was not saved")
+
+@pytest.mark.asyncio
+async def test_admin_header_profiles_a_request(auth_client: AsyncClient, monkeypatch, tmp_path):
+    """X-Profile with the operator token should profile the request and list it under /admin/profiles."""
+    monkeypatch.setattr(request_profiler, "store", ProfileStore(str(tmp_path), 10))
+    monkeypatch.setattr(request_profiler, "token", "ops-secret")
+
+    assert "x-profile-id" not in (await auth_client.get("/pizzas/", headers={"X-Profile": "guess"})).headers
+    response = await auth_client.get("/pizzas/", headers={"X-Profile": "ops-secret"})
+    profile_id = response.headers["x-profile-id"]
+    await _saved(request_profiler.store)
+
+    ops = {"X-Profile": "ops-secret"}
+    listing = (await auth_client.get("/admin/profiles", headers=ops)).json()
+    assert listing["profiler"]["header_enabled"] is True
+    [profile] = listing["profiles"]
+    assert profile["id"] == profile_id
+    assert profile["method"] == "GET" and profile["path"] == "/pizzas/" and profile["status"] == 200
+    assert profile["trigger"] == "header" and profile["samples"] >= 1
+
+    folded = await auth_client.get(f"/admin/profiles/{profile_id}", headers=ops)
+    assert folded.status_code == 200
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.text.splitlines())
+    assert (await auth_client.get("/admin/profiles/..%2F..%2Fetc%2Fpasswd", headers=ops)).status_code == 404
+    assert len(request_profiler.store.recent()) == 1
+
+@pytest.mark.asyncio
+async def test_profiles_need_the_operator_token(auth_client: AsyncClient, monkeypatch, tmp_path):
+    """A user token alone should not read profiles: 404 with no PROFILE_TOKEN set, 403 without the right X-Profile."""
+    monkeypatch.setattr(request_profiler, "store", ProfileStore(str(tmp_path), 10))
+    monkeypatch.setattr(request_profiler, "token", None)
+    assert (await auth_client.get("/admin/profiles")).status_code == 404
+    assert (await auth_client.get("/admin/profiles/any", headers={"X-Profile": ""})).status_code == 404
+
+    monkeypatch.setattr(request_profiler, "token", "ops-secret")
+    profile_id = (await auth_client.get("/pizzas/", headers={"X-Profile": "ops-secret"})).headers["x-profile-id"]
+    await _saved(request_profiler.store)
+    assert (await auth_client.get("/admin/profiles")).status_code == 403
+    assert (await auth_client.get("/admin/profiles", headers={"X-Profile": "guess"})).status_code == 403
+    assert (await auth_client.get(f"/admin/profiles/{profile_id}")).status_code == 403
+
+@pytest.mark.asyncio
+async def test_samples_are_attributed_to_the_profiled_request_only(tmp_path):
+    """The profile should show the request's own code, and other tasks' work only as OTHER_TASKS."""
+    store = ProfileStore(str(tmp_path), 10)
+    profiler = RequestProfiler(store, sample_rate=1.0, interval=0.001)
+
+    async def other_request():
+        await asyncio.sleep(0.01)
+        spin_other(0.1)
+
+    async def app(scope, receive, send):
+        other = asyncio.create_task(other_request())
+        await asyncio.sleep(0.05)
+        await other
+        spin_profiled(0.1)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    await ProfilingMiddleware(app, profiler)({"type": "http", "method": "GET", "path": "/slow", "headers": []}, None, send)
+
+    [profile] = await _saved(store)
+    with open(store.folded_path(profile["id"])) as f:
+        folded = f.read()
+    assert "spin_profiled (" in folded
+    assert "spin_other" not in folded
+    assert OTHER_TASKS in folded or AWAITING in folded
+    assert profile["trigger"] == "sampled" and profile["duration_ms"] >= 100
+
+@pytest.mark.asyncio
+async def test_concurrent_profiles_are_capped(tmp_path):
+    """Past max_concurrent, picked requests should run unprofiled."""
+    profiler = RequestProfiler(ProfileStore(str(tmp_path), 10), sample_rate=1.0, max_concurrent=0)
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+
+    async def send(message):
+        sent.append(message)
+
+    await ProfilingMiddleware(app, profiler)({"type": "http", "method": "GET", "path": "/", "headers": []}, None, send)
+    assert sent[0]["headers"] == []
+    assert profiler.stats()["skipped_busy"] == 1
+
+def test_only_the_newest_profiles_are_kept(tmp_path):
+    """The store should prune to max_files and refuse ids that are not profile ids."""
+    store = ProfileStore(str(tmp_path), 2)
+    for second in range(3):
+        profile_id = f"20260101T00000{second}-{'a' * 12}"
+        store.save(profile_id, "main 1\n", {"id": profile_id})
+
+    assert [profile["id"] for profile in store.recent()] == ["20260101T000002-aaaaaaaaaaaa", "20260101T000001-aaaaaaaaaaaa"]
+    assert store.folded_path("20260101T000000-aaaaaaaaaaaa") is None
+    assert store.folded_path("../secrets") is None
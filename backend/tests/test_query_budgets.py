@@ -0,0 +1,82 @@
+import pytest
+from httpx import AsyncClient
+from tests.query_recorder import collection_scans
+
+CUSTOMER = {"customer_name": "Ada", "customer_email": "ada@example.com", "customer_address": "1 Main St"}
+USER = {"name": "Ada", "email": "ada@example.com", "address": "1 Main St", "password": "Secret123"}
+# A repeat customer's order: user, pizzas, extras, insert and commit. On a
+# standalone test server the transaction fails on its first command and the
+# order is placed again without one, which costs three more.
+ORDER_BUDGET = 8
+
+async def _menu(client: AsyncClient, pizzas: int, extras: int):
+    pizza_ids = [
+        (await client.post("/pizzas/", data={"name": f"Pizza {i}", "description": "d", "price": "10.00"})).json()["_id"]
+        for i in range(pizzas)
+    ]
+    extra_ids = [
+        (await client.post("/extras/", json={"name": f"Extra {i}", "price": 1.5})).json()["_id"]
+        for i in range(extras)
+    ]
+    return pizza_ids, extra_ids
+
+@pytest.mark.asyncio
+async def test_order_queries_do_not_grow_with_its_items(auth_client: AsyncClient, queries):
+    """Pizzas and extras should be loaded in one query each, however many items an order has."""
+    pizza_ids, extra_ids = await _menu(auth_client, pizzas=4, extras=3)
+    await auth_client.post("/orders/", json={**CUSTOMER, "items": [{"pizza_id": pizza_ids[0], "quantity": 1}]})
+
+    with queries.at_most(ORDER_BUDGET, "POST /orders (1 item)") as small:
+        response = await auth_client.post(
+            "/orders/", json={**CUSTOMER, "items": [{"pizza_id": pizza_ids[0], "quantity": 1, "extras": extra_ids[:1]}]}
+        )
+        assert response.status_code == 200
+    items = [{"pizza_id": pizza_id, "quantity": 2, "extras": extra_ids} for pizza_id in pizza_ids]
+    with queries.at_most(ORDER_BUDGET, "POST /orders (4 items)") as large:
+        response = await auth_client.post("/orders/", json={**CUSTOMER, "items": items})
+        assert response.status_code == 200
+
+    assert len(large) == len(small)
+    assert response.json()["total_amount"] == 4 * (2 * 10.00 + 2 * 3 * 1.5)
+
+@pytest.mark.asyncio
+async def test_menu_reads_are_served_from_cache(auth_client: AsyncClient, queries):
+    """The first menu read should count and fetch one page; repeats should not query at all."""
+    await _menu(auth_client, pizzas=3, extras=0)
+    with queries.at_most(2, "GET /pizzas (cold)"):
+        await auth_client.get("/pizzas/")
+    with queries.at_most(0, "GET /pizzas (cached)"):
+        await auth_client.get("/pizzas/")
+
+@pytest.mark.asyncio
+async def test_order_reads(auth_client: AsyncClient, queries):
+    """Listing orders should count and fetch one page; a single order is one lookup."""
+    pizza_ids, _ = await _menu(auth_client, pizzas=1, extras=0)
+    order = (await auth_client.post("/orders/", json={**CUSTOMER, "items": [{"pizza_id": pizza_ids[0], "quantity": 1}]})).json()
+    with queries.at_most(2, "GET /orders"):
+        await auth_client.get("/orders/")
+    with queries.at_most(1, "GET /orders/{id}"):
+        await auth_client.get(f"/orders/{order['_id']}")
+
+@pytest.mark.asyncio
+async def test_email_lookups_use_the_case_insensitive_index(auth_client: AsyncClient, queries):
+    """Emails should be matched like the unique index does: in one indexed lookup, ignoring case."""
+    with queries.at_most(2, "POST /users"):
+        assert (await auth_client.post("/users/", json=USER)).status_code == 200
+    with queries.at_most(1, "POST /users (taken email)"):
+        response = await auth_client.post("/users/", json={**USER, "email": "ADA@Example.com"})
+    assert response.status_code == 409
+    with queries.at_most(2, "POST /auth"):
+        response = await auth_client.post("/auth/", json={"email": "Ada@example.com", "password": "Secret123"})
+    assert response.status_code == 200
+
+def test_collection_scans_are_found_in_winning_plans_only():
+    """COLLSCAN should be detected in classic, slot-based and aggregate explain output."""
+    ixscan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "idx"}}
+    collscan = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+
+    assert collection_scans({"queryPlanner": {"winningPlan": collscan, "rejectedPlans": []}})
+    assert collection_scans({"queryPlanner": {"winningPlan": {"queryPlan": collscan, "slotBasedPlan": {}}}})
+    assert collection_scans({"stages": [{"$cursor": {"queryPlanner": {"winningPlan": collscan}}}]})
+    assert not collection_scans({"queryPlanner": {"winningPlan": ixscan, "rejectedPlans": [collscan]}})
+    assert not collection_scans({"queryPlanner": {"winningPlan": {"stage": "EOF"}}})
@@ -0,0 +1,80 @@
+import pytest
+from httpx import AsyncClient
+from app.ratelimit import MemoryBucketStore, default_rules, parse_limit
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_refills():
+    """A bucket should allow its capacity at once, then one token per refill interval."""
+    clock = FakeClock()
+    store = MemoryBucketStore(clock=clock)
+    for _ in range(3):
+        assert await store.take("auth:ip:1.2.3.4", capacity=3, refill_rate=0.5) == 0
+    
+    assert await store.take("auth:ip:1.2.3.4", capacity=3, refill_rate=0.5) == pytest.approx(2.0)
+    clock.now += 2.0
+    assert await store.take("auth:ip:1.2.3.4", capacity=3, refill_rate=0.5) == 0
+    assert await store.take("auth:ip:5.6.7.8", capacity=3, refill_rate=0.5) == 0
+    assert store.stats()["limited"] == 1
+
+@pytest.mark.asyncio
+async def test_bucket_store_is_bounded():
+    """The store should evict the least recently used buckets beyond ``max_keys``."""
+    store = MemoryBucketStore(max_keys=100)
+    for i in range(1000):
+        await store.take(f"users:ip:10.0.{i // 256}.{i % 256}", capacity=5, refill_rate=1)
+    
+    stats = store.stats()
+    assert stats["keys"] == 100
+    assert stats["evictions"] == 900
+
+def test_parse_limit():
+    """Limits are ``<requests>/<seconds>``; ``0`` disables them."""
+    assert parse_limit("10/60").refill_rate == pytest.approx(10 / 60)
+    assert parse_limit("50").period == 1
+    assert parse_limit("0") is None
+
+@pytest.mark.asyncio
+async def test_login_is_rate_limited_per_ip(client: AsyncClient):
+    """Login attempts beyond the per-IP burst should get 429 with Retry-After."""
+    limit = next(rule for rule in default_rules() if rule.name == "auth").per_ip
+    credentials = {"email": "nobody@example.com", "password": "wrong-password"}
+    for _ in range(int(limit.capacity)):
+        response = await client.post("/auth/", json=credentials)
+        assert response.status_code == 401
+    
+    response = await client.post("/auth/", json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    
+    # Other routes keep their own buckets
+    user_data = {"name": "Other Route", "email": "other@example.com", "password": "secret123"}
+    response = await client.post("/users/", json=user_data)
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_rate_limited_cross_origin_request_is_readable(client: AsyncClient):
+    """A 429 should carry the CORS headers, so the browser app can read it and its Retry-After."""
+    limit = next(rule for rule in default_rules() if rule.name == "orders").per_ip
+    headers = {"Origin": "https://shop.example.com"}
+    for _ in range(int(limit.capacity)):
+        assert (await client.post("/orders/", json={}, headers=headers)).status_code == 422
+    
+    response = await client.post("/orders/", json={}, headers=headers)
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "retry-after" in response.headers["access-control-expose-headers"].lower()
+
+@pytest.mark.asyncio
+async def test_rate_limit_stats(auth_client: AsyncClient):
+    """Test that the admin stats endpoint reports limited requests."""
+    await auth_client.post("/auth/", json={"email": "nobody@example.com", "password": "wrong-password"})
+    response = await auth_client.get("/admin/stats/rate-limit")
+    assert response.status_code == 200
+    assert response.json()["allowed"] >= 1
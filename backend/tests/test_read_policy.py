@@ -0,0 +1,117 @@
+import asyncio
+import os
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from app.db import policy_collection, policy_for
+from app.db.policies import default_policies
+from app.services.order_service import OrderService
+from tests.conftest import TEST_MONGODB_DB, TEST_MONGODB_URL
+
+# A three-node replica set (docker-compose --profile replica-set) for the routing test
+REPLICA_SET_URL = os.getenv("MONGODB_REPLICA_SET_URL")
+
+class CommandRecorder(monitoring.CommandListener):
+    def __init__(self):
+        self.events = []
+
+    def started(self, event):
+        self.events.append(event)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+async def _recording_client(url):
+    recorder = CommandRecorder()
+    client = AsyncIOMotorClient(url, event_listeners=[recorder])
+    return client, recorder
+
+def test_policy_table():
+    """Reports should read from fresh-enough secondaries and order placement should write with majority."""
+    reports = policy_for("orders.list")
+    assert isinstance(reports.read_preference, SecondaryPreferred)
+    assert reports.read_preference.max_staleness == 120
+    assert reports.read_concern.level == "local"
+
+    placement = policy_for("orders.create")
+    assert placement.write_concern.document["w"] == "majority"
+    assert placement.read_concern.level == "majority"
+    assert placement.transaction_options()["read_preference"] == Primary()
+
+    assert policy_for("pizzas.list").read_preference == Primary()
+
+def test_reports_can_stay_on_primary(monkeypatch):
+    """MONGO_REPORTS_ON_SECONDARIES=false should keep reports on the primary; staleness has a 90s floor."""
+    monkeypatch.setenv("MONGO_REPORT_MAX_STALENESS_SECONDS", "10")
+    assert default_policies()["users.list"].read_preference.max_staleness == 90
+
+    monkeypatch.setenv("MONGO_REPORTS_ON_SECONDARIES", "false")
+    assert default_policies()["users.list"].read_preference == Primary()
+
+def test_policy_collection_applies_options():
+    """Collections for a listed operation should carry its options; others are left as they are."""
+    client = AsyncIOMotorClient(TEST_MONGODB_URL)
+    db = client[TEST_MONGODB_DB]
+    orders = policy_collection(db, "orders", "orders.update_status")
+    assert orders.write_concern.document["w"] == "majority"
+    assert policy_collection(db, "pizzas", "pizzas.list").write_concern == db.pizzas.write_concern
+    client.close()
+
+@pytest_asyncio.fixture
+async def recorded_db():
+    client, recorder = await _recording_client(TEST_MONGODB_URL)
+    db = client[TEST_MONGODB_DB]
+    yield db, client, recorder
+    await client.drop_database(TEST_MONGODB_DB)
+    client.close()
+
+@pytest.mark.asyncio
+async def test_order_placement_uses_majority_write_concern(recorded_db):
+    """The order insert (or its transaction's commit) should be sent with w: majority."""
+    db, client, recorder = recorded_db
+    pizza = {"_id": ObjectId(), "store_id": "main", "name": "Margherita", "price": 10.0, "available": True}
+    await db.pizzas.insert_one(pizza)
+    recorder.events.clear()
+
+    await OrderService(db, client).create_order({
+        "store_id": "main",
+        "customer_name": "Jane",
+        "customer_email": "jane@example.com",
+        "customer_address": "1 Main St",
+        "items": [{"pizza_id": str(pizza["_id"]), "quantity": 1}],
+    })
+
+    durable = [
+        event for event in recorder.events
+        if event.command_name == "commitTransaction"
+        or (event.command_name == "insert" and event.command["insert"] == "orders")
+    ]
+    assert any(event.command.get("writeConcern", {}).get("w") == "majority" for event in durable)
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not REPLICA_SET_URL, reason="MONGODB_REPLICA_SET_URL is not set")
+async def test_reports_are_served_by_secondaries():
+    """Admin order lists should be read from a secondary of the replica set."""
+    client, recorder = await _recording_client(REPLICA_SET_URL)
+    db = client[TEST_MONGODB_DB]
+    try:
+        await db.command("ping")
+        for _ in range(100):
+            if client.secondaries:
+                break
+            await asyncio.sleep(0.1)
+        assert client.secondaries, "no secondary discovered"
+        recorder.events.clear()
+
+        await OrderService(db, client).get_all_orders("main", 0, 10)
+
+        finds = [event for event in recorder.events if event.command_name == "find"]
+        assert finds and all(event.connection_id in client.secondaries for event in finds)
+    finally:
+        client.close()
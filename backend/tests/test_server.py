@@ -0,0 +1,81 @@
+import pytest
+from app import server
+
+def _cgroup(monkeypatch, files):
+    monkeypatch.setattr(server, "_read", files.get)
+
+def test_cpu_quota_from_cgroup_v2(monkeypatch):
+    """A cgroup v2 cpu.max quota should be read as a (fractional) CPU count."""
+    _cgroup(monkeypatch, {"/sys/fs/cgroup/cpu.max": "150000 100000"})
+    assert server.cpu_quota() == 1.5
+
+    _cgroup(monkeypatch, {"/sys/fs/cgroup/cpu.max": "max 100000"})
+    assert server.cpu_quota() is None
+
+def test_cpu_quota_from_cgroup_v1(monkeypatch):
+    """cgroup v1 quota/period files should be used when cpu.max is absent; -1 means unlimited."""
+    _cgroup(monkeypatch, {
+        "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "200000",
+        "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000",
+    })
+    assert server.cpu_quota() == 2
+
+    _cgroup(monkeypatch, {
+        "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1",
+        "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000",
+    })
+    assert server.cpu_quota() is None
+
+def test_worker_count_follows_cpu_quota(monkeypatch):
+    """Workers should be capped by the quota (rounded up) and overridable with WEB_CONCURRENCY."""
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+    _cgroup(monkeypatch, {"/sys/fs/cgroup/cpu.max": "250000 100000"})
+    assert server.worker_count() == 3
+
+    _cgroup(monkeypatch, {"/sys/fs/cgroup/cpu.max": "50000 100000"})
+    assert server.worker_count() == 1
+
+    _cgroup(monkeypatch, {})
+    assert server.worker_count() == 8
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    assert server.worker_count() == 2
+
+@pytest.mark.skipif(not server.GUNICORN_AVAILABLE, reason="gunicorn is not installed")
+def test_gunicorn_options(monkeypatch):
+    """The launcher should preload the app, recycle workers and drain within the graceful timeout."""
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("PORT", "9000")
+    monkeypatch.setenv("MAX_REQUESTS", "500")
+    options = server.gunicorn_options()
+
+    assert options["bind"] == "0.0.0.0:9000"
+    assert options["workers"] == 3
+    assert options["preload_app"] is True
+    assert options["max_requests"] == 500
+    assert options["worker_class"] == "app.server.UvicornWorker"
+    assert server.UvicornWorker.CONFIG_KWARGS["lifespan"] == "on"
+    assert server.UvicornWorker.CONFIG_KWARGS["timeout_graceful_shutdown"] < options["graceful_timeout"]
+
+def test_metrics_dir_is_emptied_before_workers_start(monkeypatch, tmp_path):
+    """Stale per-process metric files from a previous run should be removed, other files kept."""
+    (tmp_path / "counter_123.db").write_bytes(b"stale")
+    (tmp_path / "README").write_text("keep")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    assert server.prepare_metrics_dir() == str(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["README"]
+
+def test_single_process_fallback_is_not_recycled(monkeypatch):
+    """Without gunicorn nothing restarts the process, so it must not exit after MAX_REQUESTS."""
+    import uvicorn
+    calls = []
+    monkeypatch.setattr(server, "GUNICORN_AVAILABLE", False)
+    monkeypatch.setattr(uvicorn, "run", lambda app, **options: calls.append((app, options)))
+    monkeypatch.setenv("MAX_REQUESTS", "500")
+    server.main()
+
+    [(app, options)] = calls
+    assert app == server.APP
+    assert "limit_max_requests" not in options
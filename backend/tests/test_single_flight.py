@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from app.utils.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    """Concurrent calls with the same key should await a single execution."""
+    flights = SingleFlight()
+    calls = 0
+    
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"name": "Margherita"}
+    
+    results = await asyncio.gather(*[flights.do("get_pizza", ("get_pizza", "1"), load) for _ in range(10)])
+    
+    assert calls == 1
+    assert all(result == {"name": "Margherita"} for result in results)
+    stats = flights.stats()
+    assert stats["requests"] == 10
+    assert stats["executions"] == 1
+    assert stats["coalescing_ratio"] == 0.9
+    assert stats["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_different_keys_and_sequential_calls_are_not_coalesced():
+    """Only overlapping calls with the same key are merged."""
+    flights = SingleFlight()
+    calls = []
+    
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+    
+    await asyncio.gather(flights.do("m", "a", lambda: load("a")), flights.do("m", "b", lambda: load("b")))
+    await flights.do("m", "a", lambda: load("a"))
+    
+    assert calls == ["a", "b", "a"]
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_waiter():
+    """A failing shared call should raise in every coalesced caller."""
+    flights = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+    
+    results = await asyncio.gather(*[flights.do("m", "k", fail) for _ in range(3)], return_exceptions=True)
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flights.stats()["executions"] == 1
+
+@pytest.mark.asyncio
+async def test_single_flight_stats_endpoint(auth_client: AsyncClient):
+    """The admin stats endpoint should report the coalesced service methods."""
+    pizza_data = {"name": "Flight Pizza", "description": "Hot read", "price": "10.99"}
+    pizza = (await auth_client.post("/pizzas/", data=pizza_data)).json()
+    
+    responses = await asyncio.gather(*[auth_client.get(f"/pizzas/{pizza['_id']}") for _ in range(5)])
+    assert all(response.status_code == 200 for response in responses)
+    
+    response = await auth_client.get("/admin/stats/single-flight")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["methods"]["PizzaService.get_pizza_by_id"]["requests"] >= 5
+    assert 0 <= stats["coalescing_ratio"] <= 1
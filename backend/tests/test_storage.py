@@ -0,0 +1,124 @@
+import hashlib
+import io
+import os
+import pytest
+from httpx import AsyncClient
+from starlette.datastructures import Headers, UploadFile
+from app.storage import IMMUTABLE_CACHE_CONTROL, FirebaseStorage, LocalStorage, MemoryStorage, create_storage
+from tests.test_image_upload import FakeBucket
+
+def _image(data: bytes, content_type: str = "image/jpeg", filename: str = "photo.jpg") -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=len(data), filename=filename, headers=Headers({"content-type": content_type}))
+
+@pytest.mark.asyncio
+async def test_keys_are_content_hashes_and_duplicates_are_not_stored_again():
+    """The same bytes should map to one key, stored once and counted as deduplicated after that."""
+    storage = MemoryStorage()
+    digest = hashlib.sha256(b"photo").hexdigest()
+
+    first = await storage.upload_image(_image(b"photo"))
+    second = await storage.upload_bytes(b"photo", "image/jpeg")
+
+    assert first == second == f"/images/{digest[:2]}/{digest}.jpg"
+    assert len(storage.blobs) == 1
+    stats = storage.metrics.stats()
+    assert stats["uploaded"] == 1 and stats["deduplicated"] == 1 and stats["bytes"] == 5
+
+@pytest.mark.asyncio
+async def test_firebase_skips_the_transfer_of_stored_content():
+    """An image already in the bucket should only be hashed, not uploaded again."""
+    bucket = FakeBucket()
+    storage = FirebaseStorage(bucket=bucket)
+    urls = {await storage.upload_image(_image(b"same photo")) for _ in range(3)}
+    assert len(urls) == 1 and len(bucket.uploads) == 1
+    assert storage.metrics.stats()["deduplicated"] == 2
+    storage.close()
+
+@pytest.mark.asyncio
+async def test_firebase_treats_a_lost_create_race_as_stored():
+    """A 412 from the create-only precondition means another worker stored the same content."""
+    class Conflict(Exception):
+        code = 412
+
+    class RacingBucket(FakeBucket):
+        def blob(self, name, chunk_size=None):
+            blob = super().blob(name, chunk_size)
+            def upload_from_file(*args, **kwargs):
+                raise Conflict()
+            blob.upload_from_file = upload_from_file
+            return blob
+
+    storage = FirebaseStorage(bucket=RacingBucket())
+    assert await storage.upload_image(_image(b"photo"))
+    assert storage.metrics.stats()["failed"] == 0
+    storage.close()
+
+@pytest.mark.asyncio
+async def test_local_storage_writes_each_content_once(tmp_path):
+    """Local blobs should land under the root by hash, and a re-upload should not rewrite the file."""
+    storage = LocalStorage(root=str(tmp_path), base_url="/images")
+    url = await storage.upload_image(_image(b"local photo"))
+    path = tmp_path / url[len("/images/"):]
+    assert path.read_bytes() == b"local photo"
+    modified = os.stat(path).st_mtime_ns
+
+    assert await storage.upload_image(_image(b"local photo")) == url
+    assert os.stat(path).st_mtime_ns == modified
+    assert [entry.name for entry in path.parent.iterdir()] == [path.name]
+    storage.close()
+
+@pytest.mark.asyncio
+async def test_local_images_are_served_with_immutable_cache_headers(client: AsyncClient, tmp_path):
+    """GET /images/{key} should serve stored files publicly with a one-year immutable Cache-Control."""
+    from app.main import app
+    app.storage = LocalStorage(root=str(tmp_path), base_url="/images")
+    url = await app.storage.upload_bytes(b"\x89PNG served", "image/png")
+
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG served"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-type"] == "image/png"
+
+    assert (await client.get("/images/ab/missing.png")).status_code == 404
+    assert (await client.get("/images/..%2F..%2Fetc%2Fpasswd")).status_code == 404
+
+@pytest.mark.asyncio
+async def test_unknown_types_are_stored_under_a_servable_key(client: AsyncClient, tmp_path):
+    """Extensions from client filenames should be used only when they fit the key pattern, else ``bin``."""
+    from app.main import app
+    app.storage = LocalStorage(root=str(tmp_path), base_url="/images")
+    filenames = {"photo.HEIC": ".heic", "IMG_1234": ".bin", "photo.jpeg2000": ".bin", "x./foo": ".bin", ".hidden": ".bin"}
+    for index, (filename, extension) in enumerate(filenames.items()):
+        url = await app.storage.upload_image(_image(b"photo %d" % index, "application/octet-stream", filename))
+        assert url.endswith(extension)
+        assert (await client.get(url)).status_code == 200
+
+@pytest.mark.asyncio
+async def test_reuploading_a_photo_reuses_the_stored_image(auth_client: AsyncClient):
+    """Two pizzas created with the same photo should point at the same stored image."""
+    from app.main import app
+    photo = b"\xff\xd8\xff same phone photo"
+    urls = []
+    for name in ("First", "Second"):
+        response = await auth_client.post(
+            "/pizzas/",
+            data={"name": name, "description": "Same photo", "price": "9.99"},
+            files={"image": ("photo.jpg", photo, "image/jpeg")},
+        )
+        urls.append(response.json()["image_url"])
+
+    assert urls[0] == urls[1]
+    assert (await auth_client.get(urls[0])).content == photo
+    assert app.storage.metrics.stats()["deduplicated"] >= 1
+
+def test_storage_backend_is_selected_by_env(monkeypatch, tmp_path):
+    """STORAGE_BACKEND should pick the memory, local or Firebase backend."""
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    assert isinstance(create_storage(), MemoryStorage)
+    monkeypatch.setenv("STORAGE_BACKEND", "local")
+    monkeypatch.setenv("IMAGE_STORAGE_DIR", str(tmp_path))
+    local = create_storage()
+    assert isinstance(local, LocalStorage) and local.root == str(tmp_path)
+    monkeypatch.setenv("STORAGE_BACKEND", "firebase")
+    assert isinstance(create_storage(), FirebaseStorage)
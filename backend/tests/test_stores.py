@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from jose import jwt
+from app.db import backfill_store_id
+from tests.conftest import TEST_SECRET_KEY, TEST_USER_ID
+
+def _store_token(store_id: str) -> str:
+    expire = datetime.utcnow() + timedelta(minutes=30)
+    return jwt.encode({"sub": TEST_USER_ID, "exp": expire, "store_id": store_id}, TEST_SECRET_KEY, algorithm="HS256")
+
+async def _create_pizza(client: AsyncClient, store_id: str, name: str = "Margherita") -> dict:
+    response = await client.post(
+        "/pizzas/",
+        data={"name": name, "description": "Store pizza", "price": "10.99"},
+        headers={"X-Store-Id": store_id},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+@pytest.mark.asyncio
+async def test_catalog_is_partitioned_by_store(auth_client: AsyncClient):
+    """Each store should only see its own pizzas, and names need only be unique within a store."""
+    north = await _create_pizza(auth_client, "north")
+    south = await _create_pizza(auth_client, "south")
+    assert north["store_id"] == "north" and south["store_id"] == "south"
+
+    response = await auth_client.get("/pizzas/", headers={"X-Store-Id": "north"})
+    assert [pizza["_id"] for pizza in response.json()["items"]] == [north["_id"]]
+    assert (await auth_client.get(f"/pizzas/{north['_id']}", headers={"X-Store-Id": "south"})).status_code == 404
+    assert (await auth_client.get("/pizzas/")).json()["total"] == 0
+
+@pytest.mark.asyncio
+async def test_orders_cannot_use_another_stores_pizza(auth_client: AsyncClient):
+    """An order should be rejected when its pizza belongs to a different store."""
+    pizza = await _create_pizza(auth_client, "north")
+    order = {
+        "customer_name": "Jane",
+        "customer_email": "jane@example.com",
+        "customer_address": "1 Main St",
+        "items": [{"pizza_id": pizza["_id"], "quantity": 1}],
+    }
+    response = await auth_client.post("/orders/", json=order, headers={"X-Store-Id": "south"})
+    assert response.status_code == 400
+
+    response = await auth_client.post("/orders/", json=order, headers={"X-Store-Id": "north"})
+    assert response.status_code == 200
+    assert response.json()["store_id"] == "north"
+    assert (await auth_client.get("/orders/", headers={"X-Store-Id": "south"})).json()["total"] == 0
+
+@pytest.mark.asyncio
+async def test_token_store_claim_wins_over_header(client: AsyncClient):
+    """A store-scoped token should pick its store and refuse a different X-Store-Id."""
+    client.headers.update({"Authorization": f"Bearer {_store_token('north')}"})
+    response = await client.post("/extras/", json={"name": "Olives", "price": 1.5})
+    assert response.json()["store_id"] == "north"
+
+    assert (await client.get("/orders/")).status_code == 200
+    assert (await client.get("/orders/", headers={"X-Store-Id": "south"})).status_code == 403
+
+@pytest.mark.asyncio
+async def test_login_scopes_tokens_to_the_users_own_store(client: AsyncClient, test_db):
+    """Only a store on the user record should become the store claim; X-Store-Id cannot pick one."""
+    db, _ = test_db
+    for email in ("staff@example.com", "customer@example.com"):
+        await client.post("/users/", json={"name": "User", "email": email, "password": "secret123"})
+    await db.users.update_one({"email": "staff@example.com"}, {"$set": {"store_id": "north"}})
+    staff = {"email": "staff@example.com", "password": "secret123"}
+    customer = {"email": "customer@example.com", "password": "secret123"}
+
+    assert (await client.post("/auth/", json=staff, headers={"X-Store-Id": "south"})).status_code == 403
+    token = (await client.post("/auth/", json=staff)).json()["access_token"]
+    assert jwt.get_unverified_claims(token)["store_id"] == "north"
+
+    token = (await client.post("/auth/", json=customer, headers={"X-Store-Id": "south"})).json()["access_token"]
+    assert "store_id" not in jwt.get_unverified_claims(token)
+    bearer = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/orders/", headers={**bearer, "X-Store-Id": "north"})).status_code == 200
+
+@pytest.mark.asyncio
+async def test_invalid_store_id_is_rejected(client: AsyncClient):
+    """Store ids outside the allowed pattern should be refused with a 400."""
+    response = await client.get("/pizzas/", headers={"X-Store-Id": "North Side!"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_backfill_assigns_legacy_documents(client: AsyncClient, test_db):
+    """Documents written before stores existed should be moved to the default store once."""
+    db, _ = test_db
+    await db.pizzas.insert_one({"name": "Legacy", "description": "Old", "price": 9.5, "available": True})
+    await db.orders.insert_one({"store_id": "north", "customer_name": "Jane"})
+
+    assert await backfill_store_id(db, "main") == {"pizzas": 1, "extras": 0, "orders": 0}
+    assert (await client.get("/pizzas/")).json()["total"] == 1
+    assert await backfill_store_id(db, "main") == {"pizzas": 0, "extras": 0, "orders": 0}
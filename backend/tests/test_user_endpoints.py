@@ -353,3 +353,21 @@ async def test_delete_nonexistent_user(auth_client: AsyncClient):
     fake_id = str(ObjectId())
     response = await auth_client.delete(f"/users/{fake_id}")
     assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_users_sparse_fields(auth_client: AsyncClient):
+    """Test that ?fields= returns only the requested user fields and never password data."""
+    user_data = {
+        "name": "Sparse User",
+        "email": "sparseuser@example.com",
+        "password": "secret123",
+    }
+    create_response = await auth_client.post("/users/", json=user_data)
+    user = create_response.json()
+    
+    response = await auth_client.get("/users/?fields=name,email")
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"_id": user["_id"], "name": "Sparse User", "email": "sparseuser@example.com"}]
+    
+    response = await auth_client.get(f"/users/{user['_id']}?fields=password_hash")
+    assert response.status_code == 400
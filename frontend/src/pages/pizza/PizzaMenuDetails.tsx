@@ -23,6 +23,7 @@ import { useParams, useNavigate } from 'react-router-dom';
 import { messages } from './messages';
 import AddToCart from '../../components/AddToCart';
 import { pizzaAPI, extrasAPI } from '../../services/api';
+import { getImageUrl, PizzaImage } from '../../utils/imageUtils';
 
 interface Pizza {
   _id: string;
@@ -30,6 +31,7 @@ interface Pizza {
   description: string;
   price: number;
   image_url?: string;
+  image_variants?: PizzaImage['image_variants'];
 }
 
 interface Extra {
@@ -123,7 +125,7 @@ const PizzaMenuDetails: React.FC = () => {
           <CardBody>
             <Stack spacing={{ base: 4, md: 8 }} direction={{ base: 'column', md: 'row' }} align={{ base: 'stretch', md: 'start' }}>
               <Image
-                src={pizza.image_url}
+                src={getImageUrl(pizza, 'hero')}
                 alt={pizza.name}
                 borderRadius="md"
                 w={{ base: '100%', md: 'auto' }}
@@ -22,6 +22,7 @@ import { useNavigate } from 'react-router-dom';
 import { messages } from './messages';
 import Pagination from '../../components/Pagination';
 import { pizzaAPI } from '../../services/api';
+import { getImageUrl, PizzaImage } from '../../utils/imageUtils';
 
 interface Pizza {
   _id: string;
@@ -29,6 +30,7 @@ interface Pizza {
   description: string;
   price: number;
   image_url?: string;
+  image_variants?: PizzaImage['image_variants'];
   ingredients?: string[];
 }
 
@@ -114,7 +116,7 @@ const PizzaMenuList: React.FC = () => {
                 >
                   <CardBody>
                     <Image
-                      src={pizza.image_url}
+                      src={getImageUrl(pizza, 'card')}
                       alt={pizza.name}
                       borderRadius="md"
                       h={{ base: '180px', md: '200px' }}
@@ -0,0 +1,24 @@
+/**
+ * Utility functions for pizza images
+ */
+import { API_BASE_URL } from '../services/api';
+
+export type ImageVariant = 'thumbnail' | 'card' | 'hero';
+
+export interface PizzaImage {
+  image_url?: string;
+  image_variants?: Partial<Record<ImageVariant, { webp?: string; jpeg?: string }>>;
+}
+
+/**
+ * Get the URL of a resized pizza image, falling back to the original upload
+ * @param pizza - The pizza with its image fields
+ * @param variant - The variant to show
+ * @returns The variant URL (WebP preferred), or the original image URL until variants exist;
+ *   paths served by the API (local image storage) are resolved against it
+ */
+export const getImageUrl = (pizza: PizzaImage, variant: ImageVariant): string | undefined => {
+  const urls = pizza.image_variants?.[variant];
+  const url = urls?.webp || urls?.jpeg || pizza.image_url;
+  return url?.startsWith('/') ? `${API_BASE_URL}${url}` : url;
+};